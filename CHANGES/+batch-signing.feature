@@ -0,0 +1 @@
+Added the `--batch` option to `pulpcore-manager add-signing-service` for signing scripts that sign many files in one run, reading the file names from stdin, and the `SIGNING_SERVICE_CONCURRENCY` setting.
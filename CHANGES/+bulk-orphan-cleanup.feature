@@ -0,0 +1 @@
+Orphan cleanup now deletes orphaned Artifacts in batches and removes their files concurrently from the storage, using S3 multi-object deletes where available. Files of deleted Artifacts are tracked until removed, so an interrupted cleanup no longer leaks them.
@@ -0,0 +1 @@
+The content app keeps the files it serves from FileSystem storage open in a bounded LRU cache, so they are sent with sendfile() without being opened and stat'ed for every request, see the new `CONTENT_APP_FILE_CACHE_SIZE` setting. The size of served Artifacts is taken from the database instead of the storage.
@@ -0,0 +1 @@
+The content app now caches the decisions of content guards for a few seconds, see the new `CONTENT_GUARD_CACHE_TTL` setting.
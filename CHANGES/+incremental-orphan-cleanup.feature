@@ -0,0 +1 @@
+Added an incremental orphan cleanup that only examines Content and Artifacts recorded as orphan candidates when they lost their last repository version or Content. The scheduled orphan cleanup now runs incrementally, with a full scan every `ORPHAN_FULL_SWEEP_INTERVAL` minutes. It can be requested via the new `incremental` option of the orphan cleanup endpoint.
@@ -0,0 +1 @@
+FileSystem storage now lets the kernel copy files saved from outside of the working directory or from another file system, using reflinks where the file system supports them, and `Artifact.from_pulp_temporary_file` no longer copies the file into an extra temporary file. Added a benchmark of the artifact ingest paths on FileSystem and S3 storage.
@@ -0,0 +1 @@
+Added opt-in keyset pagination to list endpoints. Pass the `cursor` query parameter (empty for the first page) to page by creation time without counting the total, and follow the `next` link.
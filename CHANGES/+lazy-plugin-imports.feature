@@ -0,0 +1 @@
+The content app and the workers no longer import the API components of all plugins at start up, see the new `LAZY_PLUGIN_IMPORTS` setting.
@@ -0,0 +1,3 @@
+The OpenAPI schema served at `docs/api.json` and `docs/api.yaml` and generated by `pulpcore-manager openapi` is now cached on disk, keyed by the installed component versions and the schema-affecting settings, so it is shared between API workers and survives restarts.
+The responses carry an `ETag` and conditional requests are answered with `304 Not Modified`.
+After an upgrade, API workers regenerate the common schema variants in the background and remove the other cached schemas.
@@ -0,0 +1 @@
+Listing objects as a non-admin user now caches the permission lookups per request and filters by domain with a join instead of loading the primary keys of all objects in the domain.
@@ -0,0 +1 @@
+Rate limited progress report updates of a task are now written together in a single bulk update per interval instead of one update per report, and any pending update is written when the task finishes.
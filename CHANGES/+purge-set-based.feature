@@ -0,0 +1 @@
+Task purging now removes the progress reports and created resources of each batch of tasks with single statements instead of loading them into memory.
@@ -0,0 +1 @@
+Reclaim space now detaches and deletes Artifacts in bounded transactional batches and removes their files concurrently, using multi-object deletes on S3 and Azure.
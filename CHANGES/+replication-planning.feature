@@ -0,0 +1,2 @@
+Replication now fetches the upstream distributions once, looks up the local remotes, repositories and distributions in bulk and dispatches the resulting tasks in a single batch.
+The file replicator fetches the manifests of the upstream repositories and publications in batches.
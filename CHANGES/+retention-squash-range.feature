@@ -0,0 +1 @@
+Repository version retention now squashes each run of expired versions into the following version in one pass, locking only the affected content relations and computing the counts once.
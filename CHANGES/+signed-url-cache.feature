@@ -0,0 +1 @@
+Pre-signed URLs redirecting to artifacts in object storage are now reused until shortly before they expire, in memory and across processes through Redis, see the new `SIGNED_URL_CACHE_MARGIN` setting.
@@ -0,0 +1 @@
+Committing a chunked upload now reads every chunk only once, hashing it while it is concatenated, and uploaded chunks are streamed to the storage instead of being read into memory.
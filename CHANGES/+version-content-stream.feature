@@ -0,0 +1 @@
+Added a `content/` endpoint on repository versions that streams all content of the version as newline-delimited JSON, including the natural keys and the artifact digests, with bounded memory use.
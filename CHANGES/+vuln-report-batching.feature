@@ -0,0 +1,2 @@
+The vulnerability report task now scans content in batches with a bounded number of workers, queries osv.dev with batch requests, writes the reports in bulk and skips content with a recent report.
+Added the `VULN_REPORT_CACHE_TTL` setting to control how long a report is reused.
@@ -0,0 +1 @@
+Added `SigningService.sign_many()` and `asign_many()` to sign many files at once, concurrently and, for signing services created as batch ones, with a single long-lived run of the signing script per concurrent signer.
@@ -0,0 +1 @@
+Added `pulpcore.plugin.storage.delete_files` to delete many files from a domain storage concurrently. Plugins can register multi-object deletes for their storage classes in `pulpcore.plugin.storage.BULK_DELETE_METHODS`.
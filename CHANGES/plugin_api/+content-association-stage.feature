@@ -0,0 +1 @@
+Added `DeclarativeVersion.content_association_stage()` to let plugins replace the stage associating the synced content with the new version.
@@ -0,0 +1 @@
+Added `ContentGuard.permit_cache_key()`, which lets the content app cache the decisions of a content guard.
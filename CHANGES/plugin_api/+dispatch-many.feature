@@ -0,0 +1 @@
+Added `dispatch_many` and `adispatch_many` to `pulpcore.plugin.tasking` to enqueue many deferred tasks with a single bulk insert and one worker wakeup.
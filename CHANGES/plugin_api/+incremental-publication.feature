@@ -0,0 +1 @@
+Added `Publication.get_base_publication()`, `Publication.copy_from()` and the `Publication.stale_metadata()` hook to build a publication incrementally from an earlier one.
@@ -0,0 +1 @@
+Added `Replicator.plan()` to prepare a replication in bulk, and `Replicator.queue_dispatch()` and `Replicator.dispatch_pending()` to queue the replication tasks and dispatch them at once. `Replicator.dispatch()` dispatches a task right away, after the queued ones.
@@ -0,0 +1 @@
+Repository version viewsets gained a `content` action. It is allowed wherever the access policy allows `retrieve`, so plugins don't need to change their policies.
@@ -0,0 +1 @@
+Git syncs with `optimize` only process the files that changed since the previously synced commit, hash new files in parallel, fetch commit refs without cloning the whole history and resolve LFS objects in batches.
@@ -0,0 +1 @@
+Publishing a repository reuses the manifest of the previous publication, updating it only with the content added and removed since.
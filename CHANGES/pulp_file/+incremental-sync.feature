@@ -0,0 +1 @@
+Syncs with `optimize` now only process the entries that changed in the manifest since the previous sync.
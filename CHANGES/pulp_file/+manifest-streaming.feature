@@ -0,0 +1 @@
+Manifests are parsed and written in streamed batches, validating whole blocks of lines at once, and publications read the manifest entries without building model instances.
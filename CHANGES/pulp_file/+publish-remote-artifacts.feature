@@ -0,0 +1 @@
+Publishing on-demand content no longer queries the remote artifacts one content unit at a time, and mirror syncs write the manifest of their publication the same way.
@@ -157,6 +157,14 @@ class FilePublication(Publication, AutoAddObjPermsMixin):
         """
         validate_publication_paths(self)
 
+    def stale_metadata(self, base, added, removed):
+        """
+        The manifest is the only metadata and it changes with any content.
+        """
+        if added.exists() or removed.exists():
+            return [base.manifest]
+        return []
+
 
 class FileDistribution(Distribution, AutoAddObjPermsMixin):
     """
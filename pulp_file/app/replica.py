@@ -1,3 +1,4 @@
+from pulp_glue.common.exceptions import PulpException as GluePulpException
 from pulp_glue.file.context import (
     PulpFileDistributionContext,
     PulpFilePublicationContext,
@@ -22,21 +23,64 @@ class FileReplicator(Replicator):
     repository_serializer_name = "FileRepositorySerializer"
     remote_serializer_name = "FileRemoteSerializer"
     sync_task = file_synchronize
+    # The number of upstream repositories or publications fetched per request by plan()
+    prefetch_batch_size = 50
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The manifest of the upstream repositories and publications, by href
+        self._manifests = {}
+
+    def plan(self, upstream_distributions):
+        super().plan(upstream_distributions)
+        repository_hrefs = set()
+        publication_hrefs = set()
+        for upstream_distribution in upstream_distributions:
+            if upstream_distribution["repository"]:
+                repository_hrefs.add(upstream_distribution["repository"])
+            elif upstream_distribution["publication"]:
+                publication_hrefs.add(upstream_distribution["publication"])
+            elif upstream_distribution.get("repository_version"):
+                repository_hrefs.add(self._repository_href(upstream_distribution))
+
+        # Fetch the manifests in batches instead of one request per distribution.
+        for ctx_cls, hrefs in (
+            (self.repository_ctx_cls, sorted(repository_hrefs)),
+            (self.publication_ctx_cls, sorted(publication_hrefs)),
+        ):
+            for i in range(0, len(hrefs), self.prefetch_batch_size):
+                batch = hrefs[i : i + self.prefetch_batch_size]
+                try:
+                    for entity in ctx_cls(self.pulp_ctx).list_iterator(
+                        parameters={"pulp_href__in": batch}
+                    ):
+                        self._manifests[entity["pulp_href"]] = entity["manifest"]
+                except GluePulpException:
+                    # The manifests of this batch are fetched one by one in url().
+                    pass
+
+    @staticmethod
+    def _repository_href(upstream_distribution):
+        # Extract repository href from repository_version href
+        return upstream_distribution["repository_version"].rsplit("versions/", 1)[0]
+
+    def _manifest(self, ctx_cls, href):
+        if href not in self._manifests:
+            self._manifests[href] = ctx_cls(self.pulp_ctx, href).entity["manifest"]
+        return self._manifests[href]
 
     def url(self, upstream_distribution):
         # Check if a distribution is repository or publication based
         if upstream_distribution["repository"]:
-            manifest = self.repository_ctx_cls(
-                self.pulp_ctx, upstream_distribution["repository"]
-            ).entity["manifest"]
+            manifest = self._manifest(self.repository_ctx_cls, upstream_distribution["repository"])
         elif upstream_distribution["publication"]:
-            manifest = self.publication_ctx_cls(
-                self.pulp_ctx, upstream_distribution["publication"]
-            ).entity["manifest"]
+            manifest = self._manifest(
+                self.publication_ctx_cls, upstream_distribution["publication"]
+            )
         elif upstream_distribution.get("repository_version"):
-            # Extract repository href from repository_version href
-            repo_href = upstream_distribution["repository_version"].rsplit("versions/", 1)[0]
-            manifest = self.repository_ctx_cls(self.pulp_ctx, repo_href).entity["manifest"]
+            manifest = self._manifest(
+                self.repository_ctx_cls, self._repository_href(upstream_distribution)
+            )
         else:
             # This distribution doesn't serve any content
             return None
@@ -1,9 +1,13 @@
+import codecs
 import logging
 import tempfile
 from gettext import gettext as _
 
 from django.core.files import File
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
 
+from pulpcore.plugin.exceptions import PublishError
 from pulpcore.plugin.models import (
     ContentArtifact,
     PublishedMetadata,
@@ -11,9 +15,9 @@ from pulpcore.plugin.models import (
     RepositoryVersion,
 )
 
-from pulp_file.app.models import FilePublication
+from pulp_file.app.models import FileContent, FilePublication
 from pulp_file.app.serializers import FilePublicationSerializer
-from pulp_file.manifest import Entry, Manifest
+from pulp_file.manifest import BATCH_SIZE, Manifest, read_batches
 
 log = logging.getLogger(__name__)
 
@@ -42,11 +46,7 @@ def publish(manifest, repository_version_pk, checkpoint=False, **kwargs):
         ) as publication:
             publication.manifest = manifest
             if manifest:
-                manifest = Manifest(manifest)
-                manifest.write(yield_entries_for_version(repo_version))
-                PublishedMetadata.create_from_file(
-                    file=File(open(manifest.relative_path, "rb")), publication=publication
-                )
+                publish_manifest(publication, manifest)
 
         log.info(_("Publication: {publication} created").format(publication=publication.pk))
 
@@ -57,32 +57,105 @@ def publish(manifest, repository_version_pk, checkpoint=False, **kwargs):
         return publication
 
 
+def publish_manifest(publication, relative_path):
+    """
+    Write the manifest of the repository version of a publication and add it to the publication.
+
+    If an earlier publication of the repository has its manifest at the same path, the
+    publication is built from it. Its manifest is reused if the content did not change and is
+    otherwise updated with the content added and removed since.
+
+    Args:
+        publication (pulpcore.plugin.models.Publication): The publication being created.
+        relative_path (str): The relative path of the manifest in the publication.
+
+    """
+    base = publication.get_base_publication()
+    if base is None or base.manifest != relative_path:
+        rows = yield_entries_for_version(publication.repository_version)
+    else:
+        added, removed = publication.copy_from(base)
+        if publication.published_metadata.filter(relative_path=relative_path).exists():
+            return
+        rows = yield_entries_from_base(base, added, removed)
+
+    manifest = Manifest(relative_path)
+    manifest.write_rows(rows)
+    PublishedMetadata.create_from_file(
+        file=File(open(manifest.relative_path, "rb")),
+        relative_path=relative_path,
+        publication=publication,
+    )
+
+
+def yield_entries_from_base(base, added, removed):
+    """
+    Yield a manifest row for every content in a version, based on the manifest of a publication.
+
+    The rows of the added content come first, like the newest content does in a full manifest.
+
+    Args:
+        base (pulp_file.app.models.FilePublication): A publication of an earlier version.
+        added (django.db.models.QuerySet): The content added since the base publication.
+        removed (django.db.models.QuerySet): The content removed since the base publication.
+
+    Yields:
+        tuple: The `(relative_path, digest, size)` of each manifest entry.
+
+    """
+    yield from _yield_entries(added)
+    # The removed content may have lost its artifacts, its own fields are always there.
+    removed = set(FileContent.objects.filter(pk__in=removed).values_list("relative_path", "digest"))
+    content_artifact = ContentArtifact.objects.select_related("artifact").get(
+        content__in=base.published_metadata.filter(relative_path=base.manifest)
+    )
+    with content_artifact.artifact.file.open("rb") as fp:
+        for rows in read_batches(codecs.iterdecode(fp, "utf-8")):
+            for row in rows:
+                if (row.relative_path, row.digest) not in removed:
+                    yield row
+
+
 def yield_entries_for_version(repo_version):
     """
-    Yield a Manifest Entry for every content in the repository version.
+    Yield a manifest row for every content in the repository version.
 
     Args:
         repo_version (pulpcore.plugin.models.RepositoryVersion):
             A RepositoryVersion to manifest entries for.
 
     Yields:
-        Entry: Each manifest entry.
+        tuple: The `(relative_path, digest, size)` of each manifest entry.
 
     """
+    yield from _yield_entries(repo_version.content)
 
-    content_artifacts = ContentArtifact.objects.filter(content__in=repo_version.content).order_by(
-        "-content__pulp_created"
-    )
 
-    for content_artifact in content_artifacts.select_related("artifact").iterator():
-        if content_artifact.artifact:
-            artifact = content_artifact.artifact
-        else:
-            # TODO: this scales poorly, one query per on_demand content being published.
-            artifact = RemoteArtifact.objects.filter(content_artifact=content_artifact).first()
-        entry = Entry(
-            relative_path=content_artifact.relative_path,
-            digest=artifact.sha256,
-            size=artifact.size,
+def _yield_entries(content):
+    """
+    Yield a manifest row for every content.
+
+    The digest and size are joined from the artifact, or from the first remote artifact of
+    on-demand content, in a single query streamed with a server-side cursor.
+
+    Raises:
+        PublishError: If a content has neither an artifact nor a remote artifact.
+    """
+    remote_artifacts = RemoteArtifact.objects.filter(content_artifact=OuterRef("pk")).order_by("pk")
+    content_artifacts = (
+        ContentArtifact.objects.filter(content__in=content)
+        .order_by("-content__pulp_created")
+        .values_list(
+            "relative_path",
+            Coalesce("artifact__sha256", Subquery(remote_artifacts.values("sha256")[:1])),
+            Coalesce("artifact__size", Subquery(remote_artifacts.values("size")[:1])),
         )
-        yield entry
+    )
+    for relative_path, digest, size in content_artifacts.iterator(chunk_size=BATCH_SIZE):
+        if digest is None:
+            raise PublishError(
+                _("The content at '{path}' has neither an artifact nor a remote artifact.").format(
+                    path=relative_path
+                )
+            )
+        yield relative_path, digest, size
@@ -1,19 +1,25 @@
+import asyncio
+import contextvars
 import logging
 import os
 import re
 import shutil
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from gettext import gettext as _
 from hashlib import sha256
+from itertools import islice
 from urllib.parse import quote, urlparse, urlunparse
 
 import git as gitpython
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.core.files import File
+from django.db.models.functions import Collate
 from gitdb.exc import BadName, BadObject
 
 from pulpcore.plugin.exceptions import SyncError
-from pulpcore.plugin.models import Artifact, ProgressReport, PublishedMetadata, Remote
+from pulpcore.plugin.models import Artifact, Content, ProgressReport, Remote
 from pulpcore.plugin.serializers import RepositoryVersionSerializer
 from pulpcore.plugin.stages import (
     DeclarativeArtifact,
@@ -29,12 +35,14 @@ from pulp_file.app.models import (
     FilePublication,
     FileRepository,
 )
+from pulp_file.app.tasks.publishing import publish_manifest
 from pulp_file.manifest import Manifest
 
 log = logging.getLogger(__name__)
 
 
-metadata_files = []
+# The number of existing content units fetched at once when diffing the manifest
+DIFF_CHUNK_SIZE = 5000
 
 
 def _get_sha256(file_path):
@@ -43,7 +51,7 @@ def _get_sha256(file_path):
         return sha256(f.read()).hexdigest()
 
 
-def _should_optimize_sync(sync_details, last_sync_details, version=None):
+def _should_optimize_sync(sync_details, last_sync_details, version=None, check_manifest=True):
     """
     Check whether the sync can be skipped by comparing with the previous sync.
 
@@ -51,6 +59,9 @@ def _should_optimize_sync(sync_details, last_sync_details, version=None):
         sync_details (dict): Details about the current sync configuration.
         last_sync_details (dict): Details about the previous sync configuration.
         version: The current latest RepositoryVersion, used for artifact checks.
+        check_manifest (bool): Whether the manifest needs to be unchanged. Without this check
+            the result tells whether only the entries that changed in the manifest need to be
+            synced.
 
     Returns:
         bool: True if sync can be skipped; False otherwise.
@@ -79,7 +90,10 @@ def _should_optimize_sync(sync_details, last_sync_details, version=None):
     if last_sync_details.get("most_recent_version") != sync_details["most_recent_version"]:
         return False
 
-    if last_sync_details.get("manifest_checksum") != sync_details["manifest_checksum"]:
+    if (
+        check_manifest
+        and last_sync_details.get("manifest_checksum") != sync_details["manifest_checksum"]
+    ):
         return False
 
     # If immediate policy, check if any content is missing artifacts (e.g. after reclaim)
@@ -121,8 +135,30 @@ def synchronize(remote_pk, repository_pk, mirror, optimize=False, url=None, **kw
         raise SyncError(_("A remote must have a url specified to synchronize."))
 
     if isinstance(remote, FileGitRemote):
-        first_stage = GitFirstStage(remote)
-        dv = DeclarativeVersion(first_stage, repository, mirror=mirror)
+        version = repository.latest_version()
+        sync_details = {
+            "remote_pk": str(remote.pk),
+            "url": remote.url,
+            "download_policy": remote.policy,
+            "mirror": mirror,
+            "most_recent_version": version.number,
+        }
+
+        # Only the blobs that changed since the commit of the previous sync need to go through
+        # the pipeline if the repository still holds what that sync created.
+        last_commit = repository.last_sync_details.get("commit")
+        if (
+            optimize
+            and last_commit
+            and _should_optimize_sync(
+                sync_details, repository.last_sync_details, version=version, check_manifest=False
+            )
+        ):
+            first_stage = GitFirstStage(remote, version=version, base_commit=last_commit)
+            dv = FileIncrementalDeclarativeVersion(first_stage, repository, mirror=mirror)
+        else:
+            first_stage = GitFirstStage(remote)
+            dv = DeclarativeVersion(first_stage, repository, mirror=mirror)
         old_pipeline_stages = dv.pipeline_stages
         dv.pipeline_stages = lambda new_version: [
             stage
@@ -130,6 +166,12 @@ def synchronize(remote_pk, repository_pk, mirror, optimize=False, url=None, **kw
             if not isinstance(stage, (RemoteArtifactSaver))
         ]
         rv = dv.create()
+
+        if rv:
+            sync_details["most_recent_version"] = rv.number
+        sync_details["commit"] = first_stage.commit
+        repository.last_sync_details = sync_details
+        repository.save()
     else:
         sync_url = url or remote.url
         version = repository.latest_version()
@@ -158,8 +200,19 @@ def synchronize(remote_pk, repository_pk, mirror, optimize=False, url=None, **kw
                 pb.done = 1
             return
 
-        first_stage = FileFirstStage(remote, url, manifest_path=manifest_result.path)
-        dv = DeclarativeVersion(first_stage, repository, mirror=mirror, acs=True)
+        # Only the entries that changed since the previous sync need to go through the pipeline
+        # if the repository still holds what that sync created.
+        incremental = optimize and _should_optimize_sync(
+            sync_details, repository.last_sync_details, version=version, check_manifest=False
+        )
+        if incremental:
+            first_stage = FileFirstStage(
+                remote, url, manifest_path=manifest_result.path, version=version
+            )
+            dv = FileIncrementalDeclarativeVersion(first_stage, repository, mirror=mirror, acs=True)
+        else:
+            first_stage = FileFirstStage(remote, url, manifest_path=manifest_result.path)
+            dv = DeclarativeVersion(first_stage, repository, mirror=mirror, acs=True)
         rv = dv.create()
 
         # Update last_sync_details after sync
@@ -169,16 +222,9 @@ def synchronize(remote_pk, repository_pk, mirror, optimize=False, url=None, **kw
         repository.save()
 
     if rv and mirror:
-        # TODO: this is awful, we really should rewrite the DeclarativeVersion API to
-        # accomodate this use case
-        global metadata_files
         with FilePublication.create(rv, pass_through=True) as publication:
-            mdfile_path, relative_path = metadata_files.pop()
-            PublishedMetadata.create_from_file(
-                file=File(open(mdfile_path, "rb")),
-                relative_path=relative_path,
-                publication=publication,
-            )
+            relative_path = (url or remote.url).split("/")[-1]
+            publish_manifest(publication, relative_path)
             publication.manifest = relative_path
             publication.save()
 
@@ -195,7 +241,7 @@ class FileFirstStage(Stage):
     The first stage of a pulp_file sync pipeline.
     """
 
-    def __init__(self, remote, url, manifest_path=None):
+    def __init__(self, remote, url, manifest_path=None, version=None):
         """
         The first stage of a pulp_file sync pipeline.
 
@@ -204,19 +250,22 @@ class FileFirstStage(Stage):
             url (str): The base url of custom remote
             manifest_path (str): Path to an already-downloaded manifest file. If provided,
                 the manifest will not be downloaded again.
+            version (RepositoryVersion): The version to diff the manifest against. If provided,
+                only the entries missing from this version are emitted and the content of the
+                version that is not in the manifest anymore is collected in `removed_content`.
 
         """
         super().__init__()
         self.remote = remote
         self.url = url if url else remote.url
         self.manifest_path = manifest_path
+        self.version = version
+        self.removed_content = []
 
     async def run(self):
         """
         Build and emit `DeclarativeContent` from the Manifest data.
         """
-        global metadata_files
-
         deferred_download = self.remote.policy != Remote.IMMEDIATE  # Interpret download policy
         async with ProgressReport(
             message="Downloading Metadata", code="sync.downloading.metadata"
@@ -230,33 +279,139 @@ class FileFirstStage(Stage):
                 result = await downloader.run()
                 result_path = result.path
             await pb.aincrement()
-            metadata_files.append((result_path, self.url.split("/")[-1]))
 
         async with ProgressReport(
             message="Parsing Metadata Lines", code="sync.parsing.metadata"
         ) as pb:
             manifest = Manifest(result_path)
-            entries = list(manifest.read())
+            if self.version:
+                entries = [row for rows in manifest.read_batches() for row in rows]
+                pb.total = len(entries)
+                await pb.asave()
+
+                entries.sort(key=lambda entry: (entry.relative_path, entry.digest))
+                entries = [entry async for entry in self._diff(entries)]
+                await pb.aincrease_by(pb.total - len(entries))
+                batches = [entries]
+            else:
+                # The manifest is streamed, the total grows with every batch parsed.
+                pb.total = 0
+                batches = manifest.read_batches()
+
+            for batch in batches:
+                if not self.version:
+                    pb.total += len(batch)
+                    await pb.asave()
+                for entry in batch:
+                    path = _get_safe_path(root_dir, entry, parsed_url.scheme)
+
+                    url = urlunparse(parsed_url._replace(path=path))
+                    file = FileContent(relative_path=entry.relative_path, digest=entry.digest)
+                    artifact = Artifact(size=entry.size, sha256=entry.digest)
+                    da = DeclarativeArtifact(
+                        artifact=artifact,
+                        url=url,
+                        relative_path=entry.relative_path,
+                        remote=self.remote,
+                        deferred_download=deferred_download,
+                    )
+                    dc = DeclarativeContent(content=file, d_artifacts=[da])
+                    await pb.aincrement()
+                    await self.put(dc)
 
-            pb.total = len(entries)
-            await pb.asave()
+    async def _diff(self, entries):
+        """
+        Yield the entries of the manifest that are not in `self.version` yet.
+
+        Both the entries and the content of the version are walked in the same order, so the
+        content of the version is never held in memory. The content that is not in the manifest
+        anymore is collected in `self.removed_content`.
+
+        Args:
+            entries (list): The manifest entries sorted by relative path and digest.
+        """
+        existing = aiter(self._existing_content())
+        current = await anext(existing, None)
+        previous_key = None
+        for entry in entries:
+            key = (entry.relative_path, entry.digest)
+            if key == previous_key:
+                continue
+            previous_key = key
+            while current is not None and current[:2] < key:
+                self.removed_content.append(current[2])
+                current = await anext(existing, None)
+            if current is not None and current[:2] == key:
+                current = await anext(existing, None)
+                continue
+            yield entry
+        while current is not None:
+            self.removed_content.append(current[2])
+            current = await anext(existing, None)
+
+    async def _existing_content(self):
+        """
+        Yield the relative path, digest and pk of the content of `self.version`.
+
+        The content is ordered by code point, like Python sorts the manifest entries.
+        """
+        content = (
+            self.version.get_content(FileContent.objects)
+            .order_by(Collate("relative_path", "C"), Collate("digest", "C"))
+            .values_list("relative_path", "digest", "pk")
+        )
+        rows = content.iterator(chunk_size=DIFF_CHUNK_SIZE)
+        fetch = sync_to_async(lambda: list(islice(rows, DIFF_CHUNK_SIZE)))
+        while chunk := await fetch():
+            for row in chunk:
+                yield row
+
+
+class FileDiffContentAssociation(Stage):
+    """
+    Associate the content emitted by an incremental `FileFirstStage` with the new version.
 
-            for entry in entries:
-                path = _get_safe_path(root_dir, entry, parsed_url.scheme)
-
-                url = urlunparse(parsed_url._replace(path=path))
-                file = FileContent(relative_path=entry.relative_path, digest=entry.digest)
-                artifact = Artifact(size=entry.size, sha256=entry.digest)
-                da = DeclarativeArtifact(
-                    artifact=artifact,
-                    url=url,
-                    relative_path=entry.relative_path,
-                    remote=self.remote,
-                    deferred_download=deferred_download,
+    The first stage only emits content missing from the version and collects the content that
+    is not in the manifest anymore, so unlike `ContentAssociation` this stage does not need to
+    load the content of the version in memory.
+    """
+
+    def __init__(self, new_version, first_stage, mirror, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.new_version = new_version
+        self.first_stage = first_stage
+        self.allow_delete = mirror
+
+    async def run(self):
+        async with ProgressReport(message="Associating Content", code="associating.content") as pb:
+            async for batch in self.batches():
+                to_add = {d_content.content.pk for d_content in batch}
+                for d_content in batch:
+                    await self.put(d_content)
+                await sync_to_async(self.new_version.add_content)(
+                    Content.objects.filter(pk__in=to_add)
                 )
-                dc = DeclarativeContent(content=file, d_artifacts=[da])
-                await pb.aincrement()
-                await self.put(dc)
+                await pb.aincrease_by(len(to_add))
+
+        # The first stage is done once the end of the stream arrived here.
+        if self.allow_delete:
+            async with ProgressReport(
+                message="Un-Associating Content", code="unassociating.content"
+            ) as pb:
+                if to_delete := self.first_stage.removed_content:
+                    await sync_to_async(self.new_version.remove_content)(
+                        Content.objects.filter(pk__in=to_delete)
+                    )
+                    await pb.aincrease_by(len(to_delete))
+
+
+class FileIncrementalDeclarativeVersion(DeclarativeVersion):
+    """
+    A DeclarativeVersion for syncing only the entries that changed in the manifest.
+    """
+
+    def content_association_stage(self, new_version):
+        return FileDiffContentAssociation(new_version, self.first_stage, self.mirror)
 
 
 def _get_safe_path(root_dir, entry, scheme):
@@ -345,6 +500,44 @@ def _build_clone_url(remote):
     return url
 
 
+def _clone(clone_url, clone_dir, git_ref, env):
+    """
+    Make a bare clone of a git repository with only the commit of a git ref if possible.
+
+    The default branch, other branches and tags are cloned shallowly. A commit hash can not be
+    cloned that way, so the commit alone is fetched into an empty repository. Only if the server
+    does not allow that, the whole repository is cloned.
+
+    Args:
+        clone_url (str): The URL to clone from.
+        clone_dir (str): The directory to clone into.
+        git_ref (str): The branch, tag or commit to clone.
+        env (dict): The environment of the git commands.
+
+    Returns:
+        git.Repo: The cloned repository.
+
+    Raises:
+        git.exc.GitCommandError: If the repository can not be cloned.
+    """
+    branch = {} if git_ref == "HEAD" else {"branch": git_ref}
+    try:
+        return gitpython.Repo.clone_from(
+            clone_url, clone_dir, bare=True, depth=1, env=env, **branch
+        )
+    except gitpython.exc.GitCommandError:
+        pass
+
+    repo = gitpython.Repo.init(clone_dir, bare=True)
+    try:
+        repo.git.fetch(clone_url, git_ref, depth=1, env=env)
+        return repo
+    except gitpython.exc.GitCommandError:
+        repo.close()
+        shutil.rmtree(clone_dir)
+    return gitpython.Repo.clone_from(clone_url, clone_dir, bare=True, env=env)
+
+
 _LFS_POINTER_RE = re.compile(
     rb"^version https://git-lfs\.github\.com/spec/v1\n"
     rb"oid sha256:([0-9a-f]{64})\n"
@@ -360,15 +553,36 @@ class GitFirstStage(Stage):
     walks the tree to emit ``DeclarativeContent`` for each blob. Computes sha256 for
     each blob so that ``QueryExistingArtifacts`` can match already-known artifacts and
     ``FileContent.digest`` is available for content matching.
+
+    The blobs are hashed in a pool of threads. Given the commit of the previous sync and the
+    version it created, only the blobs that changed since that commit are emitted, the content
+    of the version at the paths that changed or were deleted is collected in
+    `removed_content`, and blobs already present in that commit are not hashed again.
     """
 
-    def __init__(self, remote):
+    # The number of threads hashing blobs
+    max_workers = 4
+    # The number of blobs hashed before they are emitted
+    hash_batch_size = 100
+    # The number of LFS objects resolved with a single request
+    lfs_batch_size = 100
+
+    def __init__(self, remote, version=None, base_commit=None):
         """
         Args:
             remote (FileGitRemote): The git remote data to be used when syncing.
+            version (RepositoryVersion): The version created by the previous sync.
+            base_commit (str): The commit synced by the previous sync. If provided along with
+                `version`, only the blobs that changed since this commit are emitted.
         """
         super().__init__()
         self.remote = remote
+        self.version = version
+        self.base_commit = base_commit
+        self.commit = None
+        self.removed_content = []
+        self._local = threading.local()
+        self._repos = []
 
     def _parse_lfs_pointer(self, data):
         """Returns the oid and size of an LFS pointer if present."""
@@ -402,6 +616,107 @@ class GitFirstStage(Stage):
             response.raise_for_status()
             return await response.json()
 
+    def _hash_blob(self, git_dir, hexsha, size):
+        """
+        Copy a blob into a temporary file and hash it, in a thread of the pool.
+
+        Every thread reads the objects with its own `Repo`, since the object database of a
+        `Repo` can not be shared across threads.
+
+        Returns:
+            tuple: The Artifact of the blob, or None along with the oid and size of the LFS
+                object if the blob is an LFS pointer.
+        """
+        if (repo := getattr(self._local, "repo", None)) is None:
+            repo = self._local.repo = gitpython.Repo(git_dir)
+            self._repos.append(repo)
+        stream = repo.odb.stream(bytes.fromhex(hexsha))
+        with tempfile.NamedTemporaryFile(dir=".", delete=False, mode="w+b") as file:
+            shutil.copyfileobj(stream, file)
+            file.seek(0)
+            # Check to see if the blob is an LFS pointer
+            if size < 1024 and (lfs_tuple := self._parse_lfs_pointer(file.read())):
+                return None, lfs_tuple
+        return Artifact.init_and_validate(file.name, expected_size=size), None
+
+    def _diff(self, repo, commit, clone_env):
+        """
+        Find the blobs that changed since `self.base_commit`.
+
+        The content of the version at the paths that changed or were deleted is collected in
+        `self.removed_content`.
+
+        Args:
+            repo (git.Repo): The clone of the remote repository.
+            commit (git.Commit): The commit to sync.
+            clone_env (dict): The environment to fetch the base commit with, see
+                `_build_clone_env()`.
+
+        Returns:
+            tuple: The list of the blobs to emit and the sha256 of the blobs that are also in
+                the base commit, by blob hexsha; or None if the base commit is not available.
+        """
+        try:
+            try:
+                base = repo.commit(self.base_commit)
+                base.tree
+            except (BadName, BadObject, ValueError):
+                repo.git.fetch(
+                    _build_clone_url(self.remote),
+                    self.base_commit,
+                    depth=1,
+                    env=clone_env,
+                )
+                base = repo.commit(self.base_commit)
+        except (gitpython.exc.GitCommandError, BadName, BadObject, ValueError) as e:
+            log.info(
+                _(
+                    "Syncing all blobs, the previous commit '{commit}' is not available: {error}"
+                ).format(commit=self.base_commit, error=str(e))
+            )
+            return None
+
+        blobs = []
+        removed_paths = set()
+        for diff in base.diff(commit):
+            if (
+                diff.a_blob
+                and diff.b_blob
+                and diff.a_blob.hexsha == diff.b_blob.hexsha
+                and diff.a_path == diff.b_path
+            ):
+                # Only the mode changed
+                continue
+            if diff.a_blob:
+                removed_paths.add(diff.a_path)
+            if diff.b_blob and (item := commit.tree[diff.b_path]).type == "blob":
+                blobs.append(item)
+
+        # Blobs that are present in the base commit, e.g. moved or copied files, are not hashed
+        # again. LFS pointers are small, so only larger blobs are considered.
+        wanted = {blob.hexsha for blob in blobs if blob.size >= 1024}
+        base_paths = {}
+        if wanted:
+            for item in base.tree.traverse():
+                if item.type == "blob" and item.hexsha in wanted:
+                    base_paths.setdefault(item.path, item.hexsha)
+
+        digests = {}
+        version_content = self.version.get_content(FileContent.objects)
+        paths = list(removed_paths | base_paths.keys())
+        for i in range(0, len(paths), DIFF_CHUNK_SIZE):
+            rows = version_content.filter(
+                relative_path__in=paths[i : i + DIFF_CHUNK_SIZE]
+            ).values_list("relative_path", "digest", "pk")
+            for relative_path, digest, pk in rows:
+                if relative_path in removed_paths:
+                    self.removed_content.append(pk)
+                if hexsha := base_paths.get(relative_path):
+                    digests.setdefault(hexsha, set()).add(digest)
+        # A path may hold more than one content in an additive repository.
+        digests = {hexsha: d.pop() for hexsha, d in digests.items() if len(d) == 1}
+        return blobs, digests
+
     async def run(self):
         """
         Build and emit `DeclarativeContent` from the Git repository tree.
@@ -416,18 +731,7 @@ class GitFirstStage(Stage):
 
         async with ProgressReport(message="Cloning Git Repository", code="sync.git.cloning") as pb:
             try:
-                try:
-                    repo = gitpython.Repo.clone_from(
-                        clone_url,
-                        clone_dir,
-                        bare=True,
-                        depth=1,
-                        branch=git_ref,
-                        env=clone_env,
-                    )
-                except gitpython.exc.GitCommandError:
-                    # depth/branch fails for commit hashes; retry with full bare clone
-                    repo = gitpython.Repo.clone_from(clone_url, clone_dir, bare=True, env=clone_env)
+                repo = await sync_to_async(_clone)(clone_url, clone_dir, git_ref, clone_env)
             except gitpython.exc.GitCommandError as e:
                 raise SyncError(
                     _("Failed to clone git repository '{url}': {error}").format(
@@ -445,66 +749,134 @@ class GitFirstStage(Stage):
                         ref=git_ref, error=str(e)
                     )
                 )
+            self.commit = commit.hexsha
             await pb.aincrement()
 
         async with ProgressReport(
             message="Parsing Git tree",
             code="sync.git.parsing_tree",
         ) as pb:
-            blobs = [item for item in commit.tree.traverse() if item.type == "blob"]
-            lfs_blobs = {}
+            diff = None
+            if self.version and self.base_commit:
+                diff = await sync_to_async(self._diff)(repo, commit, clone_env)
+            if diff is None:
+                blobs = [item for item in commit.tree.traverse() if item.type == "blob"]
+                digests = {}
+            else:
+                blobs, digests = diff
+            # Without the diff, the content to remove from the version is what was not emitted.
+            emitted = set() if self.version and diff is None else None
             pb.total = len(blobs)
             await pb.asave()
 
-            for blob in blobs:
-                relative_path = blob.path
-                size = blob.size
-                with tempfile.NamedTemporaryFile(dir=".", delete=False, mode="w+b") as file:
-                    shutil.copyfileobj(blob.data_stream, file)
-                    file.seek(0)
-                    # Check to see if the blob is an LFS pointer
-                    if size < 1024 and (lfs_tuple := self._parse_lfs_pointer(file.read())):
-                        lfs_blobs[lfs_tuple[0]] = (relative_path, *lfs_tuple)
-                        continue
-
-                artifact = Artifact.init_and_validate(file.name, expected_size=size)
-                file_content = FileContent(relative_path=relative_path, digest=artifact.sha256)
-                da = DeclarativeArtifact(
-                    artifact=artifact,
-                    url=remote.url,
-                    relative_path=relative_path,
-                    remote=remote,
-                    deferred_download=False,
+            lfs_blobs = {}
+            loop = asyncio.get_running_loop()
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                try:
+                    for i in range(0, len(blobs), self.hash_batch_size):
+                        batch = blobs[i : i + self.hash_batch_size]
+                        to_hash = [blob for blob in batch if blob.hexsha not in digests]
+                        results = await asyncio.gather(
+                            *(
+                                loop.run_in_executor(
+                                    executor,
+                                    contextvars.copy_context().run,
+                                    self._hash_blob,
+                                    repo.git_dir,
+                                    blob.hexsha,
+                                    blob.size,
+                                )
+                                for blob in to_hash
+                            )
+                        )
+                        hashed = dict(zip((blob.hexsha for blob in to_hash), results))
+
+                        for blob in batch:
+                            relative_path = blob.path
+                            if blob.hexsha in digests:
+                                artifact = Artifact(size=blob.size, sha256=digests[blob.hexsha])
+                            else:
+                                artifact, lfs_tuple = hashed[blob.hexsha]
+                                if lfs_tuple:
+                                    oid, size = lfs_tuple
+                                    lfs_blobs.setdefault(oid, (size, []))[1].append(relative_path)
+                                    continue
+
+                            file_content = FileContent(
+                                relative_path=relative_path, digest=artifact.sha256
+                            )
+                            da = DeclarativeArtifact(
+                                artifact=artifact,
+                                url=remote.url,
+                                relative_path=relative_path,
+                                remote=remote,
+                                deferred_download=False,
+                            )
+                            dc = DeclarativeContent(content=file_content, d_artifacts=[da])
+                            if emitted is not None:
+                                emitted.add((relative_path, artifact.sha256))
+                            await pb.aincrement()
+                            await self.put(dc)
+                finally:
+                    for thread_repo in self._repos:
+                        thread_repo.close()
+
+            oids = list(lfs_blobs)
+            for i in range(0, len(oids), self.lfs_batch_size):
+                lfs_results = await self._fetch_lfs_batch(
+                    (None, oid, lfs_blobs[oid][0]) for oid in oids[i : i + self.lfs_batch_size]
                 )
-                dc = DeclarativeContent(content=file_content, d_artifacts=[da])
-                await pb.aincrement()
-                await self.put(dc)
-
-            if lfs_blobs:
-                lfs_results = await self._fetch_lfs_batch(lfs_blobs.values())
                 for lfs_object in lfs_results.get("objects", []):
-                    relative_path, oid, size = lfs_blobs[lfs_object["oid"]]
+                    size, relative_paths = lfs_blobs[lfs_object["oid"]]
                     if lfs_object.get("error"):
                         raise SyncError(
                             _("Failed to resolve LFS blob '{rp}': {error}").format(
-                                rp=relative_path, error=lfs_object.get("error", "Unknown error")
+                                rp=relative_paths[0],
+                                error=lfs_object.get("error", "Unknown error"),
                             )
                         )
                     url = lfs_object["actions"]["download"]["href"]
-                    artifact = Artifact(size=size, sha256=oid)
-                    file_content = FileContent(relative_path=relative_path, digest=artifact.sha256)
                     if headers := lfs_object["actions"]["download"].get("header"):
                         extra_data = {"request_kwargs": {"headers": headers}}
                     else:
                         extra_data = None
-                    da = DeclarativeArtifact(
-                        artifact=artifact,
-                        url=url,
-                        relative_path=relative_path,
-                        remote=remote,
-                        deferred_download=False,
-                        extra_data=extra_data,
-                    )
-                    dc = DeclarativeContent(content=file_content, d_artifacts=[da])
-                    await pb.aincrement()
-                    await self.put(dc)
+                    for relative_path in relative_paths:
+                        artifact = Artifact(size=size, sha256=lfs_object["oid"])
+                        file_content = FileContent(
+                            relative_path=relative_path, digest=artifact.sha256
+                        )
+                        da = DeclarativeArtifact(
+                            artifact=artifact,
+                            url=url,
+                            relative_path=relative_path,
+                            remote=remote,
+                            deferred_download=False,
+                            extra_data=extra_data,
+                        )
+                        dc = DeclarativeContent(content=file_content, d_artifacts=[da])
+                        if emitted is not None:
+                            emitted.add((relative_path, artifact.sha256))
+                        await pb.aincrement()
+                        await self.put(dc)
+
+            if emitted is not None:
+                self.removed_content = await sync_to_async(self._not_emitted)(emitted)
+
+    def _not_emitted(self, emitted):
+        """
+        Find the content of `self.version` that is not in the emitted content.
+
+        Args:
+            emitted (set): The relative path and digest of the emitted content.
+
+        Returns:
+            list: The pks of the content.
+        """
+        content = self.version.get_content(FileContent.objects).values_list(
+            "relative_path", "digest", "pk"
+        )
+        return [
+            pk
+            for relative_path, digest, pk in content.iterator(chunk_size=DIFF_CHUNK_SIZE)
+            if (relative_path, digest) not in emitted
+        ]
@@ -1,8 +1,82 @@
+import re
 from collections import namedtuple
 from gettext import gettext as _
+from itertools import islice
 from re import fullmatch
 
 Line = namedtuple("Line", ("number", "content"))
+Row = namedtuple("Row", ("relative_path", "digest", "size"))
+
+# The number of lines parsed at once
+BATCH_SIZE = 10000
+
+# The columns of a block of entries without surrounding whitespace, blank lines or comments.
+PATHS_PATTERN = re.compile(r"[^\s#/](?:[^\n]*[^\s/])?(?:\n[^\s#/](?:[^\n]*[^\s/])?)*")
+DIGESTS_PATTERN = re.compile(r"[0-9a-fA-F]+(?:,[0-9a-fA-F]+)*")
+SIZES_PATTERN = re.compile(r"(?:[0-9]+\n)*[0-9]+\n?")
+
+
+def parse_lines(lines, start=1):
+    """
+    Parse a block of manifest lines.
+
+    The lines are split into columns and each column is validated at once with a single
+    regular expression. Only if that fails, e.g. because of comments, blank lines, whitespace
+    around the fields or an invalid line, the lines are parsed one by one with `Entry.parse`.
+
+    Args:
+        lines (list): The lines as read from the manifest, each ending with a line break but
+            the last one.
+        start (int): The number of the first line.
+
+    Returns:
+        list: A [pulp_file.manifest.Row][] for each entry.
+
+    Raises:
+        ValueError: on parsing error.
+
+    """
+    columns = list(zip(*[line.rsplit(",", maxsplit=2) for line in lines]))
+    if len(columns) == 3:
+        paths, digests, sizes = columns
+        if (
+            PATHS_PATTERN.fullmatch("\n".join(paths))
+            and "//" not in "\n".join(paths)
+            and DIGESTS_PATTERN.fullmatch(",".join(digests))
+            and SIZES_PATTERN.fullmatch("".join(sizes))
+        ):
+            return list(map(Row._make, zip(paths, digests, map(int, sizes))))
+
+    rows = []
+    for n, line in enumerate(lines, start):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        entry = Entry.parse(Line(number=n, content=line))
+        rows.append(Row(entry.relative_path, entry.digest, entry.size))
+    return rows
+
+
+def read_batches(fp, batch_size=BATCH_SIZE):
+    """
+    Stream a manifest from a text file object in batches of rows.
+
+    Args:
+        fp (io.TextIOBase): The manifest.
+        batch_size (int): The number of lines parsed at once.
+
+    Yields:
+        list: The [pulp_file.manifest.Row][] of the entries of up to `batch_size` lines.
+
+    Raises:
+        ValueError: on parsing error.
+
+    """
+    start = 1
+    while lines := list(islice(fp, batch_size)):
+        if rows := parse_lines(lines, start):
+            yield rows
+        start += len(lines)
 
 
 class Entry:
@@ -126,9 +200,29 @@ class Manifest:
         Yields:
             Entry: for each line.
 
+        """
+        for rows in self.read_batches():
+            for row in rows:
+                yield Entry(relative_path=row.relative_path, digest=row.digest, size=row.size)
+
+    def read_batches(self, batch_size=BATCH_SIZE):
+        """
+        Stream the file at `relative_path` in batches of rows.
+
+        Only one batch of lines is held in memory at a time.
+
+        Args:
+            batch_size (int): The number of lines parsed at once.
+
+        Yields:
+            list: The [pulp_file.manifest.Row][] of the entries of up to `batch_size` lines.
+
+        Raises:
+            ValueError: on parsing error.
+
         """
         with open(self.relative_path) as fp:
-            yield from Manifest.parse(fp.read())
+            yield from read_batches(fp, batch_size)
 
     def write(self, entries):
         """
@@ -143,3 +237,17 @@ class Manifest:
                 line = str(entry)
                 fp.write(line)
                 fp.write("\n")
+
+    def write_rows(self, rows, batch_size=BATCH_SIZE):
+        """
+        Write the manifest from `(relative_path, digest, size)` tuples.
+
+        Args:
+            rows (iterable): The rows to be written.
+            batch_size (int): The number of lines written at once.
+
+        """
+        rows = iter(rows)
+        with open(self.relative_path, "w+") as fp:
+            while batch := list(islice(rows, batch_size)):
+                fp.writelines(f"{path},{digest},{size}\n" for path, digest, size in batch)
@@ -1,9 +1,18 @@
 """Unit tests for Git sync helper functions."""
 
+import hashlib
 import os
 from unittest import mock
 
-from pulp_file.app.tasks.synchronizing import _build_clone_env, _build_clone_url
+import git
+import pytest
+
+from pulp_file.app.tasks.synchronizing import (
+    GitFirstStage,
+    _build_clone_env,
+    _build_clone_url,
+    _clone,
+)
 
 
 class TestBuildCloneUrl:
@@ -141,3 +150,89 @@ class TestBuildCloneEnv:
         remote = self._mock_remote()
         env = _build_clone_env(remote)
         assert "PATH" in env
+
+
+@pytest.fixture
+def source_repo(tmp_path):
+    """A repository with a commit and a second one moving, changing, adding and deleting files."""
+    repo = git.Repo.init(tmp_path / "source", initial_branch="main")
+    writer = repo.config_writer()
+    writer.set_value("user", "name", "Pulp")
+    writer.set_value("user", "email", "pulp@example.com")
+    writer.release()
+
+    def write(path, data):
+        full_path = os.path.join(repo.working_tree_dir, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w") as f:
+            f.write(data)
+
+    write("big.txt", "x" * 2048)
+    write("a.txt", "a")
+    write("dir/b.txt", "b")
+    write("mode.txt", "m")
+    repo.index.add(["big.txt", "a.txt", "dir/b.txt", "mode.txt"])
+    base = repo.index.commit("base")
+
+    repo.index.move(["big.txt", "moved.txt"])
+    write("a.txt", "a2")
+    repo.index.remove(["dir/b.txt"], working_tree=True)
+    write("new.txt", "new")
+    os.chmod(os.path.join(repo.working_tree_dir, "mode.txt"), 0o755)
+    repo.index.add(["a.txt", "new.txt", "mode.txt"])
+    head = repo.index.commit("head")
+    return repo, base.hexsha, head.hexsha
+
+
+class TestClone:
+    """Tests for _clone."""
+
+    @pytest.mark.parametrize("git_ref", ["HEAD", "main", "base"])
+    def test_shallow_clone(self, source_repo, tmp_path, git_ref):
+        repo, base, head = source_repo
+        git_ref = base if git_ref == "base" else git_ref
+        url = f"file://{repo.working_tree_dir}"
+        clone = _clone(url, str(tmp_path / "clone"), git_ref, os.environ.copy())
+
+        commit = clone.commit(git_ref)
+        assert commit.hexsha == (base if git_ref == base else head)
+        assert len(list(clone.iter_commits(commit))) == 1
+
+
+class TestGitFirstStageDiff:
+    """Tests for the incremental mode of GitFirstStage."""
+
+    def test_diff(self, source_repo, tmp_path):
+        repo, base, head = source_repo
+        clone = _clone(f"file://{repo.working_tree_dir}", str(tmp_path / "clone"), "HEAD", {})
+        big_digest = hashlib.sha256(b"x" * 2048).hexdigest()
+        version = mock.Mock()
+        version.get_content.return_value.filter.return_value.values_list.return_value = [
+            ("a.txt", "digest-a", "pk-a"),
+            ("dir/b.txt", "digest-b", "pk-b"),
+            ("big.txt", big_digest, "pk-big"),
+        ]
+        remote = TestBuildCloneEnv._mock_remote()
+        remote.url = f"file://{repo.working_tree_dir}"
+        remote.username = None
+        with mock.patch("pulpcore.plugin.stages.api.get_domain"):
+            stage = GitFirstStage(remote, version=version, base_commit=base)
+
+        blobs, digests = stage._diff(clone, clone.commit(head), os.environ.copy())
+
+        assert sorted(blob.path for blob in blobs) == ["a.txt", "moved.txt", "new.txt"]
+        assert sorted(stage.removed_content) == ["pk-a", "pk-b", "pk-big"]
+        moved = clone.commit(head).tree["moved.txt"]
+        assert digests == {moved.hexsha: big_digest}
+
+    def test_diff_without_base_commit(self, source_repo, tmp_path):
+        repo, base, head = source_repo
+        clone = _clone(f"file://{repo.working_tree_dir}", str(tmp_path / "clone"), "HEAD", {})
+        remote = TestBuildCloneEnv._mock_remote()
+        remote.url = f"file://{repo.working_tree_dir}"
+        remote.username = None
+        with mock.patch("pulpcore.plugin.stages.api.get_domain"):
+            stage = GitFirstStage(remote, version=mock.Mock(), base_commit="0" * 40)
+
+        assert stage._diff(clone, clone.commit(head), os.environ.copy()) is None
+        assert stage.removed_content == []
@@ -0,0 +1,41 @@
+import pytest
+
+from pulp_file.manifest import Manifest, Row, parse_lines
+
+DIGEST = "a" * 64
+
+
+def test_parse_lines():
+    lines = [
+        "# a comment\n",
+        f" dir/a b.txt , {DIGEST} , 10 \n",
+        "\n",
+        f"a,b.txt,{DIGEST.upper()},0",
+    ]
+    assert parse_lines(lines) == [
+        Row("dir/a b.txt", DIGEST, 10),
+        Row("a,b.txt", DIGEST.upper(), 0),
+    ]
+
+
+@pytest.mark.parametrize(
+    "line",
+    ["/a.txt", "a.txt/", "a//b.txt", "a.txt,ff", "a.txt,xyz,1", "a.txt,ff,-1", f",{DIGEST},1"],
+)
+def test_parse_lines_invalid(line):
+    lines = ["# header\n", f"b.txt,{DIGEST},1\n", f"{line}\n"]
+    with pytest.raises(ValueError, match="line:3"):
+        parse_lines(lines)
+    with pytest.raises(ValueError, match="line:13"):
+        parse_lines(lines, start=11)
+
+
+def test_read_write_batches(tmp_path):
+    rows = [(f"dir/{i}.txt", DIGEST, i) for i in range(25)]
+    manifest = Manifest(tmp_path / "PULP_MANIFEST")
+    manifest.write_rows(rows, batch_size=10)
+
+    batches = list(manifest.read_batches(batch_size=10))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert [row for batch in batches for row in batch] == rows
+    assert [str(entry) for entry in manifest.read()] == [",".join(map(str, row)) for row in rows]
@@ -0,0 +1,106 @@
+import hashlib
+import uuid
+
+import pytest
+
+from pulpcore.plugin.exceptions import PublishError
+from pulpcore.plugin.models import Content, ContentArtifact, RemoteArtifact
+
+from pulp_file.app.models import FileContent, FilePublication, FileRemote, FileRepository
+from pulp_file.app.tasks.publishing import publish_manifest, yield_entries_for_version
+from pulp_file.manifest import Manifest
+
+MANIFEST = "PULP_MANIFEST"
+
+
+@pytest.fixture
+def repository(db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return FileRepository.objects.create(name=f"repo-{uuid.uuid4().hex[:8]}")
+
+
+@pytest.fixture
+def remote(db):
+    return FileRemote.objects.create(
+        name=f"remote-{uuid.uuid4().hex[:8]}", url="http://example.com/PULP_MANIFEST"
+    )
+
+
+def create_version(repository, remote, add=(), remove=()):
+    """
+    Create a version adding on-demand content at the `add` paths and removing the `remove` ones.
+    """
+    with repository.new_version() as repo_version:
+        for path in add:
+            digest = hashlib.sha256(path.encode()).hexdigest()
+            content = FileContent.objects.create(relative_path=path, digest=digest)
+            content_artifact = ContentArtifact.objects.create(content=content, relative_path=path)
+            RemoteArtifact.objects.create(
+                url=f"http://example.com/{path}",
+                sha256=digest,
+                size=len(path),
+                content_artifact=content_artifact,
+                remote=remote,
+            )
+            repo_version.add_content(Content.objects.filter(pk=content.pk))
+        for path in remove:
+            content = FileContent.objects.filter(relative_path=path)
+            repo_version.remove_content(Content.objects.filter(pk__in=content))
+    return repo_version
+
+
+def publish(repo_version):
+    publication = FilePublication.objects.create(
+        repository_version=repo_version, pass_through=True, manifest=MANIFEST
+    )
+    publish_manifest(publication, MANIFEST)
+    publication.complete = True
+    publication.save()
+    return publication
+
+
+def published_manifest(publication):
+    content_artifact = ContentArtifact.objects.select_related("artifact").get(
+        content__in=publication.published_metadata.filter(relative_path=MANIFEST)
+    )
+    with content_artifact.artifact.file.open("rb") as fp:
+        return fp.read().decode().splitlines()
+
+
+def test_incremental_manifest(repository, remote):
+    """The manifest built from the base publication equals the one of a full publish."""
+    base = publish(create_version(repository, remote, add=["a.txt", "b.txt", "c.txt"]))
+    repo_version = create_version(
+        repository, remote, add=["d.txt", "dir/e.txt"], remove=["a.txt", "c.txt"]
+    )
+    # The removed on-demand content may have lost its remote artifacts meanwhile.
+    RemoteArtifact.objects.filter(content_artifact__relative_path="a.txt").delete()
+
+    publication = publish(repo_version)
+    full = Manifest("full")
+    full.write_rows(yield_entries_for_version(repo_version))
+
+    assert publication.get_base_publication() == base
+    with open(full.relative_path) as fp:
+        expected = fp.read().splitlines()
+    assert sorted(published_manifest(publication)) == sorted(expected)
+    assert [line.split(",")[0] for line in sorted(expected)] == ["b.txt", "d.txt", "dir/e.txt"]
+
+
+def test_manifest_of_on_demand_content(repository, remote):
+    """On-demand content is listed with the digest and size of its remote artifact."""
+    repo_version = create_version(repository, remote, add=["a.txt"])
+
+    publication = publish(repo_version)
+
+    digest = hashlib.sha256(b"a.txt").hexdigest()
+    assert published_manifest(publication) == [f"a.txt,{digest},5"]
+
+
+def test_manifest_of_content_without_artifacts(repository, remote):
+    """Content with neither an artifact nor a remote artifact fails the publish."""
+    repo_version = create_version(repository, remote, add=["a.txt"])
+    RemoteArtifact.objects.filter(content_artifact__relative_path="a.txt").delete()
+
+    with pytest.raises(PublishError, match="a.txt"):
+        list(yield_entries_for_version(repo_version))
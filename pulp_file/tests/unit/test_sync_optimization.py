@@ -1,4 +1,13 @@
-from pulp_file.app.tasks.synchronizing import _should_optimize_sync
+from unittest import mock
+from uuid import uuid4
+
+import pytest
+
+from pulpcore.plugin.models import Domain
+from pulpcore.plugin.util import set_domain
+
+from pulp_file.app.tasks.synchronizing import FileFirstStage, _should_optimize_sync
+from pulp_file.manifest import Entry
 
 
 class TestShouldOptimizeSync:
@@ -32,6 +41,14 @@ class TestShouldOptimizeSync:
         current = self._details(manifest_checksum="def456")
         assert _should_optimize_sync(current, last) is False
 
+    def test_manifest_checksum_changed_incremental(self):
+        """Only the changed entries need syncing if the manifest checksum changed."""
+        last = self._details()
+        current = self._details(manifest_checksum="def456")
+        assert _should_optimize_sync(current, last, check_manifest=False) is True
+        current = self._details(manifest_checksum="def456", most_recent_version=2)
+        assert _should_optimize_sync(current, last, check_manifest=False) is False
+
     def test_url_changed(self):
         """Sync should not be skipped if the remote URL changed."""
         last = self._details()
@@ -85,3 +102,67 @@ class TestShouldOptimizeSync:
         last = self._details()
         current = self._details(remote_pk="00000000-0000-0000-0000-000000000002")
         assert _should_optimize_sync(current, last) is False
+
+
+@pytest.mark.asyncio
+async def test_manifest_diff():
+    """Only entries missing from the version are emitted and the rest of it is removed."""
+    existing = [("a", "1", "pk-a"), ("b", "1", "pk-b-old"), ("c", "1", "pk-c"), ("e", "1", "pk-e")]
+
+    async def existing_content():
+        for row in existing:
+            yield row
+
+    with mock.patch("pulpcore.plugin.stages.api.get_domain"):
+        stage = FileFirstStage(mock.Mock(), "http://example.com/PULP_MANIFEST", version=mock.Mock())
+    entries = [Entry("a", 1, "1"), Entry("b", 1, "2"), Entry("c", 1, "1"), Entry("d", 1, "1")]
+    entries.append(Entry("d", 1, "1"))
+
+    with mock.patch.object(stage, "_existing_content", existing_content):
+        emitted = [(entry.relative_path, entry.digest) async for entry in stage._diff(entries)]
+
+    assert emitted == [("b", "2"), ("d", "1")]
+    assert stage.removed_content == ["pk-b-old", "pk-e"]
+
+
+@pytest.mark.asyncio
+async def test_manifest_progress_total(tmp_path):
+    """A full sync streams the manifest and still reports the total of its entries."""
+    set_domain(Domain(pk=uuid4(), name=uuid4()))
+    manifest = tmp_path / "PULP_MANIFEST"
+    manifest.write_text("".join(f"file-{i},{i:064x},{i}\n" for i in range(5)))
+    reports = []
+
+    class FakeProgressReport:
+        def __init__(self, message, code):
+            self.code, self.total, self.done = code, None, 0
+            reports.append(self)
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def asave(self):
+            pass
+
+        async def aincrement(self):
+            self.done += 1
+
+    with mock.patch("pulpcore.plugin.stages.api.get_domain"):
+        stage = FileFirstStage(
+            mock.Mock(policy="on_demand"),
+            f"file://{tmp_path}/PULP_MANIFEST",
+            manifest_path=str(manifest),
+        )
+    with (
+        mock.patch("pulp_file.app.tasks.synchronizing.ProgressReport", FakeProgressReport),
+        mock.patch("pulp_file.manifest.BATCH_SIZE", 2),
+        mock.patch.object(stage, "put", new_callable=mock.AsyncMock) as put,
+    ):
+        await stage.run()
+
+    parsing = next(report for report in reports if report.code == "sync.parsing.metadata")
+    assert (parsing.total, parsing.done) == (5, 5)
+    assert put.await_count == 5
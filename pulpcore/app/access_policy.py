@@ -90,11 +90,24 @@ class DefaultAccessPolicy(AccessPolicy):
             request (rest_framework.request.Request): The request being checked for authorization.
             view (subclass rest_framework.viewsets.GenericViewSet): The view name being requested.
 
+        Statements allowing or denying an action also apply to the actions the view maps to it in
+        `ACCESS_POLICY_ACTION_ALIASES`. This way, new actions are covered by the existing access
+        policies of plugins.
+
         Returns:
             The access policy statements in drf-access-policy policy structure.
         """
         # It looks like AccessPolicy is modifying the thing we give it... Tztztz
-        return deepcopy(self.get_access_policy(view)["statements"])
+        statements = deepcopy(self.get_access_policy(view)["statements"])
+        action = getattr(view, "action", None)
+        if alias := getattr(view, "ACCESS_POLICY_ACTION_ALIASES", {}).get(action):
+            for statement in statements:
+                actions = statement["action"]
+                if isinstance(actions, str):
+                    actions = [actions]
+                if alias in actions and action not in actions:
+                    statement["action"] = [*actions, action]
+        return statements
 
 
 class AccessPolicyFromSettings(DefaultAccessPolicy):
@@ -1,4 +1,5 @@
 import random
+import threading
 from collections import defaultdict
 from gettext import gettext as _
 from importlib import import_module
@@ -55,9 +56,40 @@ def get_plugin_config(plugin_app_label):
     raise MissingPlugin(plugin_app_label)
 
 
+class _PluginComponent:
+    """
+    An attribute of a plugin's AppConfig holding components discovered in the plugin's modules.
+
+    Reading it imports the plugin's components first, in case they were not imported on start up
+    because `LAZY_PLUGIN_IMPORTS` is enabled.
+    """
+
+    def __set_name__(self, owner, name):
+        self.attr_name = "_" + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        instance.import_components()
+        return instance.__dict__.get(self.attr_name)
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.attr_name] = value
+
+
 class PulpPluginAppConfig(apps.AppConfig):
     """AppConfig class. Use this in plugins to identify your app as a Pulp plugin."""
 
+    viewsets_module = _PluginComponent()
+    serializers_module = _PluginComponent()
+    urls_module = _PluginComponent()
+    modelresource_module = _PluginComponent()
+    exportable_classes = _PluginComponent()
+    replicator_module = _PluginComponent()
+    replicator_classes = _PluginComponent()
+    named_viewsets = _PluginComponent()
+    named_serializers = _PluginComponent()
+
     # Plugin behavior loading should happen in ready(), not in __init__().
     # ready() is called after all models are initialized, and at that point we should
     # be able to safely inspect the plugin modules to look for any components we need
@@ -93,10 +125,13 @@ class PulpPluginAppConfig(apps.AppConfig):
                     "plugin or turn off `DOMAIN_ENABLED` for Pulp to start."
                 )
                 raise ImproperlyConfigured(msg.format(self.python_package_name, self.version))
+        self._components_imported = False
+        self._components_importing = False
+        self._components_lock = threading.RLock()
         # Module containing viewsets eg. <module 'pulp_plugin.app.viewsets'
         # from 'pulp_plugin/app/viewsets.py'>. Set by import_viewsets().
         # None if the application doesn't have a viewsets module, automatically set
-        # when this app becomes ready.
+        # when the plugin components are imported.
         self.viewsets_module = None
 
         # Module containing urlpatterns
@@ -121,11 +156,8 @@ class PulpPluginAppConfig(apps.AppConfig):
         MODULE_PLUGIN_VERSIONS[self.__module__.split(".", maxsplit=1)[0]] = {
             self.label: self.version
         }
-        self.import_viewsets()
-        self.import_serializers()
-        self.import_urls()
-        self.import_modelresources()
-        self.import_replicators()
+        if not settings.LAZY_PLUGIN_IMPORTS:
+            self.import_components()
         post_migrate.connect(
             _populate_access_policies,
             sender=self,
@@ -133,6 +165,33 @@ class PulpPluginAppConfig(apps.AppConfig):
         )
         post_migrate.connect(_populate_roles, sender=self, dispatch_uid="populate_roles_identifier")
 
+    def import_components(self):
+        """
+        Import the viewsets, serializers, urls, model resources and replicators of the plugin.
+
+        This happens when the app becomes ready, unless `LAZY_PLUGIN_IMPORTS` is enabled. Then it
+        is deferred until one of the discovered components is first needed. It is a no-op once
+        the components have been imported.
+        """
+        if self._components_imported:
+            return
+        # Other threads wait on the lock until the components are complete.
+        with self._components_lock:
+            # The importing thread re-enters when the import methods read the components they
+            # are populating.
+            if self._components_imported or self._components_importing:
+                return
+            self._components_importing = True
+            try:
+                self.import_viewsets()
+                self.import_serializers()
+                self.import_urls()
+                self.import_modelresources()
+                self.import_replicators()
+            finally:
+                self._components_importing = False
+            self._components_imported = True
+
     def import_serializers(self):
         # circular import avoidance
         from pulpcore.app.serializers import ModelSerializer
@@ -64,6 +64,14 @@ class PulpApiWorker(SyncWorker):
                 logger.error(f"{self.fail_beat_msg} Exception: {str(e)}")
                 raise
 
+    def _warm_schema_cache(self):
+        from pulpcore.openapi.cache import warm_schema_cache
+
+        try:
+            warm_schema_cache()
+        finally:
+            connection.close()
+
     def init_process(self):
         os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pulpcore.app.settings")
         django.setup()
@@ -109,6 +117,11 @@ class PulpApiWorker(SyncWorker):
         )
         self.heartbeat_thread.start()
 
+        # Regenerate the OpenAPI schema after an upgrade before a client has to wait for it.
+        threading.Thread(
+            target=self._warm_schema_cache, daemon=True, name=f"schema-{self.name}"
+        ).start()
+
         super().init_process()
 
     def run(self):
@@ -55,6 +55,42 @@ class PulpTemporaryUploadedFile(TemporaryUploadedFile):
 
         return instance
 
+    @classmethod
+    def from_chunks(cls, chunks):
+        """
+        Create a PulpTemporaryUploadedFile by concatenating the files of upload chunks.
+
+        Every chunk is read only once, its data is hashed while it is written to the new file, so
+        the result can be turned into an Artifact without reading it again.
+
+        Args:
+            chunks (iterable): Chunks ordered by offset, e.g.
+                [pulpcore.app.models.UploadChunk][] objects, whose ``file`` holds the data.
+
+        Returns:
+            PulpTemporaryUploadedFile: instantiated instance holding the concatenated data
+        """
+        instance = cls("upload", "", 0, "")
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            for chunk in chunks:
+                chunk.file.open("rb")
+                try:
+                    # Default 1MB
+                    while data := chunk.file.read(1048576):
+                        futures = [
+                            executor.submit(instance.hashers[hasher].update, data)
+                            for hasher in models.Artifact.DIGEST_FIELDS
+                        ]
+                        instance.file.write(data)
+                        instance.size += len(data)
+                        concurrent.futures.wait(futures, timeout=None, return_when=ALL_COMPLETED)
+                finally:
+                    chunk.file.close()
+        instance.file.flush()
+        instance.file.seek(0)
+
+        return instance
+
 
 class HashingFileUploadHandler(TemporaryFileUploadHandler):
     """
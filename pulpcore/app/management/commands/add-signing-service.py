@@ -69,6 +69,14 @@ class Command(BaseCommand):
             required=False,
             help=_("The name of the keyring file."),
         )
+        parser.add_argument(
+            "--batch",
+            action="store_true",
+            help=_(
+                "The script can sign many files in one run, reading their names from stdin when "
+                "started with the --batch argument."
+            ),
+        )
 
     def handle(self, *args, **options):
         name = options["name"]
@@ -124,6 +132,7 @@ class Command(BaseCommand):
                 public_key=public_key,
                 pubkey_fingerprint=fingerprint,
                 script=script_path,
+                batch=options["batch"],
             )
         except IntegrityError as e:
             raise CommandError(str(e))
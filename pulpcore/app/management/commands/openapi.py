@@ -10,6 +10,7 @@ from drf_spectacular.validation import validate_schema
 from rest_framework.request import Request
 
 from pulpcore.openapi import PulpSchemaGenerator
+from pulpcore.openapi.cache import get_cached_schema, schema_cache_key, set_cached_schema
 
 
 class SchemaValidationError(CommandError):
@@ -68,9 +69,9 @@ class Command(BaseCommand):
 
             if options["lang"]:
                 with translation.override(options["lang"]):
-                    schema = generator.get_schema(request=request, public=True)
+                    schema = self.get_schema(generator, request, options)
             else:
-                schema = generator.get_schema(request=request, public=True)
+                schema = self.get_schema(generator, request, options)
 
         if options["validate"]:
             try:
@@ -87,6 +88,21 @@ class Command(BaseCommand):
         else:
             self.stdout.write(output.decode())
 
+    def get_schema(self, generator, request, options):
+        """
+        Get the schema from the schema cache, generating it if it is not cached yet.
+
+        Custom settings and url confs are not part of the cache key, their schemas are always
+        generated.
+        """
+        if options["custom_settings"] or options["urlconf"]:
+            return generator.get_schema(request=request, public=True)
+        key = schema_cache_key(request.query_params)
+        if (schema := get_cached_schema(key)) is None:
+            schema = generator.get_schema(request=request, public=True)
+            set_cached_schema(key, schema)
+        return schema
+
     def get_renderer(self, format):
         renderer_cls = {
             "openapi": OpenApiYamlRenderer,
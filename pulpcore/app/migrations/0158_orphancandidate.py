@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:50
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+import django_lifecycle.mixins
+import pulpcore.app.models.base
+import pulpcore.app.util
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0157_pendingfiledeletion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrphanCandidate',
+            fields=[
+                ('pulp_id', models.UUIDField(default=pulpcore.app.models.base.pulp_uuid, editable=False, primary_key=True, serialize=False)),
+                ('pulp_created', models.DateTimeField(auto_now_add=True)),
+                ('pulp_last_updated', models.DateTimeField(auto_now=True, null=True)),
+                ('content_id', models.UUIDField(null=True, unique=True)),
+                ('artifact_id', models.UUIDField(null=True, unique=True)),
+                ('pulp_domain', models.ForeignKey(default=pulpcore.app.util.get_domain_pk, on_delete=django.db.models.deletion.CASCADE, to='core.domain')),
+            ],
+            options={
+                'abstract': False,
+            },
+            bases=(django_lifecycle.mixins.LifecycleModelMixin, models.Model),
+        ),
+        migrations.AddField(
+            model_name='taskschedule',
+            name='exclusive_resources',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.TextField(), null=True, size=None),
+        ),
+    ]
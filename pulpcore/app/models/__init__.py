@@ -25,6 +25,8 @@ from .content import (
     Content,
     ContentManager,
     ContentArtifact,
+    OrphanCandidate,
+    PendingFileDeletion,
     PulpTemporaryFile,
     RemoteArtifact,
     SigningService,
@@ -123,6 +125,8 @@ __all__ = [
     "Content",
     "ContentManager",
     "ContentArtifact",
+    "OrphanCandidate",
+    "PendingFileDeletion",
     "PulpTemporaryFile",
     "RemoteArtifact",
     "SigningService",
@@ -1,6 +1,6 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group as BaseGroup
-from django.db import models
+from django.db import models, transaction
 from django_lifecycle import LifecycleModelMixin, hook
 
 from pulpcore.app.models import BaseModel
@@ -39,6 +39,13 @@ class AccessPolicy(BaseModel):
     customized = models.BooleanField(default=False)
     queryset_scoping = models.JSONField(null=True)
 
+    @hook("after_save")
+    def invalidate_content_guard_cache(self):
+        # Content guards like RBACContentGuard decide by the access policy of their viewset.
+        from pulpcore.cache.content_guard import content_guard_cache
+
+        transaction.on_commit(content_guard_cache.invalidate)
+
 
 class AutoAddObjPermsMixin:
     """
@@ -6,14 +6,15 @@ import asyncio
 import datetime
 import json
 import os
-import shutil
 import subprocess
 import tempfile
 from collections import defaultdict
 from functools import lru_cache, partial
 from gettext import gettext as _
 from itertools import chain
+from logging import getLogger
 
+from asgiref.sync import async_to_sync
 from django.conf import settings
 from django.contrib.postgres.fields import HStoreField
 from django.contrib.postgres.indexes import GinIndex
@@ -25,6 +26,7 @@ from django_guid import get_guid
 from django_lifecycle import BEFORE_SAVE, BEFORE_UPDATE, hook
 
 from pulpcore.app import pulp_hashlib
+from pulpcore.app.files import PulpTemporaryUploadedFile
 from pulpcore.app.models import BaseModel, MasterModel, fields, storage
 from pulpcore.app.models.fields import RelativePathField
 from pulpcore.app.util import get_domain_pk, gpg_verify
@@ -36,6 +38,8 @@ from pulpcore.exceptions import (
     UnsupportedDigestValidationError,
 )
 
+log = getLogger(__name__)
+
 # All available digest fields ordered by algorithm strength.
 _DIGEST_FIELDS = []
 for alg in ("sha512", "sha384", "sha256", "sha224", "sha1", "md5"):
@@ -188,6 +192,38 @@ class ArtifactQuerySet(BulkTouchQuerySet):
             pulp_domain=domain_pk,
         )
 
+    def delete_with_files(self, domain):
+        """
+        Delete the artifacts with a single query and remove their files from the storage.
+
+        Artifacts locked by another transaction are about to be used again and are skipped. The
+        files are recorded as pending deletions in the transaction deleting the artifacts and are
+        removed from the storage once it is committed.
+
+        Args:
+            domain (pulpcore.app.models.Domain): The domain of the artifacts.
+
+        Returns:
+            int: The number of artifacts deleted.
+
+        Raises:
+            django.db.models.ProtectedError: If some of the artifacts are still used by content.
+        """
+        with transaction.atomic():
+            files = dict(
+                self.model.objects.filter(pk__in=self.values("pk"), pulp_domain=domain)
+                .select_for_update(skip_locked=True)
+                .values_list("pk", "file")
+            )
+            self.model.objects.filter(pk__in=files.keys()).delete()
+            pending = PendingFileDeletion.objects.bulk_create(
+                [PendingFileDeletion(file=name, pulp_domain=domain) for name in files.values()]
+            )
+            transaction.on_commit(
+                partial(PendingFileDeletion.flush, domain, pks=[p.pk for p in pending])
+            )
+        return len(files)
+
 
 class Artifact(HandleTempFilesMixin, BaseModel):
     """
@@ -386,16 +422,25 @@ class Artifact(HandleTempFilesMixin, BaseModel):
         """
         Creates an Artifact from PulpTemporaryFile.
 
+        A file on the local file system is hashed in place and copied into the artifact storage by
+        the storage backend. Otherwise the file is hashed while it is downloaded into the working
+        directory, from where it is moved into the artifact storage.
+
         Returns:
             An saved [pulpcore.plugin.models.Artifact][]
         """
-        artifact_file = temp_file.file.open()
-        with tempfile.NamedTemporaryFile("wb") as new_file:
-            shutil.copyfileobj(artifact_file, new_file)
-            new_file.flush()
-            artifact_file.close()
-            artifact = cls.init_and_validate(new_file.name)
+        try:
+            path = temp_file.file.path
+        except NotImplementedError:
+            path = None
+
+        if path:
+            artifact = cls.init_and_validate(path)
             artifact.save()
+        else:
+            with PulpTemporaryUploadedFile.from_chunks([temp_file]) as new_file:
+                artifact = cls.init_and_validate(new_file)
+                artifact.save()
         temp_file.delete()
         return artifact
 
@@ -406,6 +451,64 @@ class Artifact(HandleTempFilesMixin, BaseModel):
         self.__class__.objects.filter(pk=self.pk).touch()
 
 
+class PendingFileDeletion(BaseModel):
+    """
+    A file in a domain's storage whose database record has already been deleted.
+
+    Rows are created in the same transaction that deletes the records owning the files, and are
+    removed once the files are gone from the storage. Rows left behind by an interrupted task are
+    picked up by the next cleanup, so no file is leaked.
+
+    Fields:
+        file (models.TextField): The storage name of the file to delete.
+
+    Relations:
+        pulp_domain (models.ForeignKey): The domain whose storage holds the file.
+    """
+
+    file = models.TextField(null=False)
+    pulp_domain = models.ForeignKey("Domain", default=get_domain_pk, on_delete=models.PROTECT)
+
+    @classmethod
+    def flush(cls, domain, pks=None):
+        """
+        Delete the pending files of a domain from its storage and forget about them.
+
+        Files that got a new Artifact record in the meantime are kept in the storage. Files that
+        failed to be deleted stay pending for the next run.
+
+        Args:
+            domain (pulpcore.app.models.Domain): The domain to delete the pending files of.
+            pks (list): Only process these pending deletions. Process all of them if not set.
+
+        Returns:
+            int: The number of files that remain pending.
+        """
+        qs = cls.objects.filter(pulp_domain=domain)
+        if pks is not None:
+            qs = qs.filter(pk__in=pks)
+        failed = 0
+        last_pk = None
+        while True:
+            batch_qs = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+            batch = list(batch_qs.order_by("pk").values_list("pk", "file")[:1000])
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+            names = {name for _, name in batch}
+            reused = set(
+                Artifact.objects.filter(pulp_domain=domain, file__in=names).values_list(
+                    "file", flat=True
+                )
+            )
+            failed_names = set(storage.delete_files(domain, names - reused))
+            failed += len(failed_names)
+            cls.objects.filter(
+                pk__in=[pk for pk, name in batch if name not in failed_names]
+            ).delete()
+        return failed
+
+
 class PulpTemporaryFile(HandleTempFilesMixin, BaseModel):
     """
     A temporary file saved to the storage backend.
@@ -567,8 +670,12 @@ class Content(MasterModel, QueryMixin):
         """
         Tuple of the repository models that can store this content type.
 
-        Populated at start up time. Read only.
+        Populated when the plugin viewsets are imported. Read only.
         """
+        from pulpcore.app.apps import pulp_plugin_configs  # circular import avoidance
+
+        for plugin_config in pulp_plugin_configs():
+            plugin_config.import_components()
         return tuple(cls._repository_types[cls])
 
     @classmethod
@@ -645,6 +752,89 @@ class Content(MasterModel, QueryMixin):
         self.__class__.objects.filter(pk=self.pk).touch()
 
 
+class OrphanCandidate(BaseModel):
+    """
+    A Content or Artifact that may have become an orphan.
+
+    Content is recorded when it loses its last repository membership, Artifacts when they lose
+    their last ContentArtifact. An incremental orphan cleanup only looks at these candidates
+    instead of scanning the whole Content and Artifact tables. Every Content or Artifact is recorded
+    at most once. Candidates are dropped once they are deleted or used again.
+
+    Fields:
+        content_id (models.UUIDField): The pk of the candidate Content.
+        artifact_id (models.UUIDField): The pk of the candidate Artifact.
+
+    Relations:
+        pulp_domain (models.ForeignKey): The domain the candidate lives in.
+    """
+
+    content_id = models.UUIDField(null=True, unique=True)
+    artifact_id = models.UUIDField(null=True, unique=True)
+    pulp_domain = models.ForeignKey("Domain", default=get_domain_pk, on_delete=models.CASCADE)
+
+    @classmethod
+    def add_content(cls, content_pks, domain_pk=None):
+        """
+        Record the orphans among the given Content.
+
+        Args:
+            content_pks (iterable): pks of Content that just lost a repository membership.
+            domain_pk (uuid): The domain of the Content. Defaults to the current domain.
+        """
+        domain_pk = domain_pk or get_domain_pk()
+        content_pks = list(content_pks)
+        for i in range(0, len(content_pks), 1000):
+            orphans = Content.objects.filter(
+                pk__in=content_pks[i : i + 1000], version_memberships__isnull=True
+            ).values_list("pk", flat=True)
+            cls.objects.bulk_create(
+                [cls(content_id=pk, pulp_domain_id=domain_pk) for pk in orphans],
+                ignore_conflicts=True,
+            )
+
+    @classmethod
+    def add_artifacts(cls, artifact_pks, domain_pk=None):
+        """
+        Record the orphans among the given Artifacts.
+
+        Args:
+            artifact_pks (iterable): pks of Artifacts that just lost a ContentArtifact.
+            domain_pk (uuid): The domain of the Artifacts. Defaults to the current domain.
+        """
+        domain_pk = domain_pk or get_domain_pk()
+        artifact_pks = list(artifact_pks)
+        for i in range(0, len(artifact_pks), 1000):
+            orphans = Artifact.objects.filter(
+                pk__in=artifact_pks[i : i + 1000], content_memberships__isnull=True
+            ).values_list("pk", flat=True)
+            cls.objects.bulk_create(
+                [cls(artifact_id=pk, pulp_domain_id=domain_pk) for pk in orphans],
+                ignore_conflicts=True,
+            )
+
+    @classmethod
+    def prune(cls, domain_pk=None):
+        """
+        Forget the candidates that were deleted or are no longer orphans.
+
+        Args:
+            domain_pk (uuid): The domain to prune. Defaults to the current domain.
+        """
+        domain_pk = domain_pk or get_domain_pk()
+        candidates = cls.objects.filter(pulp_domain_id=domain_pk)
+        orphan_content = Content.objects.filter(
+            pk=models.OuterRef("content_id"), version_memberships__isnull=True
+        )
+        candidates.filter(content_id__isnull=False).exclude(models.Exists(orphan_content)).delete()
+        orphan_artifact = Artifact.objects.filter(
+            pk=models.OuterRef("artifact_id"), content_memberships__isnull=True
+        )
+        candidates.filter(artifact_id__isnull=False).exclude(
+            models.Exists(orphan_artifact)
+        ).delete()
+
+
 class ContentArtifact(BaseModel, QueryMixin):
     """
     A relationship between a Content and an Artifact.
@@ -796,6 +986,9 @@ class SigningService(BaseModel):
             The value of the public key.
         script (models.TextField):
             An absolute path to an external signing script (or executable).
+        batch (models.BooleanField):
+            Whether the script can run as a long-lived helper signing many files, see
+            `sign_many()`.
 
     """
 
@@ -803,6 +996,7 @@ class SigningService(BaseModel):
     public_key = models.TextField()
     pubkey_fingerprint = models.TextField()
     script = models.TextField()
+    batch = models.BooleanField(default=False)
 
     def _env_variables(self, env_vars=None):
         guid = get_guid()
@@ -870,6 +1064,137 @@ class SigningService(BaseModel):
 
         return return_value
 
+    def sign_many(self, filenames, env_vars=None, fallback=True):
+        """
+        Signs many files, sparing the startup of a script per file where the script allows it.
+
+        See `asign_many()`.
+
+        Args:
+            filenames (list): Relative paths to the files which are intended to be signed.
+            env_vars (dict): dictionary of environment variables
+            fallback (bool): Whether to sign the files one at a time if the batch mode fails.
+
+        Raises:
+            RuntimeError: If signing any of the files failed.
+
+        Returns:
+            A list of dictionaries as validated by the validate() method, one per file.
+        """
+        return async_to_sync(self.asign_many)(filenames, env_vars=env_vars, fallback=fallback)
+
+    async def asign_many(self, filenames, env_vars=None, fallback=True):
+        """
+        Async version of sign_many.
+
+        Up to `SIGNING_SERVICE_CONCURRENCY` files are signed at a time. If the signing service is
+        a `batch` one, the script is started with the `--batch` argument once per concurrent
+        signer instead of once per file. It then reads the filenames from its stdin, one per line,
+        and answers each of them with one line of JSON on its stdout, either the return value
+        `sign()` would have returned for the file, or `{"error": "<message>"}`. The script should
+        exit when its stdin is closed.
+
+        If the script can not be run in batch mode or stops answering, the remaining files are
+        signed one at a time with `asign()`, unless `fallback` is disabled.
+
+        Args:
+            filenames (list): Relative paths to the files which are intended to be signed.
+            env_vars (dict): dictionary of environment variables
+            fallback (bool): Whether to sign the files one at a time if the batch mode fails.
+
+        Raises:
+            RuntimeError: If signing any of the files failed.
+
+        Returns:
+            A list of dictionaries as validated by the validate() method, one per file.
+        """
+        queue = asyncio.Queue()
+        for index, filename in enumerate(filenames):
+            queue.put_nowait((index, filename))
+        results = [None] * len(filenames)
+        signers = min(settings.SIGNING_SERVICE_CONCURRENCY, len(filenames))
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for _ in range(signers):
+                    task_group.create_task(self._sign_queued(queue, results, env_vars, fallback))
+        except ExceptionGroup as e:
+            raise e.exceptions[0]
+        return results
+
+    async def _sign_queued(self, queue, results, env_vars, fallback):
+        """
+        Sign the files of the queue until it is empty, storing the return values in results.
+        """
+        if self.batch:
+            try:
+                await self._sign_queued_batch(queue, results, env_vars)
+            except _BatchSigningError as e:
+                if not fallback:
+                    raise RuntimeError(str(e))
+                log.warning(
+                    _(
+                        "Signing service '{}' failed in batch mode, signing one file at a time: {}"
+                    ).format(self.name, e)
+                )
+                if e.pending:
+                    queue.put_nowait(e.pending)
+        while not queue.empty():
+            index, filename = queue.get_nowait()
+            results[index] = await self.asign(filename, env_vars)
+
+    async def _sign_queued_batch(self, queue, results, env_vars):
+        """
+        Sign the files of the queue with a single run of the script in batch mode.
+
+        Raises:
+            _BatchSigningError: If the script failed, with the file it did not sign.
+        """
+        try:
+            process = await asyncio.create_subprocess_exec(
+                self.script,
+                "--batch",
+                env=self._env_variables(env_vars),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError as e:
+            raise _BatchSigningError(str(e))
+        # Keep reading stderr, so the script is never blocked writing to it.
+        stderr = asyncio.create_task(process.stderr.read())
+        try:
+            while not queue.empty():
+                index, filename = pending = queue.get_nowait()
+                if "\n" in filename:
+                    # The filename can not be passed as a line, so it is signed on its own.
+                    results[index] = await self.asign(filename, env_vars)
+                    continue
+                try:
+                    process.stdin.write(filename.encode() + b"\n")
+                    await process.stdin.drain()
+                    line = await process.stdout.readline()
+                except (BrokenPipeError, ConnectionResetError) as e:
+                    raise _BatchSigningError(str(e), pending)
+                if not line:
+                    await process.wait()
+                    raise _BatchSigningError((await stderr).decode(errors="replace"), pending)
+                try:
+                    return_value = json.loads(line)
+                except json.JSONDecodeError:
+                    raise _BatchSigningError("The script did not return valid JSON!", pending)
+                if "error" in return_value:
+                    raise RuntimeError(return_value["error"])
+                results[index] = return_value
+        finally:
+            if process.returncode is None:
+                process.stdin.close()
+                try:
+                    await asyncio.wait_for(process.wait(), timeout=10)
+                except TimeoutError:
+                    process.kill()
+                    await process.wait()
+            await stderr
+
     def validate(self):
         """
         Ensure that the external signing script produces the desired behaviour.
@@ -910,6 +1235,16 @@ class SigningService(BaseModel):
         )
 
 
+class _BatchSigningError(Exception):
+    """
+    A signing script run in batch mode failed before signing the pending file.
+    """
+
+    def __init__(self, message, pending=None):
+        super().__init__(message)
+        self.pending = pending
+
+
 class AsciiArmoredDetachedSigningService(SigningService):
     """
     A model used for creating detached ASCII armored signatures.
@@ -924,7 +1259,8 @@ class AsciiArmoredDetachedSigningService(SigningService):
         {"file": "signed_file.xml", "signature": "signed_file.asc"}
 
         The method creates a file with some content, signs the file, and checks if the
-        signature can be verified by the provided public key.
+        signature can be verified by the provided public key. A batch signing service must also
+        sign several files with the script in batch mode, see `sign_many()`.
 
         Raises:
             RuntimeError: If the validation has failed.
@@ -936,3 +1272,15 @@ class AsciiArmoredDetachedSigningService(SigningService):
                 return_value = self.sign(temp_file.name)
 
                 gpg_verify(self.public_key, return_value["signature"], temp_file.name)
+
+            if self.batch:
+                filenames = []
+                for i in range(2):
+                    filename = os.path.join(temp_directory_name, f"batch-{i}")
+                    with open(filename, "wb") as fp:
+                        fp.write(b"arbitrary data %d" % i)
+                    filenames.append(filename)
+                return_values = self.sign_many(filenames, fallback=False)
+
+                for filename, return_value in zip(filenames, return_values):
+                    gpg_verify(self.public_key, return_value["signature"], filename)
@@ -74,6 +74,9 @@ class Domain(BaseModel, AutoAddObjPermsMixin):
         for artifact in self.artifact_set.all().iterator():
             # Delete on by one to properly cleanup the storage.
             artifact.delete()
+        from pulpcore.app.models import PendingFileDeletion
+
+        PendingFileDeletion.flush(self)
 
     class Meta:
         permissions = [
@@ -4,6 +4,7 @@ Django models related to progress reporting
 
 import datetime
 import logging
+import threading
 from asyncio import CancelledError
 from gettext import gettext as _
 
@@ -16,6 +17,55 @@ from pulpcore.constants import TASK_CHOICES, TASK_STATES
 _logger = logging.getLogger(__name__)
 
 
+class _ProgressAggregator:
+    """
+    Collects the rate limited updates of all progress reports of one task.
+
+    Instead of every report writing its own row once its interval elapsed, the pending reports
+    of a task are written together in a single bulk update once per interval.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.last_flush = timezone.now()
+
+    def add(self, report, now, interval):
+        """
+        Register a pending update and return the reports to write if the interval elapsed.
+        """
+        with self.lock:
+            self.pending[report.pk] = report
+            if now - self.last_flush < interval:
+                return []
+            self.last_flush = now
+            return self._take()
+
+    def discard(self, report):
+        with self.lock:
+            self.pending.pop(report.pk, None)
+
+    def take(self):
+        with self.lock:
+            return self._take()
+
+    def _take(self):
+        reports = list(self.pending.values())
+        self.pending.clear()
+        return reports
+
+
+_aggregators = {}
+_aggregators_lock = threading.Lock()
+
+
+def _get_aggregator(task_id, create=True):
+    with _aggregators_lock:
+        if create:
+            return _aggregators.setdefault(task_id, _ProgressAggregator())
+        return _aggregators.get(task_id)
+
+
 class ProgressReport(BaseModel):
     """
     A model for all progress reporting.
@@ -47,7 +97,9 @@ class ProgressReport(BaseModel):
     The ProgressReport() is a context manager that provides automatic state transitions and saving
     for the RUNNING CANCELED COMPLETED and FAILED states. The increment() method can be called in
     the loop as work is completed. When ProgressReport() is used as a context manager progress
-    reporting is rate limited to every 500 milliseconds.
+    reporting is rate limited: the updates of all reports of a task are written together in one
+    bulk update every `BATCH_INTERVAL` milliseconds, and any update still pending is written when
+    the task finishes.
     Use it as follows:
 
         >>> progress_bar = ProgressReport(
@@ -104,8 +156,10 @@ class ProgressReport(BaseModel):
             it will be set to the current task_id.
     """
 
-    # number of ms between save() calls when _using_context_manager is set
+    # number of ms between writes of the rate limited updates when _using_context_manager is set
     BATCH_INTERVAL = 2000
+    # fields written by the batched updates
+    BATCH_FIELDS = ["message", "state", "total", "done", "suffix", "pulp_last_updated"]
 
     message = models.TextField()
     code = models.TextField()
@@ -137,12 +191,12 @@ class ProgressReport(BaseModel):
             self.task = Task.current()
 
         if self._using_context_manager and self._last_save_time:
-            if now - self._last_save_time >= datetime.timedelta(milliseconds=self.BATCH_INTERVAL):
-                super().save(*args, **kwargs)
-                self._last_save_time = now
+            if reports := self._add_pending(now):
+                type(self).objects.bulk_update(reports, self.BATCH_FIELDS)
         else:
             super().save(*args, **kwargs)
             self._last_save_time = now
+            self._discard_pending()
 
     async def asave(self, *args, **kwargs):
         """
@@ -160,12 +214,48 @@ class ProgressReport(BaseModel):
             self.task = Task.current()
 
         if self._using_context_manager and self._last_save_time:
-            if now - self._last_save_time >= datetime.timedelta(milliseconds=self.BATCH_INTERVAL):
-                await super().asave(*args, **kwargs)
-                self._last_save_time = now
+            if reports := self._add_pending(now):
+                await type(self).objects.abulk_update(reports, self.BATCH_FIELDS)
         else:
             await super().asave(*args, **kwargs)
             self._last_save_time = now
+            self._discard_pending()
+
+    def _add_pending(self, now):
+        """
+        Queue this report for the next batched write of its task.
+
+        Returns:
+            The reports of the task to write now, all with their timestamps updated.
+        """
+        interval = datetime.timedelta(milliseconds=self.BATCH_INTERVAL)
+        reports = _get_aggregator(self.task_id).add(self, now, interval)
+        for report in reports:
+            report.pulp_last_updated = now
+            report._last_save_time = now
+        return reports
+
+    def _discard_pending(self):
+        if aggregator := _get_aggregator(self.task_id, create=False):
+            aggregator.discard(self)
+
+    @classmethod
+    def flush_pending(cls, task_id):
+        """
+        Write the pending rate limited updates of a task and stop collecting them.
+
+        This is called when the task finishes.
+
+        Args:
+            task_id: The primary key of the task.
+        """
+        with _aggregators_lock:
+            aggregator = _aggregators.pop(task_id, None)
+        if aggregator and (reports := aggregator.take()):
+            now = timezone.now()
+            for report in reports:
+                report.pulp_last_updated = now
+            cls.objects.bulk_update(reports, cls.BATCH_FIELDS)
 
     def __enter__(self):
         """
@@ -7,6 +7,7 @@ from base64 import b64decode
 from binascii import Error as Base64DecodeError
 from datetime import timedelta
 from gettext import gettext as _
+from itertools import islice
 from urllib.parse import urljoin, urlparse
 
 import jq
@@ -15,6 +16,8 @@ from django.conf import settings
 from django.contrib.postgres.fields import HStoreField
 from django.contrib.postgres.indexes import OpClass, SpGistIndex
 from django.db import DatabaseError, IntegrityError, models, transaction
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
 from django.utils import timezone
 from django_lifecycle import AFTER_CREATE, AFTER_UPDATE, BEFORE_DELETE, hook
 from rest_framework.exceptions import APIException
@@ -25,6 +28,7 @@ from pulpcore.app.models import AutoAddObjPermsMixin
 from pulpcore.app.models.fields import RelativePathField
 from pulpcore.app.util import cache_key, get_domain_pk, get_url, retain_distributed_pub_enabled
 from pulpcore.cache import Cache
+from pulpcore.cache.content_guard import content_guard_cache
 from pulpcore.responses import ArtifactResponse
 
 from .base import BaseModel, MasterModel
@@ -34,6 +38,9 @@ from .task import CreatedResource
 
 _logger = logging.getLogger(__name__)
 
+# The number of published artifacts copied at once from a base publication
+PUBLISHED_ARTIFACT_BATCH_SIZE = 5000
+
 
 class PublicationQuerySet(models.QuerySet):
     """A queryset that provides publication filtering methods."""
@@ -185,6 +192,105 @@ class Publication(MasterModel):
             CreatedResource.objects.filter(object_id=self.pk).delete()
             return super().delete(**kwargs)
 
+    def get_base_publication(self):
+        """
+        Find a publication this publication can be built from incrementally.
+
+        Returns:
+            pulpcore.app.models.Publication: The latest complete publication of the same type
+                and pass-through mode of this or an earlier version of the repository, or None.
+        """
+        return (
+            type(self)
+            .objects.filter(
+                pulp_type=self.pulp_type,
+                complete=True,
+                pass_through=self.pass_through,
+                repository_version__repository=self.repository_version.repository_id,
+                repository_version__number__lte=self.repository_version.number,
+            )
+            .exclude(pk=self.pk)
+            .order_by("-repository_version__number", "-pulp_created")
+            .first()
+        )
+
+    def copy_from(self, base):
+        """
+        Reuse the published artifacts and metadata of a base publication.
+
+        The published artifacts of the base publication are copied, except for the content that
+        is not in the repository version of this publication anymore, and so is the metadata not
+        listed by `stale_metadata()`. What is left to the plugin is publishing the added content
+        and regenerating the stale metadata.
+
+        Args:
+            base (pulpcore.app.models.Publication): A complete publication, usually the one found
+                by `get_base_publication()`.
+
+        Returns:
+            tuple: The Content added and removed since the repository version of the base
+                publication, both as `django.db.models.QuerySet`.
+        """
+        added = self.repository_version.added(base.repository_version)
+        removed = self.repository_version.removed(base.repository_version)
+        stale = set(self.stale_metadata(base, added, removed))
+
+        with transaction.atomic():
+            if not self.pass_through:
+                published_artifacts = (
+                    base.published_artifact.exclude(content_artifact__content__in=removed)
+                    .exclude(content_artifact__content__pulp_type=PublishedMetadata.get_pulp_type())
+                    .values_list("relative_path", "content_artifact_id")
+                    .iterator(chunk_size=PUBLISHED_ARTIFACT_BATCH_SIZE)
+                )
+                while batch := list(islice(published_artifacts, PUBLISHED_ARTIFACT_BATCH_SIZE)):
+                    PublishedArtifact.objects.bulk_create(
+                        PublishedArtifact(
+                            relative_path=relative_path,
+                            content_artifact_id=content_artifact_id,
+                            publication=self,
+                        )
+                        for relative_path, content_artifact_id in batch
+                    )
+
+            content_artifacts = ContentArtifact.objects.filter(
+                content__in=base.published_metadata.exclude(relative_path__in=stale)
+            )
+            for content_artifact in content_artifacts:
+                metadata = PublishedMetadata(
+                    relative_path=content_artifact.relative_path, publication=self
+                )
+                metadata.save()
+                content_artifact = ContentArtifact.objects.create(
+                    relative_path=content_artifact.relative_path,
+                    content=metadata,
+                    artifact_id=content_artifact.artifact_id,
+                )
+                PublishedArtifact.objects.create(
+                    relative_path=content_artifact.relative_path,
+                    content_artifact=content_artifact,
+                    publication=self,
+                )
+        return added, removed
+
+    def stale_metadata(self, base, added, removed):
+        """
+        Find the metadata of a base publication that changes with the added and removed content.
+
+        Plugin-writers should override this method to reuse the metadata files of a base
+        publication that are not affected by the changes, see `copy_from()`. By default all the
+        metadata is regenerated.
+
+        Args:
+            base (pulpcore.app.models.Publication): The base publication.
+            added (django.db.models.QuerySet): The Content added since the base publication.
+            removed (django.db.models.QuerySet): The Content removed since the base publication.
+
+        Returns:
+            Iterable[str]: The relative paths of the metadata to regenerate.
+        """
+        return base.published_metadata.values_list("relative_path", flat=True)
+
     def finalize_new_publication(self):
         """
         Finalize the incomplete Publication with plugin-provided code.
@@ -388,6 +494,26 @@ class ContentGuard(MasterModel):
         """
         raise NotImplementedError()
 
+    def permit_cache_key(self, request):
+        """
+        Identify the request as far as permit() is concerned, so its decision can be cached.
+
+        Requests with the same key must get the same decision for `CONTENT_GUARD_CACHE_TTL`
+        seconds, unless `content_guard_cache.invalidate()` is called. Guards deciding on anything
+        else than the request and their fields must invalidate the cache when it changes.
+
+        Args:
+            request (aiohttp.web.Request): A request for a published file.
+
+        Returns:
+            A JSON serializable key, or None if the decision must not be cached. Defaults to None.
+        """
+        return None
+
+    @hook(AFTER_UPDATE)
+    def invalidate_permit_cache(self):
+        transaction.on_commit(content_guard_cache.invalidate)
+
     @hook(BEFORE_DELETE)
     def invalidate_cache(self):
         if settings.CACHE_ENABLED:
@@ -422,6 +548,14 @@ class RBACContentGuard(ContentGuard, AutoAddObjPermsMixin):
         except APIException as e:
             raise PermissionError(e)
 
+    def permit_cache_key(self, request):
+        """
+        The decision depends on the roles of the user, which invalidate the cache on change.
+        """
+        if not (drequest := request.get("drf_request", None)):
+            return None
+        return ["user", drequest.user.pk]
+
     class Meta:
         default_related_name = "%(app_label)s_%(model_name)s"
         permissions = (
@@ -464,6 +598,18 @@ class ContentRedirectContentGuard(ContentGuard, AutoAddObjPermsMixin):
         except (KeyError, ValueError):
             raise PermissionError("Access not authenticated")
 
+    def permit_cache_key(self, request):
+        """
+        Only URLs outliving the cached decision can be cached, the others may expire meanwhile.
+        """
+        try:
+            expires = int(request.query["expires"])
+        except (KeyError, ValueError):
+            return None
+        if expires - timezone.now().timestamp() <= settings.CONTENT_GUARD_CACHE_TTL:
+            return None
+        return str(request.url)
+
     def preauthenticate_url(self, url, salt=None):
         """
         Add validate_token to urls query string.
@@ -546,6 +692,9 @@ class HeaderContentGuard(ContentGuard, AutoAddObjPermsMixin):
 
         return
 
+    def permit_cache_key(self, request):
+        return request.headers.get(self.header_name)
+
     class Meta:
         default_related_name = "%(app_label)s_%(model_name)s"
         permissions = (
@@ -571,17 +720,22 @@ class CompositeContentGuard(ContentGuard, AutoAddObjPermsMixin):
 
     guards = models.ManyToManyField(ContentGuard, related_name="+", symmetrical=False)
 
+    def _detail_guards(self):
+        # The instance lives for one request, don't query the guards again for the cache key.
+        if not hasattr(self, "_detail_guards_cache"):
+            self._detail_guards_cache = [guard.cast() for guard in self.guards.all()]
+        return self._detail_guards_cache
+
     def permit(self, request):
         """
         Permit if ANY content-guard allows (OR permissions).
         """
         errors = []
-        if not self.guards.all():
+        if not self._detail_guards():
             # No guards specified? PASS
             return
 
-        for guard in self.guards.all():
-            detail_guard = guard.cast()
+        for detail_guard in self._detail_guards():
             try:
                 detail_guard.permit(request)
                 return  # success on first-pass
@@ -595,6 +749,17 @@ class CompositeContentGuard(ContentGuard, AutoAddObjPermsMixin):
         msg = _("Access forbidden. Refusals: {}").format(errors)
         raise PermissionError(msg)
 
+    def permit_cache_key(self, request):
+        """
+        The request can be cached if it can be for every guard in the list.
+        """
+        keys = []
+        for detail_guard in self._detail_guards():
+            if (key := detail_guard.permit_cache_key(request)) is None:
+                return None
+            keys.append([str(detail_guard.pk), key])
+        return keys
+
     class Meta:
         default_related_name = "%(app_label)s_%(model_name)s"
         permissions = (
@@ -605,6 +770,13 @@ class CompositeContentGuard(ContentGuard, AutoAddObjPermsMixin):
         )
 
 
+@receiver(m2m_changed, sender=CompositeContentGuard.guards.through)
+def composite_guards_changed(sender, action, **kwargs):
+    """Discard cached content guard decisions whenever the guards of a composite change."""
+    if action.startswith("post_"):
+        transaction.on_commit(content_guard_cache.invalidate)
+
+
 class Distribution(MasterModel):
     """
     A Distribution defines how the Content App distributes a publication or repository_version.
@@ -32,7 +32,7 @@ from pulpcore.download.factory import DownloaderFactory
 from pulpcore.exceptions import ContentOverwriteError, ResourceImmutableError
 
 from .base import BaseModel, MasterModel
-from .content import Artifact, Content, ContentArtifact, RemoteArtifact
+from .content import Artifact, Content, ContentArtifact, OrphanCandidate, RemoteArtifact
 from .fields import EncryptedTextField
 from .task import CreatedResource, Task
 
@@ -489,13 +489,30 @@ class Repository(MasterModel):
         if self.retain_repo_versions:
             # Consider only completed versions that aren't protected for cleanup
             versions = self.versions.complete().exclude(pk__in=self.protected_versions())
-            for version in versions.defer("content_ids").order_by("-number")[
-                self.retain_repo_versions :
-            ]:
-                _logger.info(
-                    "Deleting repository version {} due to version retention limit.".format(version)
-                )
-                version.delete()
+            expired = {
+                version.pk: version
+                for version in versions.defer("content_ids").order_by("-number")[
+                    self.retain_repo_versions :
+                ]
+            }
+            if not expired:
+                return
+
+            # Collapse each run of consecutive expired versions into the version that follows it.
+            expired_range = []
+            for version in self.versions.complete().defer("content_ids").order_by("number"):
+                if version.pk in expired:
+                    expired_range.append(expired[version.pk])
+                    continue
+                if expired_range:
+                    for expired_version in expired_range:
+                        _logger.info(
+                            "Deleting repository version {} due to version retention limit.".format(
+                                expired_version
+                            )
+                        )
+                    RepositoryVersion.delete_range(expired_range, version)
+                    expired_range = []
 
     @hook(AFTER_UPDATE, when="retain_checkpoints", has_changed=True)
     def _cleanup_old_checkpoints_hook(self):
@@ -566,7 +583,9 @@ class Repository(MasterModel):
                     PublishedArtifact.objects.db
                 )
 
+            content_pks = list(repo_contents.values_list("content_id", flat=True).distinct())
             repo_contents._raw_delete(repo_contents.db)
+            OrphanCandidate.add_content(content_pks, domain_pk=self.pulp_domain_id)
 
             # Anything not deleted manually above will be caught up in Django cascade. Deleting
             # those ojects manually should keep this operation from being too brutal.
@@ -997,6 +1016,12 @@ class RepositoryVersion(BaseModel):
         if content_qs is None:
             content_qs = Content.objects
 
+        return content_qs.filter(pk__in=self._get_content_ids())
+
+    def _get_content_ids(self):
+        """
+        Returns the ids of the content of this version, to be used as the value of an `in` lookup.
+        """
         content_ids = self.content_ids
         if len(content_ids) >= 65535:
             # Workaround for PostgreSQL's limit on the number of parameters in a query
@@ -1005,7 +1030,7 @@ class RepositoryVersion(BaseModel):
                 .annotate(cids=Func(F("content_ids"), function="unnest"))
                 .values_list("cids", flat=True)
             )
-        return content_qs.filter(pk__in=content_ids)
+        return content_ids
 
     @property
     def content(self):
@@ -1119,8 +1144,8 @@ class RepositoryVersion(BaseModel):
         if not base_version:
             return Content.objects.filter(version_memberships__version_added=self)
 
-        return Content.objects.filter(pk__in=self.content_ids).exclude(
-            pk__in=base_version.content_ids
+        return Content.objects.filter(pk__in=self._get_content_ids()).exclude(
+            pk__in=base_version._get_content_ids()
         )
 
     def removed(self, base_version=None):
@@ -1134,8 +1159,8 @@ class RepositoryVersion(BaseModel):
         if not base_version:
             return Content.objects.filter(version_memberships__version_removed=self)
 
-        return Content.objects.filter(pk__in=base_version.content_ids).exclude(
-            pk__in=self.content_ids
+        return Content.objects.filter(pk__in=base_version._get_content_ids()).exclude(
+            pk__in=self._get_content_ids()
         )
 
     def contains(self, content):
@@ -1225,12 +1250,15 @@ class RepositoryVersion(BaseModel):
         with transaction.atomic():
             # Normalize representation if content has already been added in this version.
             # Undo addition by deleting the RepositoryContent.
-            RepositoryContent.objects.filter(
+            undone = RepositoryContent.objects.filter(
                 repository=self.repository,
                 content_id__in=content,
                 version_added=self,
                 version_removed=None,
-            ).delete()
+            )
+            undone_content_pks = list(undone.values_list("content_id", flat=True))
+            undone.delete()
+            OrphanCandidate.add_content(undone_content_pks)
 
             q_set = RepositoryContent.objects.filter(
                 repository=self.repository, content_id__in=content, version_removed=None
@@ -1298,22 +1326,46 @@ class RepositoryVersion(BaseModel):
         """
         Squash a complete repo version into the next version
         """
-        # delete any relationships added in the version being deleted and removed in the next one.
-        repo_relations.filter(version_added=self, version_removed=next_version).delete()
+        RepositoryVersion._squash_range(repo_relations, [self.pk], next_version)
 
-        # If the same content is deleted in version, but added back in next_version then:
+    @staticmethod
+    def _squash_range(repo_relations, version_pks, next_version):
+        """
+        Squash a contiguous range of complete repo versions into the version following them.
+
+        Args:
+            repo_relations (django.db.models.QuerySet): The RepositoryContent of the repository.
+            version_pks (list): The pks of the versions to squash. No version that is kept may
+                lie between them.
+            next_version (pulpcore.app.models.RepositoryVersion): The first version after the
+                range, which receives all of its changes.
+        """
+        # delete any relationships added in the range and removed again before the next version
+        # is complete.
+        dropped = repo_relations.filter(
+            version_added__in=version_pks,
+            version_removed__in=[*version_pks, next_version.pk],
+        )
+        dropped_content_pks = list(dropped.values_list("content_id", flat=True))
+        dropped.delete()
+        OrphanCandidate.add_content(dropped_content_pks)
+
+        # If the same content is deleted in the range, but added back in the range or in
+        # next_version then:
         # - set version_removed field in relation to version_removed of the relation adding
-        #   the content in next version because the content can be removed again after the
-        #   next_version
-        # - and remove relation adding the content in next_version
-        content_added = repo_relations.filter(version_added=next_version).values_list("content_id")
+        #   the content back because the content can be removed again after the next_version
+        # - and remove relation adding the content back
+        readding_versions = [*version_pks, next_version.pk]
+        content_added = repo_relations.filter(version_added__in=readding_versions).values_list(
+            "content_id"
+        )
 
         content_removed_and_readded = repo_relations.filter(
-            version_removed=self, content_id__in=content_added
+            version_removed__in=version_pks, content_id__in=content_added
         ).values_list("content_id")
 
         repo_contents_readded_in_next_version = repo_relations.filter(
-            version_added=next_version, content_id__in=content_removed_and_readded
+            version_added__in=readding_versions, content_id__in=content_removed_and_readded
         )
 
         # Since the readded contents can be removed again by any subsequent version after the
@@ -1329,17 +1381,86 @@ class RepositoryVersion(BaseModel):
 
         # Update the version removed of the readded contents
         for version_removed_id, content_ids in version_removed_id_content_id_map.items():
-            repo_relations.filter(version_removed=self, content_id__in=content_ids).update(
-                version_removed_id=version_removed_id
-            )
+            repo_relations.filter(
+                version_removed__in=version_pks, content_id__in=content_ids
+            ).update(version_removed_id=version_removed_id)
 
         # "squash" by moving other additions and removals forward to the next version
-        repo_relations.filter(version_added=self).update(version_added=next_version)
-        repo_relations.filter(version_removed=self).update(version_removed=next_version)
+        repo_relations.filter(version_added__in=version_pks).update(version_added=next_version)
+        repo_relations.filter(version_removed__in=version_pks).update(version_removed=next_version)
 
         # Update next version's counts as they have been modified
         next_version._compute_counts()
 
+    @classmethod
+    def delete_range(cls, versions, next_version):
+        """
+        Delete a contiguous range of complete repository versions at once.
+
+        All changes of the range are squashed into `next_version` in one pass. Only the
+        RepositoryContent rows that reference the range or are added by `next_version` are
+        locked, and the counts of `next_version` are computed once, no matter how many versions
+        are deleted.
+
+        Args:
+            versions (list): The complete RepositoryVersions to delete, all of the same repository.
+                No version that is kept may lie between them.
+            next_version (pulpcore.app.models.RepositoryVersion): The first complete version after
+                the range.
+        """
+        version_pks = [version.pk for version in versions]
+        for version in versions:
+            version._delete_publications_and_cache()
+
+        with transaction.atomic():
+            repo_relations = RepositoryContent.objects.filter(
+                repository_id=next_version.repository_id
+            )
+            # Lock the affected relations only, so the rest of the repository stays usable.
+            list(
+                repo_relations.filter(
+                    Q(version_added__in=version_pks)
+                    | Q(version_removed__in=version_pks)
+                    | Q(version_added=next_version)
+                )
+                .select_for_update()
+                .values_list("pk", flat=True)
+            )
+            cls._squash_range(repo_relations, version_pks, next_version)
+
+            if repo_relations.filter(
+                Q(version_added__in=version_pks) | Q(version_removed__in=version_pks)
+            ).exists():
+                raise RuntimeError(_("Some repo relations of this version were not translated."))
+            for version in versions:
+                # Skip the single version squash of delete(), but keep the delete hooks.
+                super(RepositoryVersion, version).delete()
+
+    def _delete_publications_and_cache(self):
+        """
+        Clear the content cache and the published artifacts of this version before deleting it.
+        """
+        if settings.CACHE_ENABLED:
+            base_paths = self.distribution_set.values_list("base_path", flat=True)
+            if base_paths:
+                Cache().delete(base_key=cache_key(base_paths))
+
+        from .publication import Publication, PublishedArtifact  # circular import avoidance
+
+        # Pre-delete PublishedArtifacts outside the select_for_update block to avoid
+        # holding RepositoryContent row locks during the slow bulk delete.
+        publication_pks = list(
+            Publication.objects.filter(
+                repository_version=self,
+            ).values_list("pk", flat=True)
+        )
+        batch_size = 500
+        for start in range(0, len(publication_pks), batch_size):
+            batch = publication_pks[start : start + batch_size]
+            PublishedArtifact.objects.filter(publication_id__in=batch)._raw_delete(
+                PublishedArtifact.objects.db
+            )
+
     @hook(BEFORE_DELETE)
     def check_protected(self):
         """Check if a repo version is protected before trying to delete it."""
@@ -1359,26 +1480,7 @@ class RepositoryVersion(BaseModel):
         if self.complete:
             if self.repository.versions.complete().count() <= 1:
                 raise APIException(_("Attempt to delete the last remaining version."))
-            if settings.CACHE_ENABLED:
-                base_paths = self.distribution_set.values_list("base_path", flat=True)
-                if base_paths:
-                    Cache().delete(base_key=cache_key(base_paths))
-
-            from .publication import Publication, PublishedArtifact  # circular import avoidance
-
-            # Pre-delete PublishedArtifacts outside the select_for_update block to avoid
-            # holding RepositoryContent row locks during the slow bulk delete.
-            publication_pks = list(
-                Publication.objects.filter(
-                    repository_version=self,
-                ).values_list("pk", flat=True)
-            )
-            batch_size = 500
-            for start in range(0, len(publication_pks), batch_size):
-                batch = publication_pks[start : start + batch_size]
-                PublishedArtifact.objects.filter(publication_id__in=batch)._raw_delete(
-                    PublishedArtifact.objects.db
-                )
+            self._delete_publications_and_cache()
 
             # Handle the manipulation of the repository version content and its final deletion in
             # the same transaction.
@@ -1393,7 +1495,10 @@ class RepositoryVersion(BaseModel):
                 except RepositoryVersion.DoesNotExist:
                     # version is the latest version so simply update repo contents
                     # and delete the version
-                    repo_relations.filter(version_added=self).delete()
+                    dropped = repo_relations.filter(version_added=self)
+                    dropped_content_pks = list(dropped.values_list("content_id", flat=True))
+                    dropped.delete()
+                    OrphanCandidate.add_content(dropped_content_pks)
                     repo_relations.filter(version_removed=self).update(version_removed=None)
 
                 if repo_relations.filter(Q(version_added=self) | Q(version_removed=self)).exists():
@@ -1404,7 +1509,10 @@ class RepositoryVersion(BaseModel):
 
         else:
             with transaction.atomic():
-                RepositoryContent.objects.filter(version_added=self).delete()
+                dropped = RepositoryContent.objects.filter(version_added=self)
+                dropped_content_pks = list(dropped.values_list("content_id", flat=True))
+                dropped.delete()
+                OrphanCandidate.add_content(dropped_content_pks)
                 RepositoryContent.objects.filter(version_removed=self).update(version_removed=None)
                 CreatedResource.objects.filter(object_id=self.pk).delete()
                 super().delete(**kwargs)
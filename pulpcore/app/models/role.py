@@ -3,6 +3,8 @@ from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
 
 from pulpcore.app.models import BaseModel, Group
 
@@ -83,3 +85,70 @@ class GroupRole(BaseModel):
             models.Index(fields=["object_id"]),
             models.Index(fields=["content_type", "object_id"]),
         ]
+
+
+def _affects_content_guards(role_assignment):
+    """Whether the `UserRole` or `GroupRole` can change the decisions of content guards."""
+    from pulpcore.app.role_util import content_guard_permissions, content_guard_types
+
+    if role_assignment.content_type_id is not None and role_assignment.content_type_id in {
+        content_type.pk for content_type in content_guard_types()
+    }:
+        return True
+    return Role.objects.filter(
+        pk=role_assignment.role_id, permissions__in=content_guard_permissions()
+    ).exists()
+
+
+@receiver(post_save, sender=UserRole)
+@receiver(post_save, sender=GroupRole)
+@receiver(post_delete, sender=UserRole)
+@receiver(post_delete, sender=GroupRole)
+def role_assignment_changed(sender, instance, **kwargs):
+    """Discard cached permission lookups whenever a role is assigned or removed."""
+    from pulpcore.app.role_util import invalidate_content_guard_cache, invalidate_permission_cache
+
+    invalidate_permission_cache()
+    if _affects_content_guards(instance):
+        invalidate_content_guard_cache()
+
+
+@receiver(m2m_changed, sender=Role.permissions.through)
+def role_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Discard cached permission lookups whenever the permissions of roles change."""
+    if action.startswith("post_"):
+        from pulpcore.app.role_util import (
+            content_guard_permissions,
+            invalidate_content_guard_cache,
+            invalidate_permission_cache,
+        )
+
+        invalidate_permission_cache()
+        permission_pks = {instance.pk} if reverse else pk_set
+        if (
+            permission_pks is None
+            or content_guard_permissions().filter(pk__in=permission_pks).exists()
+        ):
+            invalidate_content_guard_cache()
+
+
+@receiver(m2m_changed, sender=Group.user_set.through)
+def group_users_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Discard cached permission lookups whenever group memberships change."""
+    if action.startswith("post_"):
+        from pulpcore.app.role_util import (
+            content_guard_permissions,
+            content_guard_types,
+            invalidate_content_guard_cache,
+            invalidate_permission_cache,
+        )
+
+        invalidate_permission_cache()
+        # Adding users to a group is the reverse side of `User.groups`.
+        group_pks = pk_set if not reverse else {instance.pk}
+        guard_roles = GroupRole.objects.filter(
+            models.Q(content_type__in=content_guard_types())
+            | models.Q(role__permissions__in=content_guard_permissions())
+        )
+        if group_pks is None or guard_roles.filter(group__in=group_pks).exists():
+            invalidate_content_guard_cache()
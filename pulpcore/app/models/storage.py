@@ -1,4 +1,10 @@
+import errno
+import fcntl
+import io
 import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
 from uuid import uuid4
 
 from django.conf import settings
@@ -8,6 +14,116 @@ from django.core.files.storage import FileSystemStorage, Storage
 
 from pulpcore.app.util import get_domain
 
+log = getLogger(__name__)
+
+# Maximum number of keys accepted by a single S3 DeleteObjects request.
+S3_DELETE_OBJECTS_LIMIT = 1000
+# Number of threads deleting files from a storage backend concurrently.
+STORAGE_DELETE_WORKERS = 16
+# The Linux ioctl request making a file share the extents of another file (a reflink).
+FICLONE = 0x40049409
+# The errors of copy_file_range() and sendfile() meaning they can not copy between the files.
+COPY_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EBADF,
+}
+# The size of the chunks copied through userspace if the kernel can not copy the file.
+COPY_CHUNK_SIZE = 1048576
+
+
+def copy_file(source, destination):
+    """
+    Copy the whole content of a file into an empty file, letting the kernel do the work.
+
+    On file systems supporting it, e.g. XFS or Btrfs, the destination becomes a reflink sharing
+    the extents of the source. Otherwise the data is copied with `os.copy_file_range()` or
+    `os.sendfile()`, without passing through userspace. Reading and writing chunks is the last
+    resort.
+
+    Args:
+        source (int): The file descriptor of the regular file to copy.
+        destination (int): The file descriptor of the file to write to.
+
+    Returns:
+        str: The way the file was copied, one of "reflink", "copy_file_range", "sendfile" or
+            "read".
+    """
+    try:
+        fcntl.ioctl(destination, FICLONE, source)
+        return "reflink"
+    except OSError:
+        pass
+
+    size = os.fstat(source).st_size
+    offset = 0
+    if hasattr(os, "copy_file_range"):
+        try:
+            while offset < size:
+                copied = os.copy_file_range(source, destination, size - offset, offset, offset)
+                if not copied:
+                    break
+                offset += copied
+            else:
+                return "copy_file_range"
+        except OSError as e:
+            if e.errno not in COPY_UNSUPPORTED_ERRNOS:
+                raise
+
+    os.lseek(destination, offset, os.SEEK_SET)
+    try:
+        while offset < size:
+            copied = os.sendfile(destination, source, offset, size - offset)
+            if not copied:
+                break
+            offset += copied
+        else:
+            return "sendfile"
+    except OSError as e:
+        if e.errno not in COPY_UNSUPPORTED_ERRNOS:
+            raise
+
+    os.lseek(destination, offset, os.SEEK_SET)
+    while chunk := os.pread(source, COPY_CHUNK_SIZE, offset):
+        os.write(destination, chunk)
+        offset += len(chunk)
+    return "read"
+
+
+def _get_fileno(content):
+    """
+    Get the file descriptor of the regular file behind a File, if it has one.
+
+    Only plain binary files qualify. Wrappers like `gzip.GzipFile` also have a `fileno()`, but
+    the data read through them differs from the data in their file.
+
+    Args:
+        content (File): The file.
+
+    Returns:
+        int: The file descriptor, or None if the data has to be read through the File.
+    """
+    file = content
+    # Unwrap django Files and the wrappers of the tempfile module.
+    while not isinstance(file, io.IOBase) and hasattr(file, "file"):
+        file = file.file
+    raw = file.raw if isinstance(file, (io.BufferedReader, io.BufferedRandom)) else file
+    if not isinstance(raw, io.FileIO):
+        return None
+    try:
+        # Buffered data must reach the file before it is read through the descriptor.
+        if file.writable():
+            file.flush()
+        fileno = file.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+    if not stat.S_ISREG(os.fstat(fileno).st_mode):
+        return None
+    return fileno
+
 
 class FileSystem(FileSystemStorage):
     """
@@ -15,8 +131,8 @@ class FileSystem(FileSystemStorage):
 
     The _save() will check if the file is saved in WORKING_DIRECTORY first. If it is, a move is
     used. This will move all files created by the Downloaders and uploaded files from the user. If
-    it is saved in-memory or outside of WORKING_DIRECTORY, the data is written/copied in chunks to
-    the new location.
+    it is saved outside of WORKING_DIRECTORY or on another file system, the file is copied by the
+    kernel, see `copy_file()`. Data held in memory is written in chunks to the new location.
     """
 
     def get_available_name(self, name, max_length=None):
@@ -64,30 +180,42 @@ class FileSystem(FileSystemStorage):
         except FileExistsError:
             raise FileExistsError("%s exists and is not a directory." % directory)
 
+        temporary_file_path = None
+        if hasattr(content, "temporary_file_path") and content.temporary_file_path().startswith(
+            str(settings.WORKING_DIRECTORY)
+        ):
+            temporary_file_path = content.temporary_file_path()
+
         try:
-            if hasattr(content, "temporary_file_path") and content.temporary_file_path().startswith(
-                str(settings.WORKING_DIRECTORY)
+            if temporary_file_path and (
+                os.stat(temporary_file_path).st_dev == os.stat(directory).st_dev
             ):
-                file_move_safe(content.temporary_file_path(), full_path)
+                file_move_safe(temporary_file_path, full_path)
             else:
-                # This is a normal uploaded file that we can stream.
+                # This is a normal uploaded file that we can stream, or a file to move to another
+                # file system.
 
                 # The current umask value is masked out by os.open!
                 fd = os.open(full_path, self.OS_OPEN_FLAGS, 0o666)
                 _file = None
                 try:
                     locks.lock(fd, locks.LOCK_EX)
-                    for chunk in content.chunks():
-                        if _file is None:
-                            mode = "wb" if isinstance(chunk, bytes) else "wt"
-                            _file = os.fdopen(fd, mode)
-                        _file.write(chunk)
+                    if (source := _get_fileno(content)) is not None:
+                        copy_file(source, fd)
+                    else:
+                        for chunk in content.chunks():
+                            if _file is None:
+                                mode = "wb" if isinstance(chunk, bytes) else "wt"
+                                _file = os.fdopen(fd, mode)
+                            _file.write(chunk)
                 finally:
                     locks.unlock(fd)
                     if _file is not None:
                         _file.close()
                     else:
                         os.close(fd)
+                if temporary_file_path:
+                    os.remove(temporary_file_path)
         except FileExistsError:
             # It's a content addressable store so if the file is already in place we can do nothing
             pass
@@ -182,6 +310,90 @@ def get_upload_chunk_file_path(pulp_id):
     return os.path.join(settings.CHUNKED_UPLOAD_DIR, str(pulp_id))
 
 
+def _delete_file(storage, names):
+    """Delete files one by one via ``storage.delete()``."""
+    failed = []
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception as e:
+            log.warning("Failed to delete '{}' from storage: {}".format(name, e))
+            failed.append(name)
+    return failed
+
+
+def _delete_s3_objects(storage, names):
+    """Delete files from an S3 bucket with a single DeleteObjects request."""
+    from storages.utils import clean_name
+
+    keys = {storage._normalize_name(clean_name(name)): name for name in names}
+    try:
+        response = storage.bucket.delete_objects(
+            Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True}
+        )
+    except Exception as e:
+        log.warning("Failed to delete {} files from storage: {}".format(len(names), e))
+        return list(names)
+    failed = []
+    for error in response.get("Errors", []):
+        log.warning("Failed to delete '{}' from storage: {}".format(error["Key"], error))
+        failed.append(keys[error["Key"]])
+    return failed
+
+
+def _delete_azure_blobs(storage, names):
+    """Delete files from an Azure container with a single batch request."""
+    blob_names = [storage._get_valid_path(name) for name in names]
+    try:
+        responses = list(storage.client.delete_blobs(*blob_names, raise_on_any_failure=False))
+    except Exception as e:
+        log.warning("Failed to delete {} files from storage: {}".format(len(names), e))
+        return list(names)
+    failed = []
+    for name, response in zip(names, responses):
+        # 404 means the blob is already gone
+        if response.status_code not in (200, 202, 404):
+            log.warning("Failed to delete '{}' from storage: {}".format(name, response.status_code))
+            failed.append(name)
+    return failed
+
+
+# Functions deleting a batch of files from a storage class, with the maximum batch size they
+# accept. Storage classes not listed here delete one file per call. Plugins shipping their own
+# storage class can register a multi-object delete here.
+BULK_DELETE_METHODS = {
+    "storages.backends.s3boto3.S3Boto3Storage": (_delete_s3_objects, S3_DELETE_OBJECTS_LIMIT),
+    "storages.backends.s3.S3Storage": (_delete_s3_objects, S3_DELETE_OBJECTS_LIMIT),
+    "storages.backends.azure_storage.AzureStorage": (_delete_azure_blobs, 256),
+}
+
+
+def delete_files(domain, names):
+    """
+    Delete many files from a domain's storage backend at once.
+
+    The files are split into batches, using multi-object deletes for the backends listed in
+    `BULK_DELETE_METHODS`, and the batches are deleted concurrently from a thread pool. Files
+    that no longer exist are not considered failures.
+
+    Args:
+        domain (pulpcore.app.models.Domain): The domain whose storage holds the files.
+        names (iterable): The storage names of the files to delete.
+
+    Returns:
+        list: The names of the files that could not be deleted.
+    """
+    names = list(names)
+    if not names:
+        return []
+    storage = domain.get_storage()
+    delete_batch, batch_size = BULK_DELETE_METHODS.get(domain.storage_class, (_delete_file, 1))
+    batches = [names[i : i + batch_size] for i in range(0, len(names), batch_size)]
+    with ThreadPoolExecutor(max_workers=STORAGE_DELETE_WORKERS) as executor:
+        results = executor.map(lambda batch: delete_batch(storage, batch), batches)
+        return [name for failed in results for name in failed]
+
+
 # This is currently not used by anyone, probably should deprecate and remove from plugin api
 def get_tls_path(model, name):
     """
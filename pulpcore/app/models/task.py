@@ -202,6 +202,9 @@ class Task(BaseModel, AutoAddObjPermsMixin):
 
     def _cleanup_progress_reports(self, state):
         """Find any running progress-reports and set their states to the specified end-state."""
+        from pulpcore.app.models.progress import ProgressReport
+
+        ProgressReport.flush_pending(self.pk)
         self.progress_reports.filter(state=TASK_STATES.RUNNING).update(state=state)
 
     def set_running(self):
@@ -450,6 +453,8 @@ class TaskSchedule(BaseModel):
     task_name = models.TextField()
     task_args = EncryptedJSONField(default=list)
     task_kwargs = EncryptedJSONField(default=dict)
+    # Reserved by the dispatched tasks, e.g. to keep them from running at the same time.
+    exclusive_resources = ArrayField(models.TextField(), null=True)
     last_task = models.ForeignKey(Task, null=True, on_delete=models.SET_NULL)
     pulp_domain = models.ForeignKey("Domain", default=get_domain_pk, on_delete=models.CASCADE)
 
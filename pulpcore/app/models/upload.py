@@ -2,7 +2,6 @@ import hashlib
 import os
 from gettext import gettext as _
 
-from django.core.files.base import ContentFile
 from django.db import models
 from django.db.models.signals import post_delete
 from django.dispatch import receiver
@@ -36,16 +35,24 @@ class Upload(BaseModel, AutoAddObjPermsMixin):
             chunk (File): Binary data to append to the upload file.
             offset (int): First byte position to write chunk to.
         """
-        chunk = chunk.read()
         if sha256:
-            current_sha256 = hashlib.sha256(chunk).hexdigest()
+            # Files received by the HashingFileUploadHandler have been hashed on the way in.
+            if hasattr(chunk, "hashers"):
+                current_sha256 = chunk.hashers["sha256"].hexdigest()
+            else:
+                hasher = hashlib.sha256()
+                for data in chunk.chunks():
+                    hasher.update(data)
+                current_sha256 = hasher.hexdigest()
             if sha256 != current_sha256:
                 raise serializers.ValidationError(_("Checksum does not match chunk upload."))
 
         UploadChunk.objects.filter(upload=self, offset=offset).delete()
-        upload_chunk = UploadChunk(upload=self, offset=offset, size=len(chunk))
+        upload_chunk = UploadChunk(upload=self, offset=offset, size=chunk.size)
         filename = os.path.basename(upload_chunk.storage_path(""))
-        upload_chunk.file.save(filename, ContentFile(chunk))
+        # Stream the chunk to the storage, temporary files get moved there if possible.
+        chunk.seek(0)
+        upload_chunk.file.save(filename, chunk)
 
     class Meta:
         permissions = [
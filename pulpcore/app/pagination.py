@@ -0,0 +1,154 @@
+import base64
+import json
+from gettext import gettext as _
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class PulpPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination with an opt-in keyset mode.
+
+    Sending the `cursor` query parameter (empty for the first page) switches to keyset pagination.
+    The results are then ordered by `pulp_created` and `pk` and each page continues after the last
+    object of the previous one, so walking a whole collection takes linear time no matter how
+    deep the page is. The `next` link carries the opaque cursor of the following page. No total
+    is counted in this mode, so `count` is always null and there is no `previous` link.
+    """
+
+    cursor_query_param = "cursor"
+    cursor_query_description = _(
+        "Opaque cursor for keyset pagination, as found in the `next` link. Pass an empty value "
+        "to fetch the first page. Results are ordered by creation time and `count` is omitted."
+    )
+    invalid_cursor_message = _("Invalid cursor")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor = None
+        if not self.is_keyset_request(request, queryset):
+            return super().paginate_queryset(queryset, request, view=view)
+
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.count = None
+        self.offset = 0
+
+        key_fields = self.get_key_fields(queryset.model)
+        queryset = queryset.order_by(*key_fields)
+        if token := request.query_params[self.cursor_query_param]:
+            position = self.decode_cursor(token, queryset.model, key_fields)
+            queryset = queryset.filter(self._after(key_fields, position))
+
+        # Fetch one more object to find out whether there is a next page.
+        page = list(queryset[: self.limit + 1])
+        if len(page) > self.limit:
+            page = page[: self.limit]
+            self.cursor = self.encode_cursor([getattr(page[-1], field) for field in key_fields])
+        return page
+
+    def is_keyset_request(self, request, queryset=None):
+        """
+        Whether keyset pagination was requested and can be applied to `queryset`.
+        """
+        if self.cursor_query_param not in request.query_params:
+            return False
+        # Some views paginate plain lists, which cannot be ordered by the database.
+        return queryset is None or hasattr(queryset, "order_by")
+
+    def get_key_fields(self, model):
+        """
+        Return the fields the keyset is ordered by, ending with the unique primary key.
+        """
+        field_names = {field.name for field in model._meta.concrete_fields}
+        if "pulp_created" in field_names:
+            return ["pulp_created", "pk"]
+        return ["pk"]
+
+    @staticmethod
+    def _after(key_fields, position):
+        """
+        Build the filter for all objects that are ordered after `position`.
+        """
+        q = Q()
+        for i, field in enumerate(key_fields):
+            equal = {key_fields[j]: position[j] for j in range(i)}
+            q |= Q(**equal, **{f"{field}__gt": position[i]})
+        return q
+
+    def encode_cursor(self, position):
+        data = json.dumps([str(value) for value in position])
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def decode_cursor(self, token, model, key_fields):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(token.encode()))
+            if len(values) != len(key_fields):
+                raise ValueError(token)
+            return [
+                self._get_field(model, field).to_python(value)
+                for field, value in zip(key_fields, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _get_field(model, name):
+        return model._meta.pk if name == "pk" else model._meta.get_field(name)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.count,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_next_link(self):
+        if self.count is not None:
+            return super().get_next_link()
+        if self.cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.offset_query_param)
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.cursor_query_param, self.cursor)
+
+    def get_previous_link(self):
+        if self.count is not None:
+            return super().get_previous_link()
+        return None
+
+    def get_html_context(self):
+        if self.count is not None:
+            return super().get_html_context()
+        return {
+            "previous_url": None,
+            "next_url": self.get_next_link(),
+            "page_links": [],
+        }
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count"]["nullable"] = True
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append(
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.cursor_query_description),
+                "schema": {"type": "string"},
+            }
+        )
+        return parameters
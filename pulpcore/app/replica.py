@@ -1,7 +1,7 @@
 import logging
 from urllib.parse import urljoin
 
-from django.db.models import Model
+from django.db.models import Model, Q
 from django.utils.dateparse import parse_datetime
 from pulp_glue.common.context import PulpContext
 
@@ -12,7 +12,7 @@ from pulpcore.app.tasks.base import (
     general_multi_delete,
 )
 from pulpcore.plugin.util import get_domain, get_url
-from pulpcore.tasking.tasks import dispatch
+from pulpcore.tasking.tasks import dispatch, dispatch_many
 
 _logger = logging.getLogger(__name__)
 
@@ -67,6 +67,97 @@ class Replicator:
         self.server = server
         self.domain = get_domain()
         self.distros_uris = [distros_lock_uri(self.domain.pulp_id)]
+        # Local objects loaded by plan(), by (model class, field name) and field value
+        self._local_objects = {}
+        self._pending_tasks = []
+        # Whether queue_dispatch() queues the tasks, or dispatches them right away.
+        self.queue_tasks = True
+
+    def plan(self, upstream_distributions):
+        """
+        Prepare the replication of the upstream distributions.
+
+        This loads the local remotes, repositories and distributions that can correspond to the
+        upstream distributions with a single query per model, so that the `create_or_update_*`
+        methods do not need to look them up one by one. Plugins can extend this to fetch more
+        upstream or local data in bulk.
+
+        Args:
+            upstream_distributions (list): The upstream distributions to be replicated.
+        """
+        names = [distro["name"] for distro in upstream_distributions]
+        base_paths = [distro["base_path"] for distro in upstream_distributions]
+        for model_cls in (self.remote_model_cls, self.repository_model_cls):
+            self._local_objects[(model_cls, "name")] = {
+                obj.name: obj
+                for obj in model_cls.objects.filter(pulp_domain=self.domain, name__in=names)
+            }
+        distributions = list(
+            self.distribution_model_cls.objects.filter(
+                Q(name__in=names) | Q(base_path__in=base_paths), pulp_domain=self.domain
+            )
+        )
+        for field in ("name", "base_path"):
+            self._local_objects[(self.distribution_model_cls, field)] = {
+                getattr(distro, field): distro for distro in distributions
+            }
+
+    def _get_local(self, model_cls, **lookup):
+        """
+        Get the local object of this domain matching the single field lookup.
+
+        Objects loaded by `plan()` are used instead of querying the database.
+        """
+        ((field, value),) = lookup.items()
+        objects = self._local_objects.get((model_cls, field))
+        if objects is None:
+            return model_cls.objects.get(pulp_domain=self.domain, **lookup)
+        try:
+            return objects[value]
+        except KeyError:
+            raise model_cls.DoesNotExist()
+
+    def dispatch(self, func, **kwargs):
+        """
+        Dispatch a task of this replication in the replication's task group right away.
+
+        The tasks queued with `queue_dispatch()` are dispatched first, so all tasks are still
+        created in order.
+
+        Args:
+            func (callable | str): The function to be run as the task.
+            kwargs: The `args`, `kwargs`, `exclusive_resources` and `shared_resources` of the
+                task, as accepted by `dispatch()`.
+
+        Returns:
+            pulpcore.app.models.Task: The dispatched task.
+        """
+        self.dispatch_pending()
+        return dispatch(func, task_group=self.task_group, **kwargs)
+
+    def queue_dispatch(self, func, **kwargs):
+        """
+        Queue a task of this replication in the replication's task group.
+
+        The queued tasks are dispatched in bulk by `dispatch_pending()`, in the order they were
+        queued. While `queue_tasks` is False, the task is dispatched right away instead.
+
+        Args:
+            func (callable | str): The function to be run as the task.
+            kwargs: The `args`, `kwargs`, `exclusive_resources` and `shared_resources` of the
+                task, as accepted by `dispatch()`.
+        """
+        if not self.queue_tasks:
+            self.dispatch(func, **kwargs)
+            return
+        self._pending_tasks.append({"func": func, **kwargs})
+
+    def dispatch_pending(self):
+        """
+        Dispatch all tasks queued with `queue_dispatch()` at once.
+        """
+        tasks, self._pending_tasks = self._pending_tasks, []
+        return dispatch_many(tasks, task_group=self.task_group)
 
     @staticmethod
     def needs_update(fields_dict, model_instance):
@@ -126,16 +217,13 @@ class Replicator:
 
         # Check if there is a remote pointing to this distribution
         try:
-            remote = self.remote_model_cls.objects.get(
-                name=upstream_distribution["name"], pulp_domain=self.domain
-            )
+            remote = self._get_local(self.remote_model_cls, name=upstream_distribution["name"])
             if not self._is_managed(remote):
                 return None
             needs_update = self.needs_update(remote_fields_dict, remote)
             if needs_update:
-                dispatch(
+                self.queue_dispatch(
                     ageneral_update,
-                    task_group=self.task_group,
                     shared_resources=[self.server],
                     exclusive_resources=[remote],
                     args=(remote.pk, self.app_label, self.remote_serializer_name),
@@ -155,16 +243,13 @@ class Replicator:
         repo_fields_dict = self.repository_extra_fields(remote)
         repo_fields_dict["pulp_labels"] = self.labels(remote)
         try:
-            repository = self.repository_model_cls.objects.get(
-                name=remote.name, pulp_domain=self.domain
-            )
+            repository = self._get_local(self.repository_model_cls, name=remote.name)
             if not self._is_managed(repository):
                 return None
             needs_update = self.needs_update(repo_fields_dict, repository)
             if needs_update:
-                dispatch(
+                self.queue_dispatch(
                     ageneral_update,
-                    task_group=self.task_group,
                     shared_resources=[self.server],
                     exclusive_resources=[repository],
                     args=(repository.pk, self.app_label, self.repository_serializer_name),
@@ -190,16 +275,15 @@ class Replicator:
         distribution_data = self.distribution_extra_fields(repository, upstream_distribution)
         distribution_data["pulp_labels"] = self.labels(upstream_distribution)
         try:
-            distro = self.distribution_model_cls.objects.get(
-                name=upstream_distribution["name"], pulp_domain=self.domain
+            distro = self._get_local(
+                self.distribution_model_cls, name=upstream_distribution["name"]
             )
             if not self._is_managed(distro):
                 return
             needs_update = self.needs_update(distribution_data, distro)
             if needs_update:
-                dispatch(
+                self.queue_dispatch(
                     ageneral_update,
-                    task_group=self.task_group,
                     shared_resources=[repository, self.server],
                     exclusive_resources=self.distros_uris,
                     args=(distro.pk, self.app_label, self.distribution_serializer_name),
@@ -220,17 +304,14 @@ class Replicator:
         base_path = distribution_data.get("base_path")
         if base_path:
             try:
-                distro = self.distribution_model_cls.objects.get(
-                    base_path=base_path, pulp_domain=self.domain
-                )
+                distro = self._get_local(self.distribution_model_cls, base_path=base_path)
                 if self._is_managed(distro):
                     distro.name = upstream_distribution["name"]
                     distro.save(update_fields=["name"])
                     needs_update = self.needs_update(distribution_data, distro)
                     if needs_update:
-                        dispatch(
+                        self.queue_dispatch(
                             ageneral_update,
-                            task_group=self.task_group,
                             shared_resources=[repository, self.server],
                             exclusive_resources=self.distros_uris,
                             args=(
@@ -249,9 +330,8 @@ class Replicator:
 
         create_data = dict(distribution_data)
         create_data["name"] = upstream_distribution["name"]
-        dispatch(
+        self.queue_dispatch(
             general_create,
-            task_group=self.task_group,
             shared_resources=[repository, self.server],
             exclusive_resources=self.distros_uris,
             args=(self.app_label, self.distribution_serializer_name),
@@ -273,9 +353,8 @@ class Replicator:
         return True
 
     def sync(self, repository, remote):
-        dispatch(
+        self.queue_dispatch(
             self.sync_task,
-            task_group=self.task_group,
             shared_resources=[remote, self.server],
             exclusive_resources=[repository],
             kwargs=self.sync_params(repository, remote),
@@ -297,9 +376,8 @@ class Replicator:
             ).exclude(name__in=names)
         ]
         if distribution_ids:
-            dispatch(
+            self.queue_dispatch(
                 general_multi_delete,
-                task_group=self.task_group,
                 shared_resources=[self.server],
                 exclusive_resources=self.distros_uris,
                 args=(distribution_ids,),
@@ -330,9 +408,8 @@ class Replicator:
             # publications (and RVs, etc.), which SET_NULLs any distribution FK pointing
             # to them. A concurrent distribution update could then write back the stale FK,
             # causing an IntegrityError.
-            dispatch(
+            self.queue_dispatch(
                 general_multi_delete,
-                task_group=self.task_group,
                 shared_resources=[self.server],
                 exclusive_resources=self.distros_uris + repositories + remotes,
                 args=(repository_ids + remote_ids,),
@@ -2,11 +2,13 @@ from collections import defaultdict
 from functools import lru_cache
 from gettext import gettext as _
 
+from django.apps import apps
 from django.conf import settings
 from django.contrib.auth import get_user_model as django_get_user_model
 from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import BadRequest
+from django.db import transaction
 from django.db.models import CharField, Exists, OuterRef, Q
 from django.db.models.functions import Cast
 
@@ -90,6 +92,7 @@ def remove_role(rolename, entity, obj=None, domain=None):
         ctype = ContentType.objects.get_for_model(obj, for_concrete_model=False)
         qs = qs.filter(content_type__pk=ctype.id, object_id=obj.pk)
     qs.delete()
+    invalidate_permission_cache()
 
 
 def get_perms_for_model(obj):
@@ -97,6 +100,108 @@ def get_perms_for_model(obj):
     return Permission.objects.filter(content_type__pk=ctype.id)
 
 
+# Bumped whenever a role assignment changes, so cached permission lookups can be discarded.
+_permission_cache_generation = 0
+
+
+def invalidate_permission_cache():
+    """
+    Discard all permission lookups cached by `get_objects_for_user_roles`.
+
+    This must be called whenever roles are assigned or removed. Saving or deleting a `UserRole`
+    or `GroupRole`, changing the permissions of a `Role` or the groups of a user does so
+    automatically.
+    """
+    global _permission_cache_generation
+    _permission_cache_generation += 1
+
+
+def content_guard_types():
+    """
+    Return the content types of all content guard models.
+    """
+    from pulpcore.app.models import ContentGuard
+
+    guard_models = [model for model in apps.get_models() if issubclass(model, ContentGuard)]
+    return ContentType.objects.get_for_models(*guard_models, for_concrete_model=False).values()
+
+
+def content_guard_permissions():
+    """
+    Return the permissions to download content protected by content guards.
+    """
+    return Permission.objects.filter(
+        content_type__in=content_guard_types(), codename__startswith="download"
+    )
+
+
+def invalidate_content_guard_cache():
+    """
+    Discard the decisions cached by content guards once the current transaction is committed.
+
+    Content guards like RBACContentGuard decide by roles. This must be called when a role
+    assignment on a content guard, or of a role granting `content_guard_permissions()`, changes.
+    Discarding them earlier would let the content app cache decisions on the old roles again.
+    """
+    from pulpcore.cache.content_guard import content_guard_cache
+
+    transaction.on_commit(content_guard_cache.invalidate)
+
+
+def _cached_for_user(user, key, func):
+    """
+    Return the result of `func()` cached on the `user` instance under `key`.
+
+    The user instance lives for one request (or task), so this is a per-request, per-user cache.
+    It is dropped as soon as any role assignment changes.
+    """
+    generation, cache = getattr(user, "_pulp_permission_cache", (None, None))
+    if generation != _permission_cache_generation:
+        cache = {}
+        user._pulp_permission_cache = (_permission_cache_generation, cache)
+    if key not in cache:
+        cache[key] = func()
+    return cache[key]
+
+
+def _get_permission(permission_name):
+    if "." in permission_name:
+        app_label, codename = permission_name.split(".", maxsplit=1)
+        return Permission.objects.get(content_type__app_label=app_label, codename=codename)
+    return Permission.objects.get(codename=permission_name)
+
+
+def _has_global_permission(user, permission, use_groups):
+    if user.object_roles.filter(object_id=None, domain=None, role__permissions=permission).exists():
+        return True
+    return (
+        use_groups
+        and GroupRole.objects.filter(
+            group__in=user.groups.all(),
+            object_id=None,
+            domain=None,
+            role__permissions=permission,
+        ).exists()
+    )
+
+
+def _get_permission_domains(user, permission, use_groups):
+    domains = set(
+        user.object_roles.filter(domain__isnull=False, role__permissions=permission).values_list(
+            "domain_id", flat=True
+        )
+    )
+    if use_groups:
+        domains.update(
+            GroupRole.objects.filter(
+                group__in=user.groups.all(),
+                domain__isnull=False,
+                role__permissions=permission,
+            ).values_list("domain_id", flat=True)
+        )
+    return domains
+
+
 def get_objects_for_user_roles(
     user,
     permission_name,
@@ -110,49 +215,29 @@ def get_objects_for_user_roles(
         return qs.none()
     if with_superuser and user.is_superuser:
         return qs
-    if "." in permission_name:
-        app_label, codename = permission_name.split(".", maxsplit=1)
-        permission = Permission.objects.get(content_type__app_label=app_label, codename=codename)
-    else:
-        permission = Permission.objects.get(codename=permission_name)
-
-    if accept_global_perms:
-        if user.object_roles.filter(
-            object_id=None, domain=None, role__permissions=permission
-        ).exists():
-            return qs
-        if (
-            use_groups
-            and GroupRole.objects.filter(
-                group__in=user.groups.all(),
-                object_id=None,
-                domain=None,
-                role__permissions=permission,
-            ).exists()
-        ):
-            return qs
+    permission = _cached_for_user(
+        user, ("permission", permission_name), lambda: _get_permission(permission_name)
+    )
+
+    if accept_global_perms and _cached_for_user(
+        user,
+        ("global", permission.pk, use_groups),
+        lambda: _has_global_permission(user, permission, use_groups),
+    ):
+        return qs
 
     user_role_pks = user.object_roles.filter(
         domain__isnull=True, role__permissions=permission
     ).values_list("object_id", flat=True)
     final_q = Q(pk_str__in=user_role_pks)
     if accept_domain_perms and hasattr(qs.model, "pulp_domain"):
-        domains = list(
-            user.object_roles.filter(
-                domain__isnull=False, role__permissions=permission
-            ).values_list("domain_id", flat=True)
-        )
-        if use_groups:
-            domains.extend(
-                GroupRole.objects.filter(
-                    group__in=user.groups.all(),
-                    domain__isnull=False,
-                    role__permissions=permission,
-                ).values_list("domain_id", flat=True)
-            )
-        final_q |= Q(
-            pk_str__in=list(qs.filter(pulp_domain_id__in=domains).values_list("pk", flat=True))
+        domains = _cached_for_user(
+            user,
+            ("domains", permission.pk, use_groups),
+            lambda: _get_permission_domains(user, permission, use_groups),
         )
+        if domains:
+            final_q |= Q(pulp_domain_id__in=domains)
 
     if use_groups:
         group_role_pks = GroupRole.objects.filter(
@@ -28,6 +28,14 @@ class OrphansCleanupSerializer(serializers.Serializer, ValidateFieldsMixin):
         min_value=ORPHAN_PROTECTION_TIME_LOWER_BOUND,
         max_value=ORPHAN_PROTECTION_TIME_UPPER_BOUND,
     )
+    incremental = serializers.BooleanField(
+        help_text=_(
+            "Only consider Content and Artifacts that were orphaned since the last cleanup "
+            "instead of scanning all of them. Orphans that were missed are still removed by the "
+            "periodic full cleanup."
+        ),
+        default=False,
+    )
 
     def validate_content_hrefs(self, value):
         """
@@ -184,7 +184,7 @@ WSGI_APPLICATION = "pulpcore.app.wsgi.application"
 REST_FRAMEWORK = {
     "URL_FIELD_NAME": "pulp_href",
     "DEFAULT_FILTER_BACKENDS": ("pulpcore.filters.PulpFilterBackend",),
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_PAGINATION_CLASS": "pulpcore.app.pagination.PulpPagination",
     "PAGE_SIZE": 100,
     "DEFAULT_PERMISSION_CLASSES": ("pulpcore.app.access_policy.AccessPolicyFromDB",),
     "DEFAULT_AUTHENTICATION_CLASSES": (
@@ -292,6 +292,10 @@ API_APP_TTL = 120  # The heartbeat is called from gunicorn notify (defaulting to
 CONTENT_APP_TTL = 30
 WORKER_TTL = 30
 
+# Defer importing the plugins' viewsets, serializers, urls, model resources and replicators until
+# they are first needed. The content app and the workers enable this by default.
+LAZY_PLUGIN_IMPORTS = False
+
 # Worker implementation type
 # Options: "pulpcore" (default, PostgreSQL advisory locks) or "redis" (Redis distributed locks)
 WORKER_TYPE = "pulpcore"
@@ -303,6 +307,9 @@ TASK_GRACE_INTERVAL = 600
 
 # how long to protect ephemeral items in minutes
 ORPHAN_PROTECTION_TIME = 24 * 60
+# how often the scheduled orphan cleanup scans all content instead of the orphan candidates
+# in minutes, if set to 0, every scheduled orphan cleanup is a full scan
+ORPHAN_FULL_SWEEP_INTERVAL = 7 * 24 * 60
 
 # Custom cleanup intervals
 # for the following, if set to 0, the corresponding cleanup task is disabled
@@ -406,6 +413,17 @@ DOMAIN_ENABLED = False
 
 MAX_CONCURRENT_CONTENT = 200
 
+# The number of files served from FileSystem storage the content app keeps open, 0 disables it
+CONTENT_APP_FILE_CACHE_SIZE = 256
+
+# Pre-signed URLs to object storage are reused until this many seconds before they expire,
+# None disables reusing them
+SIGNED_URL_CACHE_MARGIN = 600
+
+# Content guard decisions are reused for this many seconds for the same user, header value or
+# signed URL, 0 disables reusing them
+CONTENT_GUARD_CACHE_TTL = 5
+
 # Resource budget for sync pipeline: limits total in-flight artifact data between
 # the ArtifactDownloader and ArtifactSaver stages. When set, these allow higher download
 # concurrency for small artifacts while preventing disk exhaustion for large ones.
@@ -425,6 +443,9 @@ SHELL_PLUS_IMPORTS = [
 # By default, use all available workers.
 IMPORT_WORKERS_PERCENT = 100
 
+# How many files a signing service signs concurrently in SigningService.sign_many()
+SIGNING_SERVICE_CONCURRENCY = 4
+
 # Kafka settings
 KAFKA_BOOTSTRAP_SERVERS = None  # kafka integration disabled by default
 KAFKA_TASKS_STATUS_TOPIC = "pulpcore.tasking.status"
@@ -443,6 +464,7 @@ OTEL_PULP_API_HISTOGRAM_BUCKETS = []
 
 # VulnerabilityReport settings
 VULN_REPORT_TASK_LIMITER = 10
+VULN_REPORT_CACHE_TTL = 3600
 
 # Replaces asyncio event loop with uvloop
 UVLOOP_ENABLED = False
@@ -2,20 +2,27 @@ import gc
 from logging import getLogger
 
 from django.conf import settings
+from django.db import IntegrityError
 from django.db.models.deletion import ProtectedError
 from django.utils import timezone
 
 from pulpcore.app.models import (
     Artifact,
     Content,
+    ContentArtifact,
+    OrphanCandidate,
+    PendingFileDeletion,
     ProgressReport,
     PublishedMetadata,
     PulpTemporaryFile,
     Upload,
 )
+from pulpcore.app.util import get_domain
 
 log = getLogger(__name__)
 
+ARTIFACT_DELETE_BATCH_SIZE = 1000
+
 
 def queryset_iterator(qs, batchsize=2000, gc_collect=True):
     """
@@ -39,7 +46,10 @@ def queryset_iterator(qs, batchsize=2000, gc_collect=True):
 
 
 def orphan_cleanup(
-    content_pks=None, orphan_protection_time=settings.ORPHAN_PROTECTION_TIME, **kwargs
+    content_pks=None,
+    orphan_protection_time=settings.ORPHAN_PROTECTION_TIME,
+    incremental=False,
+    **kwargs,
 ):
     """
     Delete all orphan Content and Artifact records.
@@ -48,11 +58,17 @@ def orphan_cleanup(
 
     Kwargs:
         content_pks (list): A list of content pks. If specified, only remove these orphans.
+        incremental (bool): Only look at the recorded orphan candidates instead of scanning all
+            Content and Artifacts.
 
     """
+    domain = get_domain()
+    candidates = OrphanCandidate.objects.filter(pulp_domain=domain)
     content = Content.objects.orphaned(orphan_protection_time, content_pks).exclude(
         pulp_type=PublishedMetadata.get_pulp_type()
     )
+    if incremental:
+        content = content.filter(pk__in=candidates.values("content_id"))
     skipped_content = 0
     with ProgressReport(
         message="Clean up orphan Content",
@@ -63,17 +79,31 @@ def orphan_cleanup(
         for bulk_content in queryset_iterator(content):
             skipped_content_batch = 0
             count = bulk_content.count()
+            artifact_pks = list(
+                ContentArtifact.objects.filter(
+                    content__in=bulk_content, artifact__isnull=False
+                ).values_list("artifact_id", flat=True)
+            )
             try:
                 bulk_content.delete()
-            except ProtectedError:
+            except ProtectedError as e:
                 # some orphan content might have been picked by another task running in parallel
                 # i.e. sync
-                for c in bulk_content:
-                    try:
-                        c.delete()
-                    except ProtectedError as e:
-                        log.debug(e)
-                        skipped_content_batch += 1
+                try:
+                    unprotected = bulk_content.exclude(
+                        pk__in=_protected_content_pks(e.protected_objects)
+                    )
+                    skipped_content_batch = count - unprotected.count()
+                    unprotected.delete()
+                except ProtectedError:
+                    skipped_content_batch = 0
+                    for c in bulk_content:
+                        try:
+                            c.delete()
+                        except ProtectedError as e:
+                            log.debug(e)
+                            skipped_content_batch += 1
+            OrphanCandidate.add_artifacts(artifact_pks, domain_pk=domain.pk)
             progress_bar.increase_by(count - skipped_content_batch)
             skipped_content += skipped_content_batch
 
@@ -85,7 +115,11 @@ def orphan_cleanup(
         log.info(msg.format(skipped_content))
 
     # delete the artifacts that don't belong to any content
+    # Files of a previous cleanup that did not finish.
+    PendingFileDeletion.flush(domain)
     artifacts = Artifact.objects.orphaned(orphan_protection_time)
+    if incremental:
+        artifacts = artifacts.filter(pk__in=candidates.values("artifact_id"))
 
     skipped_artifact = 0
     with ProgressReport(
@@ -93,17 +127,25 @@ def orphan_cleanup(
         total=artifacts.count(),
         code="clean-up.artifacts",
     ) as progress_bar:
-        for artifact in artifacts.iterator():
+        for bulk_artifacts in queryset_iterator(artifacts, batchsize=ARTIFACT_DELETE_BATCH_SIZE):
+            count = len(bulk_artifacts)
             try:
-                # we need to manually call delete() because it cleans up the file on the filesystem
-                artifact.delete()
-            except ProtectedError as e:
+                deleted = bulk_artifacts.delete_with_files(domain)
+            except (ProtectedError, IntegrityError) as e:
                 # some orphaned artifact might have been picked by another task running in parallel
                 # i.e. sync
                 log.debug(e)
-                skipped_artifact += 1
-            else:
-                progress_bar.increment()
+                deleted = 0
+                for artifact in bulk_artifacts:
+                    try:
+                        # delete() cleans up the file on the storage
+                        artifact.delete()
+                    except ProtectedError as e:
+                        log.debug(e)
+                    else:
+                        deleted += 1
+            progress_bar.increase_by(deleted)
+            skipped_artifact += count - deleted
 
     if skipped_artifact:
         msg = (
@@ -112,6 +154,18 @@ def orphan_cleanup(
         )
         log.info(msg.format(skipped_artifact))
 
+    OrphanCandidate.prune(domain.pk)
+
+
+def _protected_content_pks(protected_objects):
+    """Returns the pks of the content referenced by the objects that protect it from deletion."""
+    pks = set()
+    for obj in protected_objects:
+        for field in obj._meta.concrete_fields:
+            if field.is_relation and issubclass(field.related_model, Content):
+                pks.add(getattr(obj, field.attname))
+    return pks
+
 
 def upload_cleanup(**kwargs):
     assert settings.UPLOAD_PROTECTION_TIME > 0
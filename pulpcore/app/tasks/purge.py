@@ -3,10 +3,12 @@ from logging import getLogger
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.db.models.deletion import ProtectedError
 from django.utils import timezone
 
 from pulpcore.app.models import (
+    CreatedResource,
     ProgressReport,
     Task,
 )
@@ -60,6 +62,36 @@ def _details_reporting(current_reports, current_details, totals_pb):
     return current_reports
 
 
+def _delete_tasks(pk_list):
+    """
+    Delete a batch of tasks.
+
+    ProgressReports and CreatedResources outnumber the tasks by far, so they are deleted by task
+    pks first. Without signal receivers or dependent objects, Django removes them with a single
+    statement each instead of collecting them for the cascade-delete of the tasks. This all
+    happens in one transaction, so nothing is lost if a task turns out to be protected.
+
+    Args:
+        pk_list (list): The pks of the tasks to delete.
+
+    Returns:
+        A tuple of the number of tasks deleted and the number of deleted objects by type, like
+        `QuerySet.delete()` does.
+
+    Raises:
+        ProtectedError: If any of the tasks can't be deleted.
+    """
+    details = {}
+    with transaction.atomic():
+        for model in (ProgressReport, CreatedResource):
+            _, model_details = model.objects.filter(task_id__in=pk_list).delete()
+            details.update(model_details)
+        units_deleted, task_details = Task.objects.filter(pk__in=pk_list).delete()
+    for key, count in task_details.items():
+        details[key] = details.get(key, 0) + count
+    return units_deleted, details
+
+
 # Versions of this task up until at least 3.74 may not know about the user_pk argument.
 # We need to handle them accordingly.
 def purge(finished_before=None, states=None, **kwargs):
@@ -157,7 +189,7 @@ def purge(finished_before=None, states=None, **kwargs):
 
         # Try deleting the objects in bulk
         try:
-            units_deleted, details = Task.objects.filter(pk__in=pk_list).delete()
+            units_deleted, details = _delete_tasks(pk_list)
             _details_reporting(details_reports, details, totals_pb)
             continue_deleting = units_deleted > 0
         except ProtectedError:
@@ -1,11 +1,14 @@
+from itertools import islice
 from logging import getLogger
 
+from django.db import transaction
 from django.db.models.deletion import ProtectedError
 
 from pulpcore.app.models import (
     Artifact,
     Content,
     ContentArtifact,
+    OrphanCandidate,
     ProgressReport,
     PublishedMetadata,
     Repository,
@@ -15,6 +18,8 @@ from pulpcore.app.util import get_domain
 
 log = getLogger(__name__)
 
+RECLAIM_BATCH_SIZE = 1000
+
 
 def reclaim_space(repo_pks, keeplist_rv_pks=None, force=False, **kwargs):
     """
@@ -55,57 +60,43 @@ def reclaim_space(repo_pks, keeplist_rv_pks=None, force=False, **kwargs):
         if not content.cast().PROTECTED_FROM_RECLAIM:
             unprotected.append(content.pulp_type)
 
-    ca_qs = ContentArtifact.objects.select_related("content", "artifact").filter(
-        content__in=c_reclaim_qs.values("pk"), artifact__isnull=False
+    ca_qs = ContentArtifact.objects.filter(
+        content__in=c_reclaim_qs.values("pk"),
+        content__pulp_type__in=unprotected,
+        artifact__isnull=False,
     )
     if not force:
         ca_qs = ca_qs.filter(remoteartifact__isnull=False)
-    artifact_pks = set()
-    ca_to_update = []
-    for ca in ca_qs.iterator():
-        if ca.content.pulp_type in unprotected:
-            artifact_pks.add(ca.artifact.pk)
-            ca.artifact = None
-            ca_to_update.append(ca)
-
-    ContentArtifact.objects.bulk_update(objs=ca_to_update, fields=["artifact"], batch_size=1000)
 
-    # Process artifacts in batches
-    batch_size = 1000
-    artifact_pks_list = list(artifact_pks)
-    num_batches = (len(artifact_pks_list) // batch_size) + 1
-
-    progress_bar = ProgressReport(
+    with ProgressReport(
         message="Reclaim disk space",
-        total=len(artifact_pks_list),
+        total=ca_qs.values("artifact").distinct().count(),
         code="reclaim-space.artifact",
-        done=0,
-        state="running",
-    )
-    progress_bar.save()
-
-    counter = 0
-    interval = 100
-    for i in range(num_batches):
-        start = i * batch_size
-        end = start + batch_size
-        artifacts_to_delete = Artifact.objects.filter(pk__in=artifact_pks_list[start:end])
-
-        for artifact in artifacts_to_delete.iterator():
-            try:
-                # we need to manually call delete() because it cleans up the file on the filesystem
-                artifact.delete()
-            except ProtectedError as e:
+    ) as progress_bar:
+        # Detach and delete the artifacts in bounded batches, each in its own transaction.
+        ca_pks = ca_qs.values_list("pk", flat=True).order_by("pk").distinct().iterator()
+        while batch := list(islice(ca_pks, RECLAIM_BATCH_SIZE)):
+            with transaction.atomic():
+                batch_qs = ContentArtifact.objects.filter(pk__in=batch, artifact__isnull=False)
+                artifact_pks = set(batch_qs.values_list("artifact", flat=True))
+                batch_qs.update(artifact=None)
                 # Rarely artifact could be shared between two different content units.
-                # Just log and skip the artifact deletion in this case
-                log.debug(e)
-            else:
-                progress_bar.done += 1
-                counter += 1
-
-            if counter >= interval:
-                progress_bar.save()
-                counter = 0
-
-    progress_bar.state = "completed"
-    progress_bar.save()
+                # Those stay around as long as they are in use.
+                artifacts = Artifact.objects.filter(
+                    pk__in=artifact_pks, content_memberships__isnull=True
+                )
+                try:
+                    deleted = artifacts.delete_with_files(domain)
+                except ProtectedError as e:
+                    # An artifact was taken into use meanwhile. Just log and delete the others
+                    # one by one, skipping the ones in use.
+                    log.debug(e)
+                    deleted = 0
+                    for pk in artifacts.values_list("pk", flat=True):
+                        try:
+                            deleted += Artifact.objects.filter(pk=pk).delete_with_files(domain)
+                        except ProtectedError as e:
+                            log.debug(e)
+                # Artifacts locked by another task are left for the orphan cleanup.
+                OrphanCandidate.add_artifacts(artifact_pks, domain_pk=domain.pk)
+            progress_bar.increase_by(deleted)
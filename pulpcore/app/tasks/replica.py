@@ -11,7 +11,7 @@ from pulp_glue.common.exceptions import PulpException as GluePulpException
 
 from pulpcore.app.apps import PulpAppConfig, pulp_plugin_configs
 from pulpcore.app.models import Distribution, Repository, Task, TaskGroup, UpstreamPulp
-from pulpcore.app.replica import ReplicaContext, distros_lock_uri
+from pulpcore.app.replica import ReplicaContext, Replicator, distros_lock_uri
 from pulpcore.constants import TASK_STATES
 from pulpcore.exceptions import ExternalServiceError
 from pulpcore.tasking.tasks import dispatch
@@ -28,6 +28,25 @@ def user_agent():
     return f"pulpcore/{pulp_version} ({python}, {system}) (pulp-glue {pulp_glue_version})"
 
 
+def _call_replicator(replicator, name, *args, **kwargs):
+    """
+    Call a method of the replicator that may dispatch tasks.
+
+    Plugins overriding it may dispatch tasks directly instead of queueing them. Then the queued
+    tasks are dispatched first, and the method dispatches all its tasks right away, so they are
+    still created in order.
+    """
+    method = getattr(replicator, name)
+    if getattr(type(replicator), name) is getattr(Replicator, name):
+        return method(*args, **kwargs)
+    replicator.dispatch_pending()
+    replicator.queue_tasks = False
+    try:
+        return method(*args, **kwargs)
+    finally:
+        replicator.queue_tasks = True
+
+
 def replicate_distributions(server_pk, q_select=None, **kwargs):
     server = UpstreamPulp.objects.get(pk=server_pk)
 
@@ -90,16 +109,22 @@ def replicate_distributions(server_pk, q_select=None, **kwargs):
         for replicator in supported_replicators:
             distro_names = []
             pending_distributions = []
-            distros = replicator.upstream_distributions(q=effective_q_select)
+            # Fetch the upstream listing once and look up the local objects in bulk.
+            distros = list(replicator.upstream_distributions(q=effective_q_select))
+            replicator.plan(distros)
             for distro in distros:
                 # Create remote
-                remote = replicator.create_or_update_remote(upstream_distribution=distro)
+                remote = _call_replicator(
+                    replicator, "create_or_update_remote", upstream_distribution=distro
+                )
                 if not remote:
                     # The upstream distribution is not serving any content,
                     # let it fall through the cracks and be cleaned up below.
                     continue
                 # Check if there is already a repository
-                repository = replicator.create_or_update_repository(remote=remote)
+                repository = _call_replicator(
+                    replicator, "create_or_update_repository", remote=remote
+                )
                 if not repository:
                     # No update occurred because server.policy==LABELED and there was
                     # an already existing local repository with the same name
@@ -107,7 +132,7 @@ def replicate_distributions(server_pk, q_select=None, **kwargs):
 
                 # Dispatch a sync task if needed
                 if replicator.requires_syncing(distro):
-                    replicator.sync(repository, remote)
+                    _call_replicator(replicator, "sync", repository, remote)
 
                 # Add name to the list of known distribution names
                 distro_names.append(distro["name"])
@@ -119,7 +144,7 @@ def replicate_distributions(server_pk, q_select=None, **kwargs):
             # distribution matched by base_path.  remove_missing then sees the
             # updated name in the DB and won't schedule it for deletion.
             for repository, distro in pending_distributions:
-                replicator.create_or_update_distribution(repository, distro)
+                _call_replicator(replicator, "create_or_update_distribution", repository, distro)
 
             # When a per-request q_select override is used, this is a selective sync
             # of a subset of distributions.  Skipping remove_missing avoids deleting
@@ -127,7 +152,10 @@ def replicate_distributions(server_pk, q_select=None, **kwargs):
             # means that distributions removed from upstream won't be cleaned up until
             # a full (non-overridden) replication runs.
             if q_select is None:
-                replicator.remove_missing(distro_names)
+                _call_replicator(replicator, "remove_missing", distro_names)
+
+            # Dispatch all the create, update, sync and delete tasks of this replicator at once.
+            replicator.dispatch_pending()
     except GluePulpException as e:
         raise ExternalServiceError(service_name=server.base_url, details=str(e))
 
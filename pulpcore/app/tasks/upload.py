@@ -1,6 +1,5 @@
 from gettext import gettext as _
 from logging import getLogger
-from tempfile import NamedTemporaryFile
 
 from pulpcore.app import files, models
 from pulpcore.app.serializers import ArtifactSerializer
@@ -23,15 +22,8 @@ def commit(upload_id, sha256, **kwargs):
         return
 
     chunks = models.UploadChunk.objects.filter(upload=upload).order_by("offset")
-    with NamedTemporaryFile(mode="ab", dir=".", delete=False) as temp_file:
-        for chunk in chunks:
-            temp_file.write(chunk.file.read())
-            chunk.file.close()
-        temp_file.flush()
-
-    with open(temp_file.name, "rb") as artifact_file:
-        file = files.PulpTemporaryUploadedFile.from_file(artifact_file)
-
+    # The chunks are hashed while being concatenated, so the file is not read again.
+    with files.PulpTemporaryUploadedFile.from_chunks(chunks) as file:
         data = {"file": file, "sha256": sha256}
         serializer = ArtifactSerializer(data=data)
         serializer.is_valid(raise_exception=True)
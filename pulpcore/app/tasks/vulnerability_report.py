@@ -1,26 +1,50 @@
 import asyncio
 import importlib
+import json
+from collections import OrderedDict
+from datetime import timedelta
 
 import aiohttp
 from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 
 from pulpcore.app.models.progress import ProgressReport
 from pulpcore.app.models.vulnerability_report import VulnerabilityReport
 from pulpcore.app.util import get_domain
-from pulpcore.constants import OSV_QUERY_URL, TASK_STATES
+from pulpcore.constants import (
+    OSV_QUERY_URL,
+    OSV_QUERYBATCH_SIZE,
+    OSV_QUERYBATCH_URL,
+    TASK_STATES,
+)
 
 
 class VulnerabilityReportScanner:
     """
     A scanner class to collect vulnerabilities from Pulp Contents using the OSV.dev API.
 
+    The content yielded by the generator is collected into batches, which a fixed number of
+    workers take from a bounded queue, so only a few batches are held in memory at any time.
+    Each batch is checked with a single `querybatch` request, only the packages that turn out to
+    be affected are queried for their full vulnerability records, and the reports of the batch
+    are written with a single bulk upsert.
+
+    Packages are identified by their osv.dev query. Packages seen recently during the scan are not
+    queried again, and content with a report younger than `VULN_REPORT_CACHE_TTL` seconds reuses
+    it instead of querying osv.dev.
+
     Attributes:
         semaphore (asyncio.Semaphore): Controls concurrent API requests to osv.dev service.
         generator (AsyncGenerator): The async generator with the content data to be scanned for
             vulnerabilities.
         session (aiohttp.ClientSession): HTTP session for making requests to the OSV.dev API.
             Defaults to a new session if not provided.
+        workers (int): The number of batches processed concurrently. Defaults to
+            `VULN_REPORT_TASK_LIMITER`.
+        query_url (str): The osv.dev endpoint to query a single package.
+        querybatch_url (str): The osv.dev endpoint to query a batch of packages.
         created (ProgressReport): Tracks the number of new VulnerabilityReport records created
             during the scanning process.
         updated (ProgressReport): Tracks the number of existing VulnerabilityReport records
@@ -29,10 +53,24 @@ class VulnerabilityReportScanner:
             been processed for vulnerability scanning.
     """
 
-    def __init__(self, semaphore, generator, session=None):
+    batch_size = OSV_QUERYBATCH_SIZE
+    results_cache_size = 100 * OSV_QUERYBATCH_SIZE
+
+    def __init__(
+        self,
+        semaphore,
+        generator,
+        session=None,
+        workers=None,
+        query_url=OSV_QUERY_URL,
+        querybatch_url=OSV_QUERYBATCH_URL,
+    ):
         self.semaphore = semaphore
         self.generator = generator
         self.session = session or aiohttp.ClientSession()
+        self.workers = workers or settings.VULN_REPORT_TASK_LIMITER
+        self.query_url = query_url
+        self.querybatch_url = querybatch_url
         self.created = ProgressReport(
             message="Vulnerability Reports created", code="created", state=TASK_STATES.RUNNING
         )
@@ -42,17 +80,22 @@ class VulnerabilityReportScanner:
         self.total_scanned = ProgressReport(
             message="Content scanned", code="total_scanned", state=TASK_STATES.RUNNING
         )
+        # The vulns found for the most recently queried package identities
+        self._results = OrderedDict()
 
     async def scan_packages(self):
         """
         Main entry point for scanning packages for vulnerabilities. Progress is tracked through
         three ProgressReport instances (created, updated, total_scanned).
         """
-        tasks = []
-        async for content in self.generator:
-            tasks.append(asyncio.create_task(self.scan_package(content)))
-        await asyncio.gather(*tasks)
-        await self.session.close()
+        queue = asyncio.Queue(maxsize=self.workers)
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for _ in range(self.workers):
+                    task_group.create_task(self._worker(queue))
+                task_group.create_task(self._produce_batches(queue))
+        finally:
+            await self.session.close()
 
         if self.created.done > 0:
             self.created.state = TASK_STATES.COMPLETED
@@ -64,44 +107,135 @@ class VulnerabilityReportScanner:
             self.updated.state = TASK_STATES.COMPLETED
             await self.updated.asave()
 
-    async def scan_package(self, repo_content_osv_data):
+    async def _produce_batches(self, queue):
         """
-        Makes a request to the osv.dev API and store the results in VulnerabilityReport model.
+        Put the content of the generator on the queue in batches, then one stop mark per worker.
+        """
+        batch = []
+        async for repo_content_osv_data in self.generator:
+            batch.append(repo_content_osv_data)
+            if len(batch) >= self.batch_size:
+                await queue.put(batch)
+                batch = []
+        if batch:
+            await queue.put(batch)
+        for _ in range(self.workers):
+            await queue.put(None)
+
+    async def _worker(self, queue):
+        while (batch := await queue.get()) is not None:
+            await self.scan_batch(batch)
+
+    async def scan_batch(self, batch):
+        """
+        Query the osv.dev API for a batch of content and store the results in VulnerabilityReport
+        models.
 
         Args:
-            repo_content_osv_data (Dict[str, Any]): A dictionary with osv.dev expected request
-              data format plus associated Pulp Content and RepoVersion.
+            batch (List[Dict[str, Any]]): Dictionaries with osv.dev expected request data format
+              plus associated Pulp Content and RepoVersion.
         """
-        vulns, content, repo_version = await self._process_reports(repo_content_osv_data)
-        await self._save_vulnerability_report(vulns, content, repo_version)
+        contents = [repo_content_osv_data.pop("content") for repo_content_osv_data in batch]
+        repo_versions = [
+            repo_content_osv_data.pop("repo_version", None) for repo_content_osv_data in batch
+        ]
+        existing = await sync_to_async(self._get_existing_reports)(contents)
+
+        to_query = [
+            index
+            for index, content in enumerate(contents)
+            if not existing.get(content.pk, {}).get("fresh")
+        ]
+        results = [None] * len(batch)
+        vulns = await self._query_packages([batch[index] for index in to_query])
+        for index, package_vulns in zip(to_query, vulns):
+            results[index] = package_vulns
+
+        created, updated = await sync_to_async(self._save_vulnerability_reports)(
+            contents, repo_versions, results, existing
+        )
+        if created:
+            await self.created.aincrease_by(created)
+        if updated:
+            await self.updated.aincrease_by(updated)
+        await self.total_scanned.aincrease_by(len(batch))
 
-    async def _process_reports(self, repo_content_osv_data):
+    async def _query_packages(self, osv_queries):
         """
-        Process vulnerability scanning data by querying the OSV API and extracting results.
+        Find the vulnerabilities of a list of packages.
+
+        Args:
+            osv_queries (List[Dict[str, Any]]): The osv.dev query of each package.
+
+        Returns:
+            List[List[Dict]]: The vulns of each package, in the order of `osv_queries`.
+        """
+        keys = [json.dumps(osv_query, sort_keys=True) for osv_query in osv_queries]
+        unknown = {}
+        for key, osv_query in zip(keys, osv_queries):
+            if key not in self._results:
+                unknown.setdefault(key, osv_query)
+
+        if unknown:
+            affected = await self._query_osv_batch(list(unknown.values()))
+            affected_keys = [key for key, is_affected in zip(unknown, affected) if is_affected]
+            vulns = await asyncio.gather(
+                *(self._query_vulns(unknown[key]) for key in affected_keys)
+            )
+            for key in unknown:
+                self._results[key] = []
+            self._results.update(zip(affected_keys, vulns))
+
+        results = [self._results[key] for key in keys]
+        while len(self._results) > self.results_cache_size:
+            self._results.popitem(last=False)
+        return results
+
+    async def _query_osv_batch(self, osv_queries):
+        """
+        Find out which of the packages are affected by any vulnerabilities.
+
+        The batch endpoint returns only the ids of the vulnerabilities, so the full records are
+        fetched separately for the affected packages.
 
         Args:
-            repo_content_osv_data (Dict[str, Any]): A dictionary containing OSV.dev expected
-                request data format plus associated Pulp Content and RepositoryVersion.
+            osv_queries (List[Dict[str, Any]]): Up to `batch_size` osv.dev package queries.
 
         Returns:
-            tuple:
-                - vulns (List[Dict]): List of vulnerability (vulns) returned from OSV.dev API
-                - pulp_content (Content): The Pulp Content instance that was scanned
-                - repo_version (RepositoryVersion or None): The RepositoryVersion where the
-                  Content is present
+            List[bool]: Whether each package has vulnerabilities.
         """
-        vulns = []
         async with self.semaphore:
-            repo_version = repo_content_osv_data.pop("repo_version", None)
-            pulp_content = repo_content_osv_data.pop("content")
-            vulnerability_data = await self._query_osv_api(repo_content_osv_data)
+            async with self.session.post(
+                url=self.querybatch_url, json={"queries": osv_queries}
+            ) as response:
+                try:
+                    data = await response.json()
+                except aiohttp.ContentTypeError:
+                    raise RuntimeError("Vuln report task failed to query osv.dev data.")
+        return [
+            bool(result.get("vulns")) or "next_page_token" in result for result in data["results"]
+        ]
+
+    async def _query_vulns(self, osv_data):
+        """
+        Query the osv.dev API for all vulnerabilities of a package, following the pagination.
+
+        Args:
+            osv_data (Dict[str, Any]): OSV query data dictionary containing package information
+                in the format expected by the OSV.dev API.
+
+        Returns:
+            List[Dict]: List of vulnerability (vulns) returned from OSV.dev API
+        """
+        async with self.semaphore:
+            vulnerability_data = await self._query_osv_api(osv_data)
             vulns = vulnerability_data.get("vulns", [])
             while next_page_token := vulnerability_data.get("next_page_token"):
-                repo_content_osv_data["page_token"] = next_page_token
-                vulnerability_data = await self._query_osv_api(repo_content_osv_data)
-                vulns.extend(vulnerability_data)
-        await self.total_scanned.aincrement()
-        return vulns, pulp_content, repo_version
+                vulnerability_data = await self._query_osv_api(
+                    {**osv_data, "page_token": next_page_token}
+                )
+                vulns.extend(vulnerability_data.get("vulns", []))
+        return vulns
 
     async def _query_osv_api(self, osv_data):
         """
@@ -114,36 +248,85 @@ class VulnerabilityReportScanner:
         Returns:
             Dict[str, Any]: JSON response from the OSV API containing vulnerability data.
         """
-        async with self.session.post(url=OSV_QUERY_URL, json=osv_data) as response:
+        async with self.session.post(url=self.query_url, json=osv_data) as response:
             try:
                 return await response.json()
             except aiohttp.ContentTypeError:
                 raise RuntimeError("Vuln report task failed to query osv.dev data.")
 
-    async def _save_vulnerability_report(self, vulns, content, repo_version):
+    def _get_existing_reports(self, contents):
         """
-        Save vulnerability report to the database.
+        Find the reports that already exist for the content.
 
-        Args:
-            vulns (List): osv.dev vulns output
-            content (Content): A Pulp Content instance which vulnerabilities were verified
-            repo_version (RepositoryVersion): The RepositoryVersion where Content is present
+        Returns:
+            Dict[UUID, Dict[str, Any]]: The report `pk` and whether it is `fresh` enough to be
+                reused without querying osv.dev, by content pk.
         """
+        fresh_after = timezone.now() - timedelta(seconds=settings.VULN_REPORT_CACHE_TTL)
+        reports = VulnerabilityReport.objects.filter(
+            content__in=[content.pk for content in contents]
+        ).values_list("content_id", "pk", "pulp_last_updated")
+        return {
+            content_pk: {"pk": pk, "fresh": last_updated >= fresh_after}
+            for content_pk, pk, last_updated in reports
+        }
 
-        vuln_report, created = await sync_to_async(VulnerabilityReport.objects.update_or_create)(
-            vulns=vulns, pulp_domain=get_domain(), content=content
-        )
-        await vuln_report.repo_versions.aadd(repo_version)
+    def _save_vulnerability_reports(self, contents, repo_versions, results, existing):
+        """
+        Save the vulnerability reports of a batch to the database.
 
-        if created:
-            await self.created.aincrement()
-        else:
-            await self.updated.aincrement()
+        Args:
+            contents (List[Content]): The Pulp Content instances which vulnerabilities were
+                verified
+            repo_versions (List[RepositoryVersion]): The RepositoryVersion where each Content is
+                present
+            results (List[List]): osv.dev vulns output for each Content, or None where the
+                existing report is reused
+            existing (Dict): The reports that already existed, see `_get_existing_reports`
+
+        Returns:
+            tuple: The number of reports created and updated.
+        """
+        domain = get_domain()
+        new_reports = {
+            content.pk: VulnerabilityReport(content=content, vulns=vulns, pulp_domain=domain)
+            for content, vulns in zip(contents, results)
+            if vulns is not None
+        }
+        with transaction.atomic():
+            VulnerabilityReport.objects.bulk_create(
+                new_reports.values(),
+                update_conflicts=True,
+                unique_fields=["content"],
+                update_fields=["vulns", "pulp_last_updated"],
+            )
+            report_pks = {content_pk: report["pk"] for content_pk, report in existing.items()}
+            # The upsert keeps the pk of the existing rows, not the one of the new instances.
+            report_pks.update(
+                VulnerabilityReport.objects.filter(content__in=new_reports).values_list(
+                    "content_id", "pk"
+                )
+            )
+            RepoVersionRelation = VulnerabilityReport.repo_versions.through
+            RepoVersionRelation.objects.bulk_create(
+                {
+                    (report_pks[content.pk], repo_version.pk): RepoVersionRelation(
+                        vulnerabilityreport_id=report_pks[content.pk],
+                        repositoryversion_id=repo_version.pk,
+                    )
+                    for content, repo_version in zip(contents, repo_versions)
+                    if repo_version is not None
+                }.values(),
+                ignore_conflicts=True,
+            )
+
+        created = sum(1 for content_pk in new_reports if content_pk not in existing)
+        return created, len(new_reports) - created
 
 
 async def check_content(func, args):
     """
-    Spawn tasks for each async generator value to make the API requests (scan) to osv.dev.
+    Scan the content of the async generator for vulnerabilities using the osv.dev API.
 
     Args:
         func (callable | str): A Pulp plugin function that should return an async generator with
@@ -4,12 +4,7 @@ from django.conf import settings
 from django.urls import include, path, re_path
 from django.views.decorators.cache import cache_page
 from drf_spectacular.utils import extend_schema
-from drf_spectacular.views import (
-    SpectacularJSONAPIView,
-    SpectacularRedocView,
-    SpectacularSwaggerView,
-    SpectacularYAMLAPIView,
-)
+from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
 from rest_framework.routers import APIRootView
 from rest_framework_nested import routers
 
@@ -28,6 +23,7 @@ from pulpcore.app.viewsets import (
     OrphansCleanupViewset,
     ReclaimSpaceViewSet,
 )
+from pulpcore.openapi.views import CachedSchemaJSONView, CachedSchemaYAMLView
 from pulpcore.plugin.find_url import find_api_root
 
 HUNDRED_DAYS = 100 * 24 * 60 * 60
@@ -66,16 +62,12 @@ def _docs_and_status(version):
         re_path(r"^status/$", StatusView.as_view()),
         re_path(
             r"^docs/api.json$",
-            cache_page(HUNDRED_DAYS)(
-                SpectacularJSONAPIView.as_view(authentication_classes=[], permission_classes=[])
-            ),
+            CachedSchemaJSONView.as_view(authentication_classes=[], permission_classes=[]),
             name="schema",
         ),
         re_path(
             r"^docs/api.yaml$",
-            cache_page(HUNDRED_DAYS)(
-                SpectacularYAMLAPIView.as_view(authentication_classes=[], permission_classes=[])
-            ),
+            CachedSchemaYAMLView.as_view(authentication_classes=[], permission_classes=[]),
             name="schema-yaml",
         ),
         re_path(
@@ -499,25 +499,65 @@ def configure_analytics():
 
 
 def configure_cleanup():
-    for name, task_name, protection_time in [
-        ("uploads", "pulpcore.app.tasks.orphan.upload_cleanup", settings.UPLOAD_PROTECTION_TIME),
+    orphan_task_name = "pulpcore.app.tasks.orphan.orphan_cleanup"
+    # With a periodic full scan in place, the regular orphan cleanup only needs to look at the
+    # recorded orphan candidates.
+    incremental = settings.ORPHAN_FULL_SWEEP_INTERVAL > 0
+    # The incremental and the full orphan cleanup must not run at the same time, nor overlap with
+    # the ones dispatched through the API.
+    orphan_resources = [f"pdrn:{get_domain_pk()}:orphans"]
+    for name, task_name, protection_time, task_kwargs in [
+        (
+            "uploads",
+            "pulpcore.app.tasks.orphan.upload_cleanup",
+            settings.UPLOAD_PROTECTION_TIME,
+            {},
+        ),
         (
             "shared temporary files",
             "pulpcore.app.tasks.orphan.tmpfile_cleanup",
             settings.TMPFILE_PROTECTION_TIME,
+            {},
+        ),
+        ("tasks", "pulpcore.app.tasks.purge.purge", settings.TASK_PROTECTION_TIME, {}),
+        (
+            "content",
+            orphan_task_name,
+            settings.ORPHAN_PROTECTION_TIME,
+            {"incremental": True} if incremental else {},
         ),
-        ("tasks", "pulpcore.app.tasks.purge.purge", settings.TASK_PROTECTION_TIME),
-        ("content", "pulpcore.app.tasks.orphan.orphan_cleanup", settings.ORPHAN_PROTECTION_TIME),
     ]:
         if protection_time > 0:
             dispatch_interval = timedelta(minutes=protection_time)
             name = f"Clean up stale {name} periodically"
             models.TaskSchedule.objects.update_or_create(
-                name=name, defaults={"task_name": task_name, "dispatch_interval": dispatch_interval}
+                name=name,
+                defaults={
+                    "task_name": task_name,
+                    "dispatch_interval": dispatch_interval,
+                    "task_kwargs": task_kwargs,
+                    "exclusive_resources": (
+                        orphan_resources if task_name == orphan_task_name else None
+                    ),
+                },
             )
         else:
             models.TaskSchedule.objects.filter(task_name=task_name).delete()
 
+    name = "Clean up all orphaned content periodically"
+    if settings.ORPHAN_PROTECTION_TIME > 0 and incremental:
+        dispatch_interval = timedelta(minutes=settings.ORPHAN_FULL_SWEEP_INTERVAL)
+        models.TaskSchedule.objects.update_or_create(
+            name=name,
+            defaults={
+                "task_name": orphan_task_name,
+                "dispatch_interval": dispatch_interval,
+                "exclusive_resources": orphan_resources,
+            },
+        )
+    else:
+        models.TaskSchedule.objects.filter(name=name).delete()
+
 
 def configure_periodic_telemetry():
     task_name = "pulpcore.app.tasks.telemetry.otel_metrics"
@@ -546,8 +586,11 @@ def get_artifact_url(artifact, headers=None, http_method=None):
 
     This method will generate redirect links to the configured external object storage, or to the
     special "artifact redirect" distribution in the content-app top serve from the local filesystem
-    or private cloud storage.
+    or private cloud storage. The pre-signed URLs to object storage are cached, see
+    `SIGNED_URL_CACHE_MARGIN`.
     """
+    from pulpcore.cache.signed_url import signed_url_cache
+
     artifact_file = artifact.file
     content_disposition = f"attachment;filename={artifact.pk}"
     artifact_domain = artifact.pulp_domain
@@ -563,19 +606,31 @@ def get_artifact_url(artifact, headers=None, http_method=None):
         parameters = {"ResponseContentDisposition": content_disposition}
         if headers and headers.get("Content-Type"):
             parameters["ResponseContentType"] = headers.get("Content-Type")
-        url = artifact_file.storage.url(
-            artifact_file.name, parameters=parameters, http_method=http_method
+        url = signed_url_cache.get_or_sign(
+            signed_url_cache.key(artifact, artifact_domain, parameters, http_method=http_method),
+            lambda: artifact_file.storage.url(
+                artifact_file.name, parameters=parameters, http_method=http_method
+            ),
+            signed_url_cache.ttl(artifact_file.storage),
         )
     elif artifact_domain.storage_class == "storages.backends.azure_storage.AzureStorage":
         parameters = {"content_disposition": content_disposition}
         if headers and headers.get("Content-Type"):
             parameters["content_type"] = headers.get("Content-Type")
-        url = artifact_file.storage.url(artifact_file.name, parameters=parameters)
+        url = signed_url_cache.get_or_sign(
+            signed_url_cache.key(artifact, artifact_domain, parameters),
+            lambda: artifact_file.storage.url(artifact_file.name, parameters=parameters),
+            signed_url_cache.ttl(artifact_file.storage),
+        )
     elif artifact_domain.storage_class == "storages.backends.gcloud.GoogleCloudStorage":
         parameters = {"response_disposition": content_disposition}
         if headers and headers.get("Content-Type"):
             parameters["content_type"] = headers.get("Content-Type")
-        url = artifact_file.storage.url(artifact_file.name, parameters=parameters)
+        url = signed_url_cache.get_or_sign(
+            signed_url_cache.key(artifact, artifact_domain, parameters),
+            lambda: artifact_file.storage.url(artifact_file.name, parameters=parameters),
+            signed_url_cache.ttl(artifact_file.storage),
+        )
     else:
         if settings.DOMAIN_ENABLED:
             loc = f"domain {artifact_domain.name}.storage_class"
@@ -6,6 +6,7 @@ from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import FieldError, ValidationError
 from django.db import transaction
+from django.db.models import Q
 from django.db.models.expressions import RawSQL
 from django.urls import Resolver404, resolve
 from drf_spectacular.utils import extend_schema, inline_serializer
@@ -20,7 +21,7 @@ from pulpcore.app import tasks
 from pulpcore.app.models import MasterModel
 from pulpcore.app.models.role import GroupRole, UserRole
 from pulpcore.app.response import OperationPostponedResponse
-from pulpcore.app.role_util import get_objects_for_user
+from pulpcore.app.role_util import get_objects_for_user, invalidate_permission_cache
 from pulpcore.app.serializers import (
     AsyncOperationResponseSerializer,
     NestedRoleSerializer,
@@ -368,13 +369,13 @@ class NamedModelViewSet(viewsets.GenericViewSet):
                     qs = get_objects_for_user(user, permission_name, qs)
             else:
                 # master view so loop through each subclass to find scoped objects
-                pks = []
+                scope_q = Q(pk__in=[])
                 for model in self.queryset.model.__subclasses__():
                     if viewset_model := get_viewset_for_model(model, ignore_error=True):
                         viewset = viewset_model()
                         setattr(viewset, "request", self.request)
-                        pks.extend(viewset.get_queryset().values_list("pk", flat=True))
-                qs = qs.filter(pk__in=pks)
+                        scope_q |= Q(pk__in=viewset.get_queryset().values("pk"))
+                qs = qs.filter(scope_q)
         return qs
 
     @classmethod
@@ -652,6 +653,7 @@ class RolesMixin:
         with transaction.atomic():
             UserRole.objects.filter(pk__in=serializer.user_role_pks).delete()
             GroupRole.objects.filter(pk__in=serializer.group_role_pks).delete()
+            invalidate_permission_cache()
         return Response(serializer.data, status=201)
 
     @extend_schema(
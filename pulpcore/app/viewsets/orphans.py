@@ -27,7 +27,11 @@ class OrphansCleanupViewset(ViewSet):
             "orphan_protection_time", settings.ORPHAN_PROTECTION_TIME
         )
         exclusive_resources = [f"pdrn:{request.pulp_domain.pulp_id}:orphans"]
-        task_kwargs = {"content_pks": content_pks, "orphan_protection_time": orphan_protection_time}
+        task_kwargs = {
+            "content_pks": content_pks,
+            "orphan_protection_time": orphan_protection_time,
+            "incremental": serializer.validated_data["incremental"],
+        }
         task = dispatch(
             orphan_cleanup,
             exclusive_resources=exclusive_resources,
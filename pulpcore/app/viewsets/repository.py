@@ -1,10 +1,15 @@
+import json
 from collections import defaultdict
 from gettext import gettext as _
+from itertools import islice
 from urllib.parse import urlparse
 
 from django.db.models import Max, Q
+from django.http import StreamingHttpResponse
+from django.urls import NoReverseMatch
 from django.urls.base import Resolver404, resolve
 from django_filters import Filter
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema
 from rest_framework import mixins, serializers
 from rest_framework.decorators import action
@@ -13,6 +18,7 @@ from rest_framework.viewsets import GenericViewSet
 from pulpcore.app import tasks
 from pulpcore.app.models import (
     Content,
+    ContentArtifact,
     Remote,
     Repository,
     RepositoryContent,
@@ -27,7 +33,7 @@ from pulpcore.app.serializers import (
     RepositorySerializer,
     RepositoryVersionSerializer,
 )
-from pulpcore.app.util import resolve_prn
+from pulpcore.app.util import get_url, resolve_prn
 from pulpcore.app.viewsets import (
     AsyncRemoveMixin,
     AsyncUpdateMixin,
@@ -250,6 +256,94 @@ class RepositoryVersionQuerysetMixin:
         return qs
 
 
+# Number of content units fetched and serialized at a time when streaming a version's content.
+CONTENT_STREAM_BATCH_SIZE = 1000
+# Stand-in for the pk when building the href template of a content type.
+_HREF_PLACEHOLDER = "00000000-0000-0000-0000-000000000000"
+
+
+def _content_href_template(pulp_type, domain):
+    """Return the href of a content unit of `pulp_type` with a placeholder instead of the pk."""
+    try:
+        model = Content.get_model_for_pulp_type(pulp_type)
+        return get_url(model(pk=_HREF_PLACEHOLDER), domain=domain)
+    except (KeyError, NoReverseMatch):
+        # Content of a type that is no longer installed or has no viewset.
+        return None
+
+
+def _content_batch_ndjson(batch, domain, href_templates):
+    """
+    Serialize a batch of content units as newline-delimited JSON.
+
+    Args:
+        batch (list): Tuples of the pk and the pulp_type of the content units.
+        domain (pulpcore.app.models.Domain): The domain of the content units.
+        href_templates (dict): Href templates by pulp_type, filled in as new types are found.
+
+    Returns:
+        str: One JSON document per content unit, each on its own line.
+    """
+    pks_by_type = defaultdict(list)
+    for pk, pulp_type in batch:
+        pks_by_type[pulp_type].append(pk)
+
+    natural_keys = {}
+    for pulp_type, pks in pks_by_type.items():
+        if pulp_type not in href_templates:
+            href_templates[pulp_type] = _content_href_template(pulp_type, domain)
+        try:
+            model = Content.get_model_for_pulp_type(pulp_type)
+        except KeyError:
+            continue
+        fields = model._sanitized_natural_key_fields()
+        for values in model.objects.filter(pk__in=pks).values("pk", *fields):
+            natural_keys[values.pop("pk")] = values
+
+    artifacts = defaultdict(dict)
+    for content_id, relative_path, sha256 in ContentArtifact.objects.filter(
+        content_id__in=[pk for pk, _pulp_type in batch]
+    ).values_list("content_id", "relative_path", "artifact__sha256"):
+        artifacts[content_id][relative_path] = sha256
+
+    lines = []
+    for pk, pulp_type in batch:
+        href_template = href_templates[pulp_type]
+        record = {
+            "pulp_href": href_template and href_template.replace(_HREF_PLACEHOLDER, str(pk)),
+            "pulp_type": pulp_type,
+            "natural_key": natural_keys.get(pk, {}),
+            "artifacts": artifacts[pk],
+        }
+        lines.append(json.dumps(record, default=str) + "\n")
+    return "".join(lines)
+
+
+def stream_version_content(version):
+    """
+    Generate the content of a repository version as newline-delimited JSON.
+
+    The content is read with a server-side cursor and serialized in batches, so the memory used
+    does not depend on the size of the repository version.
+
+    Args:
+        version (pulpcore.app.models.RepositoryVersion): The version to list the content of.
+
+    Yields:
+        str: The JSON documents of a batch of content units, one per line.
+    """
+    content = (
+        version.get_content()
+        .order_by("pk")
+        .values_list("pk", "pulp_type")
+        .iterator(chunk_size=CONTENT_STREAM_BATCH_SIZE)
+    )
+    domain = version.repository.pulp_domain
+    href_templates = {}
+    while batch := list(islice(content, CONTENT_STREAM_BATCH_SIZE)):
+        yield _content_batch_ndjson(batch, domain, href_templates)
+
+
 class RepositoryVersionViewSet(
     RepositoryVersionQuerysetMixin,
     NamedModelViewSet,
@@ -267,6 +361,8 @@ class RepositoryVersionViewSet(
     queryset = RepositoryVersion.objects.complete()
     filterset_class = RepositoryVersionFilter
     ordering = ("-number",)
+    # Whoever may retrieve a version may stream its content.
+    ACCESS_POLICY_ACTION_ALIASES = {"content": "retrieve"}
 
     @extend_schema(
         description="Trigger an asynchronous task to delete a repository version.",
@@ -311,6 +407,24 @@ class RepositoryVersionViewSet(
         )
         return OperationPostponedResponse(task, request)
 
+    @extend_schema(
+        description=(
+            "Stream all content of a repository version as newline-delimited JSON. Each line "
+            "holds the href, the type, the natural key and the sha256 digests of the artifacts "
+            "by relative path of one content unit."
+        ),
+        responses={(200, "application/x-ndjson"): OpenApiTypes.STR},
+    )
+    @action(detail=True, methods=["get"], pagination_class=None, filter_backends=[])
+    def content(self, request, repository_pk, number, **kwargs):
+        """
+        Streams the content of a RepositoryVersion
+        """
+        version = self.get_object()
+        return StreamingHttpResponse(
+            stream_version_content(version), content_type="application/x-ndjson"
+        )
+
 
 class RemoteFilter(BaseFilterSet):
     """
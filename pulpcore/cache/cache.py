@@ -18,7 +18,7 @@ from pulpcore.app.redis_connection import (
     get_redis_connection,
 )
 from pulpcore.metrics import artifacts_size_counter
-from pulpcore.responses import ArtifactResponse
+from pulpcore.responses import ArtifactResponse, CachedFileResponse
 
 DEFAULT_EXPIRES_TTL = settings.CACHE_SETTINGS["EXPIRES_TTL"]
 
@@ -306,7 +306,9 @@ class AsyncContentCache(AsyncCache):
     """Cache object meant to be used for the content app"""
 
     RESPONSE_TYPES = {
-        "FileResponse": FileResponse,
+        "FileResponse": CachedFileResponse
+        if settings.CONTENT_APP_FILE_CACHE_SIZE
+        else FileResponse,
         "ArtifactResponse": ArtifactResponse,
         "Response": Response,
         "Redirect": HTTPFound,
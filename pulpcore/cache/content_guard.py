@@ -0,0 +1,138 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from pulpcore.app.redis_connection import get_redis_connection
+from pulpcore.cache.cache import connection_error_wrapper
+
+
+class ContentGuardCache:
+    """
+    A cache of the decisions of content guards.
+
+    Checking a content guard can cost several database queries on every request, e.g. the role
+    lookups of `RBACContentGuard`. The decisions are reused for `CONTENT_GUARD_CACHE_TTL` seconds
+    for requests the guard considers equal, see `ContentGuard.permit_cache_key()`.
+
+    All decisions are discarded by `invalidate()`, which is called once the transaction changing
+    content guards, access policies or the roles granting download access to content guards is
+    committed. If Redis is configured, the invalidation reaches the content app processes through
+    it. Otherwise they notice the changes made by other processes once the decisions expire.
+
+    Attributes:
+        size (int): The maximum number of decisions kept in memory.
+    """
+
+    generation_key = "PULP_CONTENT_GUARD_GENERATION"
+
+    def __init__(self, size=10000):
+        self.size = size
+        self._decisions = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def permit(self, guard, request):
+        """
+        Authorize the request with the detail content guard, reusing a cached decision.
+
+        Args:
+            guard (pulpcore.app.models.ContentGuard): The detail content guard.
+            request (aiohttp.web.Request): A request for a published file.
+
+        Raises:
+            PermissionError: When not authorized.
+        """
+        ttl = settings.CONTENT_GUARD_CACHE_TTL
+        permit_key = guard.permit_cache_key(request) if ttl else None
+        generation = self._get_generation() if permit_key is not None else None
+        if generation is None:
+            guard.permit(request)
+            return
+        key = self.key(guard, permit_key, generation)
+        decision = self._get(key)
+        if decision is None:
+            try:
+                guard.permit(request)
+                decision = (True, None)
+            except PermissionError as pe:
+                decision = (False, str(pe))
+            self._set(key, decision, ttl)
+        permitted, reason = decision
+        if not permitted:
+            raise PermissionError(reason)
+
+    @staticmethod
+    def key(guard, permit_key, generation):
+        """
+        Create the key of a decision.
+
+        Args:
+            guard (pulpcore.app.models.ContentGuard): The content guard.
+            permit_key: The request as seen by the guard, see `ContentGuard.permit_cache_key()`.
+            generation: The generation of the cache, see `invalidate()`.
+
+        Returns:
+            str: The key.
+        """
+        # Hashed, the requests may carry secrets such as header values or signed URLs.
+        data = [str(guard.pk), permit_key, generation]
+        return hashlib.sha256(json.dumps(data, default=str).encode()).hexdigest()
+
+    def invalidate(self):
+        """
+        Discard the cached decisions of this and, if Redis is configured, all other processes.
+        """
+        with self._lock:
+            self._generation += 1
+            self._decisions.clear()
+        if (redis := get_redis_connection()) is not None:
+            self._incr_shared(redis)
+
+    def clear(self):
+        """
+        Drop the decisions kept in memory.
+        """
+        with self._lock:
+            self._decisions.clear()
+
+    def _get_generation(self):
+        redis = get_redis_connection()
+        if redis is None:
+            return [self._generation]
+        shared = self._get_shared(redis)
+        if shared is None:
+            # Without Redis, the changes made by other processes would go unnoticed.
+            return None
+        return [self._generation, shared]
+
+    def _get(self, key):
+        with self._lock:
+            if entry := self._decisions.get(key):
+                decision, expires = entry
+                if expires > time.monotonic():
+                    self._decisions.move_to_end(key)
+                    return decision
+                del self._decisions[key]
+        return None
+
+    def _set(self, key, decision, ttl):
+        with self._lock:
+            self._decisions[key] = (decision, time.monotonic() + ttl)
+            self._decisions.move_to_end(key)
+            while len(self._decisions) > self.size:
+                self._decisions.popitem(last=False)
+
+    @connection_error_wrapper
+    def _get_shared(self, redis):
+        return int(redis.get(self.generation_key) or 0)
+
+    @connection_error_wrapper
+    def _incr_shared(self, redis):
+        redis.incr(self.generation_key)
+
+
+content_guard_cache = ContentGuardCache()
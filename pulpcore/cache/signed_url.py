@@ -0,0 +1,168 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+
+from pulpcore.app.redis_connection import get_async_redis_connection, get_redis_connection
+from pulpcore.cache.cache import aconnection_error_wrapper, connection_error_wrapper
+
+
+class SignedURLCache:
+    """
+    A cache of the pre-signed URLs redirecting to artifacts in object storage.
+
+    Signing a URL for every request costs CPU, and gives every client a different URL, which
+    defeats any cache in front of the storage. The URLs are reused until `SIGNED_URL_CACHE_MARGIN`
+    seconds before they expire. They are kept in memory and, if Redis is configured, shared
+    between processes through it.
+
+    Attributes:
+        size (int): The maximum number of URLs kept in memory.
+    """
+
+    base_key = "PULP_SIGNED_URL"
+
+    def __init__(self, size=10000):
+        self.size = size
+        self._urls = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(artifact, domain, parameters=None, **kwargs):
+        """
+        Create the key of the URL of an artifact.
+
+        Args:
+            artifact (pulpcore.app.models.Artifact): The artifact the URL points to.
+            domain (pulpcore.app.models.Domain): The domain of the storage serving the artifact.
+            parameters (dict): The response parameters signed into the URL.
+            kwargs: Any other arguments passed to the `url()` method of the storage.
+
+        Returns:
+            str: The key.
+        """
+        # The storage settings of the domain may change, pulp_last_updated tells them apart.
+        data = [
+            str(artifact.pk),
+            str(domain.pk),
+            domain.pulp_last_updated.isoformat() if domain.pulp_last_updated else None,
+            parameters or {},
+            kwargs,
+        ]
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+    @staticmethod
+    def ttl(storage):
+        """
+        Find out for how long the URLs signed by a storage can be reused.
+
+        Returns:
+            int: The seconds, or None if the URLs are not to be cached.
+        """
+        if settings.SIGNED_URL_CACHE_MARGIN is None:
+            return None
+        for attribute in ("querystring_expire", "expiration_secs", "expiration"):
+            if lifetime := getattr(storage, attribute, None):
+                if isinstance(lifetime, timedelta):
+                    lifetime = lifetime.total_seconds()
+                ttl = int(lifetime - settings.SIGNED_URL_CACHE_MARGIN)
+                return ttl if ttl > 0 else None
+        return None
+
+    def get_or_sign(self, key, sign, ttl):
+        """
+        Get the cached URL of the key, or sign a new one and cache it for `ttl` seconds.
+
+        Args:
+            key (str): The key of the URL, see `key()`.
+            sign (callable): Returns a new URL.
+            ttl (int): The seconds the URL can be reused, see `ttl()`. None disables the cache.
+
+        Returns:
+            str: The URL.
+        """
+        if ttl is None:
+            return sign()
+        if url := self._get_local(key):
+            return url
+        redis = get_redis_connection()
+        if redis is not None and (entry := self._get_shared(redis, key)):
+            return self._set_local(key, *entry)
+        url = sign()
+        self._set_local(key, url, time.time() + ttl)
+        if redis is not None:
+            self._set_shared(redis, key, url, ttl)
+        return url
+
+    async def aget_or_sign(self, key, sign, ttl):
+        """Async version of get_or_sign."""
+        if ttl is None:
+            return sign()
+        if url := self._get_local(key):
+            return url
+        redis = get_async_redis_connection()
+        if redis is not None and (entry := await self._aget_shared(redis, key)):
+            return self._set_local(key, *entry)
+        url = sign()
+        self._set_local(key, url, time.time() + ttl)
+        if redis is not None:
+            await self._aset_shared(redis, key, url, ttl)
+        return url
+
+    def clear(self):
+        """
+        Drop the URLs kept in memory.
+        """
+        with self._lock:
+            self._urls.clear()
+
+    def _get_local(self, key):
+        with self._lock:
+            if entry := self._urls.get(key):
+                url, expires = entry
+                if expires > time.time():
+                    self._urls.move_to_end(key)
+                    return url
+                del self._urls[key]
+        return None
+
+    def _set_local(self, key, url, expires):
+        with self._lock:
+            self._urls[key] = (url, expires)
+            self._urls.move_to_end(key)
+            while len(self._urls) > self.size:
+                self._urls.popitem(last=False)
+        return url
+
+    def _decode(self, value):
+        if value:
+            entry = json.loads(value)
+            if entry["expires"] > time.time():
+                return entry["url"], entry["expires"]
+        return None
+
+    def _encode(self, url, ttl):
+        return json.dumps({"url": url, "expires": time.time() + ttl})
+
+    @connection_error_wrapper
+    def _get_shared(self, redis, key):
+        return self._decode(redis.get(f"{self.base_key}:{key}"))
+
+    @connection_error_wrapper
+    def _set_shared(self, redis, key, url, ttl):
+        redis.set(f"{self.base_key}:{key}", self._encode(url, ttl), ex=ttl)
+
+    @aconnection_error_wrapper
+    async def _aget_shared(self, redis, key):
+        return self._decode(await redis.get(f"{self.base_key}:{key}"))
+
+    @aconnection_error_wrapper
+    async def _aset_shared(self, redis, key, url, ttl):
+        await redis.set(f"{self.base_key}:{key}", self._encode(url, ttl), ex=ttl)
+
+
+signed_url_cache = SignedURLCache()
@@ -135,3 +135,6 @@ LABEL_KEY_REGEX = rf"^{LABEL_KEY_CHARS}+$"
 # VULNERABILITY REPORT CONSTANTS
 # OSV API URL
 OSV_QUERY_URL = "https://api.osv.dev/v1/query"
+OSV_QUERYBATCH_URL = "https://api.osv.dev/v1/querybatch"
+# The maximum number of queries osv.dev accepts in a single batch request
+OSV_QUERYBATCH_SIZE = 1000
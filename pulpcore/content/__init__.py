@@ -11,6 +11,8 @@ from asgiref.sync import sync_to_async
 from gunicorn.arbiter import Arbiter
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pulpcore.app.settings")
+# The API components of the plugins are only imported if a task or content guard needs them.
+os.environ.setdefault("PULP_LAZY_PLUGIN_IMPORTS", "true")
 django.setup()
 
 from django.conf import settings  # noqa: E402
@@ -23,6 +25,7 @@ from django.db.utils import (  # noqa: E402
 from pulpcore.app.apps import pulp_plugin_configs  # noqa: E402
 from pulpcore.app.models import AppStatus  # noqa: E402
 from pulpcore.app.util import get_worker_name  # noqa: E402
+from pulpcore.responses import open_file_cache  # noqa: E402
 
 from .authentication import authenticate, guid  # noqa: E402
 from .handler import Handler  # noqa: E402
@@ -99,6 +102,24 @@ async def _heartbeat_ctx(app):
         pass
 
 
+async def _sweep_open_file_cache():
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(open_file_cache.revalidate_after)
+        await loop.run_in_executor(None, open_file_cache.sweep)
+
+
+async def _open_file_cache_ctx(app):
+    sweep_task = asyncio.create_task(_sweep_open_file_cache())
+    yield
+    sweep_task.cancel()
+    try:
+        await sweep_task
+    except asyncio.CancelledError:
+        pass
+    open_file_cache.clear()
+
+
 async def server(*args, **kwargs):
     os.chdir(settings.WORKING_DIRECTORY)
 
@@ -116,4 +137,6 @@ async def server(*args, **kwargs):
     app.add_routes([web.get(path_prefix, Handler().list_distributions)])
     app.add_routes([web.get(path_prefix + "{path:.+}", Handler().stream_content)])
     app.cleanup_ctx.append(_heartbeat_ctx)
+    if settings.CONTENT_APP_FILE_CACHE_SIZE:
+        app.cleanup_ctx.append(_open_file_cache_ctx)
     return app
@@ -25,7 +25,7 @@ from multidict import CIMultiDict
 from yarl import URL
 
 from pulpcore.constants import CHECKPOINT_TS_FORMAT, STORAGE_RESPONSE_MAP
-from pulpcore.responses import ArtifactResponse
+from pulpcore.responses import ArtifactResponse, CachedFileResponse
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pulpcore.app.settings")
 django.setup()
@@ -59,6 +59,8 @@ from pulpcore.app.util import (  # noqa: E402
     get_domain,
 )
 from pulpcore.cache import AsyncContentCache  # noqa: E402
+from pulpcore.cache.content_guard import content_guard_cache  # noqa: E402
+from pulpcore.cache.signed_url import signed_url_cache  # noqa: E402
 from pulpcore.exceptions import (  # noqa: E402
     DigestValidationError,
     UnsupportedDigestValidationError,
@@ -482,6 +484,7 @@ class Handler:
         Permit the request.
 
         Authorization is delegated to the optional content-guard associated with the distribution.
+        Its decisions are cached for `CONTENT_GUARD_CACHE_TTL` seconds.
 
         Args:
             request (aiohttp.web.Request) A request for a published file.
@@ -495,7 +498,7 @@ class Handler:
         if not guard:
             return False
         try:
-            guard.cast().permit(request)
+            content_guard_cache.permit(guard.cast(), request)
         except PermissionError as pe:
             log.debug(
                 'Path: %(p)s not permitted by guard: "%(g)s" reason: %(r)s',
@@ -1090,7 +1093,7 @@ class Handler:
             ret.update({ca.relative_path: ca for ca in cas})
         return ret
 
-    def _build_response_from_content_artifact(self, content_artifact, headers, request):
+    async def _build_response_from_content_artifact(self, content_artifact, headers, request):
         """Helper method to build the correct response to serve a ContentArtifact."""
 
         def _set_params_from_headers(hdrs, storage_domain):
@@ -1102,24 +1105,30 @@ class Handler:
                         params[STORAGE_RESPONSE_MAP[storage_domain][a_key]] = hdrs[a_key]
             return params
 
-        def _build_url(**kwargs):
+        async def _build_url(**kwargs):
             filename = os.path.basename(content_artifact.relative_path)
             content_disposition = f"attachment;filename={filename}"
 
             headers["Content-Disposition"] = content_disposition
             parameters = _set_params_from_headers(headers, domain.storage_class)
-            storage_url = storage.url(artifact_name, parameters=parameters, **kwargs)
+            storage_url = await signed_url_cache.aget_or_sign(
+                signed_url_cache.key(content_artifact.artifact, domain, parameters, **kwargs),
+                lambda: storage.url(artifact_name, parameters=parameters, **kwargs),
+                signed_url_cache.ttl(storage),
+            )
 
             return URL(storage_url, encoded=True)
 
-        artifact_file = content_artifact.artifact.file
-        artifact_name = artifact_file.name
+        artifact_name = content_artifact.artifact.file.name
         domain = get_domain()
         storage = domain.get_storage()
-        headers["X-PULP-ARTIFACT-SIZE"] = str(artifact_file.size)
+        # The size is known without asking the storage.
+        headers["X-PULP-ARTIFACT-SIZE"] = str(content_artifact.artifact.size)
 
         if domain.storage_class == "pulpcore.app.models.storage.FileSystem":
             path = storage.path(artifact_name)
+            if settings.CONTENT_APP_FILE_CACHE_SIZE:
+                return CachedFileResponse(path, headers=headers)
             if not os.path.exists(path):
                 raise Exception(_("Expected path '{}' is not found").format(path))
             return FileResponse(path, headers=headers)
@@ -1129,12 +1138,12 @@ class Handler:
             "storages.backends.s3boto3.S3Boto3Storage",
             "storages.backends.s3.S3Storage",
         ):
-            return HTTPFound(_build_url(http_method=request.method), headers=headers)
+            return HTTPFound(await _build_url(http_method=request.method), headers=headers)
         elif domain.storage_class in (
             "storages.backends.azure_storage.AzureStorage",
             "storages.backends.gcloud.GoogleCloudStorage",
         ):
-            return HTTPFound(_build_url(), headers=headers)
+            return HTTPFound(await _build_url(), headers=headers)
         else:
             raise NotImplementedError()
 
@@ -1159,24 +1168,26 @@ class Handler:
         Returns:
             The [aiohttp.web.FileResponse][] for the file.
         """
-        artifact_file = content_artifact.artifact.file
-        content_length = artifact_file.size
+        artifact_size = content_artifact.artifact.size
+        content_length = artifact_size
 
         try:
             range_start, range_stop = request.http_range.start, request.http_range.stop
             if range_start or range_stop:
-                if range_stop and artifact_file.size and range_stop > artifact_file.size:
+                if range_stop and artifact_size and range_stop > artifact_size:
                     start = 0 if range_start is None else range_start
-                    content_length = artifact_file.size - start
+                    content_length = artifact_size - start
                 elif range_stop:
                     content_length = range_stop - range_start
         except ValueError:
-            size = artifact_file.size or "*"
+            size = artifact_size or "*"
             raise HTTPRequestRangeNotSatisfiable(headers={"Content-Range": f"bytes */{size}"})
 
         artifacts_size_counter.add(content_length)
 
-        response = self._build_response_from_content_artifact(content_artifact, headers, request)
+        response = await self._build_response_from_content_artifact(
+            content_artifact, headers, request
+        )
         if isinstance(response, HTTPFound):
             raise response
         else:
@@ -1353,7 +1364,7 @@ class Handler:
             ca = content_artifacts[remote_artifact.content_artifact.relative_path]
             # If cache is enabled, add the future response to our stream response
             if settings.CACHE_ENABLED:
-                response.future_response = self._build_response_from_content_artifact(
+                response.future_response = await self._build_response_from_content_artifact(
                     ca, original_headers, request
                 )
             # Try to add content to repository if present & supported
@@ -18,6 +18,7 @@ from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from pulpcore.app.pagination import PulpPagination
 from pulpcore.app.util import extract_pk, get_domain_pk, resolve_prn
 
 EMPTY_VALUES = (*EMPTY_VALUES, "null")
@@ -406,6 +407,7 @@ class BaseFilterSet(filterset.FilterSet):
             "page_size",
             "ordering",
             "format",
+            PulpPagination.cursor_query_param,
         ]
         for field in self.data.keys():
             if field in DEFAULT_FILTERS:
@@ -63,3 +63,29 @@ class ArtifactsSizeCounter(MetricsEmitter):
 
 
 artifacts_size_counter = ArtifactsSizeCounter.build()
+
+
+class OpenFileCacheCounter(MetricsEmitter):
+    @classmethod
+    def build(cls, *args, **kwargs):
+        if settings.OTEL_ENABLED:
+            return cls(*args, **kwargs)
+        else:
+            return cls._NoopEmitter()
+
+    def __init__(self):
+        self.meter = init_otel_meter("pulp-content")
+        self.counter = self.meter.create_counter(
+            "content_app.open_file_cache.lookups",
+            description="Counts the lookups of files in the open file cache of the content app",
+        )
+
+    def add(self, hit):
+        attributes = {
+            "result": "hit" if hit else "miss",
+            "worker_process": get_worker_name(),
+        }
+        self.counter.add(1, attributes)
+
+
+open_file_cache_counter = OpenFileCacheCounter.build()
@@ -0,0 +1,214 @@
+"""
+Caching of generated OpenAPI schemas.
+
+Generating the schema walks every viewset and serializer of every installed component and takes
+tens of seconds on large installations. The result only depends on the installed component
+versions, a few settings and the schema variant requested, so it is cached under a key derived
+from those, both in memory and on disk in the working directory where all API workers of a
+host, and their successors after a restart, can pick it up.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.http import HttpRequest
+from django.utils import translation
+from drf_spectacular.settings import spectacular_settings
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from pulpcore.app.apps import pulp_plugin_configs
+
+_logger = logging.getLogger(__name__)
+
+# Query parameters that change the generated schema, or make generating it fail.
+SCHEMA_QUERY_PARAMS = ("bindings", "component", "include_html", "pk_path", "plugin")
+# Settings that change the generated schema.
+SCHEMA_SETTINGS = ("API_ROOT", "API_ROOT_REWRITE_HEADER", "DOMAIN_ENABLED", "ENABLE_V4_API")
+# The variants generated in the background when an API worker starts: the plain schema, the one
+# used for bindings and the one the docs/ and swagger/ pages load.
+WARM_VARIANTS = ({}, {"bindings": "1"}, {"include_html": "1", "pk_path": "1"})
+MEMORY_CACHE_SIZE = 16
+# A warmup lock older than this belongs to a worker that died while generating.
+STALE_LOCK_SECONDS = 600
+
+_memory_cache = OrderedDict()
+_memory_cache_lock = threading.Lock()
+
+
+def schema_cache_key(query_params, api_version=None, public=True):
+    """
+    Return the cache key of the schema generated for the given request parameters.
+    """
+    data = {
+        "components": sorted((app.label, app.version) for app in pulp_plugin_configs()),
+        "settings": {name: getattr(settings, name, None) for name in SCHEMA_SETTINGS},
+        "query": {
+            name: str(query_params.get(name))
+            for name in SCHEMA_QUERY_PARAMS
+            if name in query_params
+        },
+        "language": translation.get_language(),
+        "api_version": api_version,
+        "public": public,
+    }
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _cache_dir():
+    return os.path.join(settings.WORKING_DIRECTORY, "openapi")
+
+
+def _cache_path(key):
+    return os.path.join(_cache_dir(), f"{key}.json")
+
+
+def _remember(key, schema):
+    with _memory_cache_lock:
+        _memory_cache[key] = schema
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+
+def get_cached_schema(key):
+    """
+    Return the cached schema for `key`, or None if it has not been generated yet.
+    """
+    with _memory_cache_lock:
+        if key in _memory_cache:
+            _memory_cache.move_to_end(key)
+            return _memory_cache[key]
+    try:
+        with open(_cache_path(key)) as fp:
+            schema = json.load(fp, object_pairs_hook=OrderedDict)
+    except (OSError, ValueError):
+        return None
+    _remember(key, schema)
+    return schema
+
+
+def set_cached_schema(key, schema):
+    """
+    Store `schema` under `key`.
+
+    The file is written to a temporary name first and then renamed, so concurrent readers never
+    see a partial schema. Failing to write it is not an error, the schema stays cached in memory.
+    """
+    _remember(key, schema)
+    try:
+        os.makedirs(_cache_dir(), exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=_cache_dir(), suffix=".tmp", delete=False) as fp:
+            json.dump(schema, fp, default=str)
+        os.replace(fp.name, _cache_path(key))
+    except OSError as e:
+        _logger.debug("Could not write the OpenAPI schema cache: %s", e)
+
+
+def clear_schema_cache():
+    """
+    Drop all cached schemas, in memory and on disk.
+    """
+    with _memory_cache_lock:
+        _memory_cache.clear()
+    try:
+        names = os.listdir(_cache_dir())
+    except OSError:
+        return
+    for name in names:
+        try:
+            os.unlink(os.path.join(_cache_dir(), name))
+        except OSError:
+            pass
+
+
+def clear_stale_schemas(keys):
+    """
+    Remove the cached schemas from disk, except those of `keys`.
+
+    Schemas of former component versions or settings are never requested again. Other variants
+    are generated again when they are requested.
+    """
+    try:
+        names = os.listdir(_cache_dir())
+    except OSError:
+        return
+    keep = {f"{key}.json" for key in keys}
+    for name in names:
+        if name.endswith(".json") and name not in keep:
+            try:
+                os.unlink(os.path.join(_cache_dir(), name))
+            except OSError:
+                pass
+
+
+def build_schema_request(query_params=None):
+    """
+    Build the request used to generate a schema outside of a real request.
+    """
+    request = Request(HttpRequest())
+    request.META["SERVER_NAME"] = "localhost"
+    request.META["SERVER_PORT"] = "24817"
+    for name, value in (query_params or {}).items():
+        request.query_params[name] = value
+    return request
+
+
+def _acquire_warmup_lock(key):
+    path = os.path.join(_cache_dir(), f"{key}.lock")
+    try:
+        if time.time() - os.path.getmtime(path) > STALE_LOCK_SECONDS:
+            os.unlink(path)
+    except OSError:
+        pass
+    try:
+        os.makedirs(_cache_dir(), exist_ok=True)
+        os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except OSError:
+        # Another worker is generating this schema, or the cache is not writable.
+        return None
+    return path
+
+
+def warm_schema_cache():
+    """
+    Generate the commonly requested schema variants that are not cached yet.
+
+    This runs in a background thread of the API workers, so that after an upgrade the first
+    client asking for the schema does not have to wait for it to be generated. Only one worker
+    of a host generates any given variant. All other schemas are removed from the disk.
+    """
+    from pulpcore.openapi import PulpSchemaGenerator
+
+    version = api_settings.DEFAULT_VERSION
+    public = spectacular_settings.SERVE_PUBLIC
+    requests = {}
+    for query_params in WARM_VARIANTS:
+        request = build_schema_request(query_params)
+        requests[schema_cache_key(request.query_params, version, public)] = request
+    clear_stale_schemas(requests)
+    for key, request in requests.items():
+        if get_cached_schema(key) is not None:
+            continue
+        lock_path = _acquire_warmup_lock(key)
+        if lock_path is None:
+            continue
+        try:
+            generator = PulpSchemaGenerator(
+                urlconf=spectacular_settings.SERVE_URLCONF, api_version=version
+            )
+            set_cached_schema(key, generator.get_schema(request=request, public=public))
+        except Exception:
+            _logger.exception("Failed to generate the OpenAPI schema.")
+        finally:
+            try:
+                os.unlink(lock_path)
+            except OSError:
+                pass
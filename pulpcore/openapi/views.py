@@ -0,0 +1,53 @@
+import hashlib
+
+from django.http import HttpResponseNotModified
+from drf_spectacular.views import SpectacularJSONAPIView, SpectacularYAMLAPIView
+from rest_framework.response import Response
+
+from pulpcore.openapi.cache import get_cached_schema, schema_cache_key, set_cached_schema
+
+
+class CachedSchemaMixin:
+    """
+    Serve the schema from the schema cache and support conditional requests.
+
+    The ETag identifies the cached schema together with the URL it is served from, since the
+    `servers` entry of the schema is built from the request.
+    """
+
+    def _get_schema_response(self, request):
+        version = self.api_version or request.version or self._get_version_parameter(request)
+        key = schema_cache_key(request.query_params, version, self.serve_public)
+        etag = self._get_etag(request, key)
+        if etag in request.headers.get("If-None-Match", ""):
+            return HttpResponseNotModified(headers={"ETag": etag})
+
+        schema = get_cached_schema(key)
+        if schema is None:
+            generator = self.generator_class(
+                urlconf=self.urlconf, api_version=version, patterns=self.patterns
+            )
+            schema = generator.get_schema(request=request, public=self.serve_public)
+            set_cached_schema(key, schema)
+        return Response(
+            data=dict(schema, servers=[{"url": request.build_absolute_uri("/")}]),
+            headers={
+                "Content-Disposition": f'inline; filename="{self._get_filename(request, version)}"',
+                "ETag": etag,
+            },
+        )
+
+    def _get_etag(self, request, key):
+        renderer = self.perform_content_negotiation(request, force=True)[0]
+        digest = hashlib.sha256(
+            f"{key}:{request.build_absolute_uri('/')}:{renderer.format}".encode()
+        )
+        return f'"{digest.hexdigest()}"'
+
+
+class CachedSchemaJSONView(CachedSchemaMixin, SpectacularJSONAPIView):
+    pass
+
+
+class CachedSchemaYAMLView(CachedSchemaMixin, SpectacularYAMLAPIView):
+    pass
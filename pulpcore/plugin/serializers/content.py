@@ -132,12 +132,7 @@ class UploadSerializerFieldsMixin(Serializer):
         if upload := data.pop("upload", None):
             self.context["upload"] = upload
             chunks = UploadChunk.objects.filter(upload=upload).order_by("offset")
-            with NamedTemporaryFile(mode="ab", dir=".", delete=False) as temp_file:
-                for chunk in chunks:
-                    temp_file.write(chunk.file.read())
-                    chunk.file.close()
-                temp_file.flush()
-            data["file"] = PulpTemporaryUploadedFile.from_file(open(temp_file.name, "rb"))
+            data["file"] = PulpTemporaryUploadedFile.from_chunks(chunks)
         elif pulp_temp_file_pk := self.context.get("pulp_temp_file_pk"):
             pulp_temp_file = PulpTemporaryFile.objects.get(pk=pulp_temp_file_pk)
             data["file"] = PulpTemporaryUploadedFile.from_file(pulp_temp_file.file)
@@ -156,6 +156,23 @@ class DeclarativeVersion:
         )
         return pipeline
 
+    def content_association_stage(self, new_version):
+        """
+        Build the stage associating the content of the stream with the new version.
+
+        Plugin-writers may override this method to associate and un-associate the content
+        differently, e.g. when the first stage only emits the content that changed.
+
+        Args:
+            new_version (pulpcore.plugin.models.RepositoryVersion) The
+                new repository version that is going to be built.
+
+        Returns:
+            [pulpcore.plugin.stages.Stage][]: The stage following the pipeline stages.
+
+        """
+        return ContentAssociation(new_version, self.mirror)
+
     def create(self):
         """
         Perform the work. This is the long-blocking call where all syncing occurs.
@@ -166,7 +183,7 @@ class DeclarativeVersion:
             with self.repository.new_version() as new_version:
                 loop = asyncio.get_event_loop()
                 stages = self.pipeline_stages(new_version)
-                stages.append(ContentAssociation(new_version, self.mirror))
+                stages.append(self.content_association_stage(new_version))
                 stages.append(EndStage())
                 pipeline = create_pipeline(stages)
                 loop.run_until_complete(pipeline)
@@ -1,3 +1,3 @@
-from pulpcore.app.models.storage import get_tls_path
+from pulpcore.app.models.storage import BULK_DELETE_METHODS, delete_files, get_tls_path
 
-__all__ = ["get_tls_path"]
+__all__ = ["BULK_DELETE_METHODS", "delete_files", "get_tls_path"]
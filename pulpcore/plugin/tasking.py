@@ -12,7 +12,14 @@ from pulpcore.app.tasks import (
 )
 from pulpcore.app.tasks.repository import aadd_and_remove, add_and_remove
 from pulpcore.app.tasks.vulnerability_report import check_content
-from pulpcore.tasking.tasks import adispatch, cancel_task, cancel_task_group, dispatch
+from pulpcore.tasking.tasks import (
+    adispatch,
+    adispatch_many,
+    cancel_task,
+    cancel_task_group,
+    dispatch,
+    dispatch_many,
+)
 
 __all__ = [
     "ageneral_update",
@@ -21,6 +28,8 @@ __all__ = [
     "check_content",
     "dispatch",
     "adispatch",
+    "dispatch_many",
+    "adispatch_many",
     "fs_publication_export",
     "fs_repo_version_export",
     "general_create",
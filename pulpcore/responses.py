@@ -1,13 +1,113 @@
 import asyncio
+import os
+import stat
+import threading
+import time
+from collections import OrderedDict
 
 from aiohttp import hdrs
-from aiohttp.web import StreamResponse
+from aiohttp.web import FileResponse, StreamResponse
 from aiohttp.web_exceptions import (
+    HTTPForbidden,
+    HTTPNotFound,
     HTTPPartialContent,
     HTTPRequestRangeNotSatisfiable,
 )
+from django.conf import settings
+from django.db.models.signals import post_delete
 
 from pulpcore.app.models import Artifact
+from pulpcore.metrics import open_file_cache_counter
+
+
+def _set_range(response, request, file_size, use_range=True):
+    """
+    Set the status and headers of a response sending the requested range of a file.
+
+    Args:
+        response (aiohttp.web.StreamResponse): The response to prepare.
+        request (aiohttp.web.Request): The request to respond to.
+        file_size (int): The size of the file.
+        use_range (bool): Whether the Range header of the request applies.
+
+    Returns:
+        tuple: The offset and the number of bytes to send, or None if the range is not
+            satisfiable.
+    """
+    status = response.status
+    count = file_size
+
+    start = None
+
+    if use_range:
+        try:
+            rng = request.http_range
+            start = rng.start
+            end = rng.stop
+        except ValueError:
+            # https://tools.ietf.org/html/rfc7233:
+            # A server generating a 416 (Range Not Satisfiable) response to
+            # a byte-range request SHOULD send a Content-Range header field
+            # with an unsatisfied-range value.
+            # The complete-length in a 416 response indicates the current
+            # length of the selected representation.
+            #
+            # Will do the same below. Many servers ignore this and do not
+            # send a Content-Range header with HTTP 416
+            response.headers[hdrs.CONTENT_RANGE] = f"bytes */{file_size}"
+            response.set_status(HTTPRequestRangeNotSatisfiable.status_code)
+            return None
+
+        # If a range request has been made, convert start, end slice
+        # notation into file pointer offset and count
+        if start is not None or end is not None:
+            if start < 0 and end is None:  # return tail of file
+                start += file_size
+                if start < 0:
+                    # if Range:bytes=-1000 in request header but file size
+                    # is only 200, there would be trouble without this
+                    start = 0
+                count = file_size - start
+            else:
+                # rfc7233:If the last-byte-pos value is
+                # absent, or if the value is greater than or equal to
+                # the current length of the representatin data,
+                # the byte range is interpreted as the remainder
+                # of the representation (i.e., the server replaces the
+                # value of last-byte-pos with a value that is one less than
+                # the current length of the selected representation).
+                count = min(end if end is not None else file_size, file_size) - start
+
+            if start >= file_size:
+                # HTTP 416 should be returned in this case.
+                #
+                # According to https://tools.ietf.org/html/rfc7233:
+                # If a valid byte-range-set includes at least one
+                # byte-range-spec with a first-byte-pos that is less than
+                # the current length of the representation, or at least one
+                # suffix-byte-range-spec with a non-zero suffix-length,
+                # then the byte-range-set is satisfiable. Otherwise, the
+                # byte-range-set is unsatisfiable.
+                response.headers[hdrs.CONTENT_RANGE] = f"bytes */{file_size}"
+                response.set_status(HTTPRequestRangeNotSatisfiable.status_code)
+                return None
+
+            status = HTTPPartialContent.status_code
+            # Even though you are sending the whole file, you should still
+            # return a HTTP 206 for a Range request.
+            response.set_status(status)
+
+    response.content_length = count
+
+    response.headers[hdrs.ACCEPT_RANGES] = "bytes"
+
+    if status == HTTPPartialContent.status_code:
+        response.headers[hdrs.CONTENT_RANGE] = "bytes {}-{}/{}".format(
+            start, start + count - 1, file_size
+        )
+
+    # be aware that start could be None or int=0 here.
+    return start or 0, count
 
 
 class ArtifactResponse(StreamResponse):
@@ -67,90 +167,319 @@ class ArtifactResponse(StreamResponse):
         if hdrs.CONTENT_TYPE not in self.headers:
             self.content_type = "application/octet-stream"
 
-        status = self._status
         file_size = self._file.size
-        count = file_size
-
-        start = None
-
-        ifrange = request.if_range
-        if ifrange is None:
-            try:
-                rng = request.http_range
-                start = rng.start
-                end = rng.stop
-            except ValueError:
-                # https://tools.ietf.org/html/rfc7233:
-                # A server generating a 416 (Range Not Satisfiable) response to
-                # a byte-range request SHOULD send a Content-Range header field
-                # with an unsatisfied-range value.
-                # The complete-length in a 416 response indicates the current
-                # length of the selected representation.
-                #
-                # Will do the same below. Many servers ignore this and do not
-                # send a Content-Range header with HTTP 416
-                self.headers[hdrs.CONTENT_RANGE] = f"bytes */{file_size}"
-                self.set_status(HTTPRequestRangeNotSatisfiable.status_code)
-                return await super().prepare(request)
-
-            # If a range request has been made, convert start, end slice
-            # notation into file pointer offset and count
-            if start is not None or end is not None:
-                if start < 0 and end is None:  # return tail of file
-                    start += file_size
-                    if start < 0:
-                        # if Range:bytes=-1000 in request header but file size
-                        # is only 200, there would be trouble without this
-                        start = 0
-                    count = file_size - start
-                else:
-                    # rfc7233:If the last-byte-pos value is
-                    # absent, or if the value is greater than or equal to
-                    # the current length of the representatin data,
-                    # the byte range is interpreted as the remainder
-                    # of the representation (i.e., the server replaces the
-                    # value of last-byte-pos with a value that is one less than
-                    # the current length of the selected representation).
-                    count = min(end if end is not None else file_size, file_size) - start
-
-                if start >= file_size:
-                    # HTTP 416 should be returned in this case.
-                    #
-                    # According to https://tools.ietf.org/html/rfc7233:
-                    # If a valid byte-range-set includes at least one
-                    # byte-range-spec with a first-byte-pos that is less than
-                    # the current length of the representation, or at least one
-                    # suffix-byte-range-spec with a non-zero suffix-length,
-                    # then the byte-range-set is satisfiable. Otherwise, the
-                    # byte-range-set is unsatisfiable.
-                    self.headers[hdrs.CONTENT_RANGE] = f"bytes */{file_size}"
-                    self.set_status(HTTPRequestRangeNotSatisfiable.status_code)
-                    return await super().prepare(request)
-
-                status = HTTPPartialContent.status_code
-                # Even though you are sending the whole file, you should still
-                # return a HTTP 206 for a Range request.
-                self.set_status(status)
-
-        self.content_length = count
-
-        self.headers[hdrs.ACCEPT_RANGES] = "bytes"
-
-        if status == HTTPPartialContent.status_code:
-            self.headers[hdrs.CONTENT_RANGE] = "bytes {}-{}/{}".format(
-                start, start + count - 1, file_size
-            )
+        byte_range = _set_range(self, request, file_size, use_range=request.if_range is None)
+        if byte_range is None:
+            return await super().prepare(request)
+        offset, count = byte_range
 
         # If we are sending 0 bytes calling sendfile() will throw a ValueError
         if count == 0 or request.method == hdrs.METH_HEAD or self.status in [204, 304]:
             return await super().prepare(request)
 
-        if start:  # be aware that start could be None or int=0 here.
-            offset = start
-        else:
-            offset = 0
-
         try:
             return await self._sendfile(request, self._file, offset, count)
         finally:
             await loop.run_in_executor(None, self._file.close)
+
+
+class _OpenFile:
+    """
+    A file descriptor held open by the OpenFileCache, with the stat result of the file.
+    """
+
+    def __init__(self, fd, stat_result):
+        self.fd = fd
+        self.stat = stat_result
+        self.checked = self.used = time.monotonic()
+        self.users = 0
+        self.evicted = False
+
+    def close_if_unused(self):
+        if self.evicted and not self.users:
+            os.close(self.fd)
+
+
+class OpenFileCache:
+    """
+    A bounded LRU cache of the open files served by the content app, by path.
+
+    Serving a cached file needs neither a stat() nor an open(). The files of Artifacts deleted in
+    this process are dropped right away. Files unlinked by other processes are noticed when their
+    entry is revalidated, at most `revalidate_after` seconds after it was last checked, or by
+    `sweep()`. Until then, their disk space is not freed.
+
+    Attributes:
+        size (int): The maximum number of open files.
+        hits (int): The number of lookups served from the cache.
+        misses (int): The number of lookups which had to open or revalidate the file.
+    """
+
+    revalidate_after = 60
+    idle_after = 600
+
+    def __init__(self, size):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._files = OrderedDict()
+        self._lock = threading.Lock()
+        self._connected = False
+
+    def acquire(self, path):
+        """
+        Get a fresh open file from the cache, without blocking.
+
+        The file must be given back with `release()`.
+
+        Returns:
+            _OpenFile: The open file, or None if it has to be opened with `open()`.
+        """
+        path = str(path)
+        with self._lock:
+            open_file = self._files.get(path)
+            if open_file is None or time.monotonic() - open_file.checked > self.revalidate_after:
+                return None
+            self._files.move_to_end(path)
+            open_file.users += 1
+            open_file.used = time.monotonic()
+            self.hits += 1
+        open_file_cache_counter.add(hit=True)
+        return open_file
+
+    def open(self, path):
+        """
+        Open a file, or revalidate its cached entry, and add it to the cache.
+
+        This blocks, so it should be run in an executor. The file must be given back with
+        `release()`.
+
+        Raises:
+            OSError: If the file can not be opened or is not a regular file.
+
+        Returns:
+            _OpenFile: The open file.
+        """
+        path = str(path)
+        with self._lock:
+            self.misses += 1
+            if cached := self._files.get(path):
+                cached.users += 1
+        open_file_cache_counter.add(hit=False)
+        if cached:
+            stat_result = os.fstat(cached.fd)
+            if stat_result.st_nlink:
+                with self._lock:
+                    cached.stat = stat_result
+                    cached.checked = cached.used = time.monotonic()
+                return cached
+            # The file was deleted, a new one may have been saved to the same path.
+            self.release(cached)
+            self.invalidate(path)
+
+        fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+        try:
+            stat_result = os.fstat(fd)
+            if not stat.S_ISREG(stat_result.st_mode):
+                raise IsADirectoryError(path)
+        except BaseException:
+            os.close(fd)
+            raise
+        open_file = _OpenFile(fd, stat_result)
+        open_file.users += 1
+        with self._lock:
+            self._connect_signals()
+            if previous := self._files.pop(path, None):
+                previous.evicted = True
+                previous.close_if_unused()
+            self._files[path] = open_file
+            while len(self._files) > self.size:
+                _, evicted = self._files.popitem(last=False)
+                evicted.evicted = True
+                evicted.close_if_unused()
+        return open_file
+
+    def release(self, open_file):
+        """
+        Give back a file acquired from the cache.
+        """
+        with self._lock:
+            open_file.users -= 1
+            open_file.close_if_unused()
+
+    def invalidate(self, path):
+        """
+        Drop the open file of a path from the cache.
+        """
+        with self._lock:
+            if open_file := self._files.pop(str(path), None):
+                open_file.evicted = True
+                open_file.close_if_unused()
+
+    def sweep(self):
+        """
+        Drop the deleted files and the ones not served for `idle_after` seconds from the cache.
+
+        Artifacts are mostly deleted by the orphan cleanup and reclaim space tasks of the workers.
+        Their files stay open, and keep using disk space, until the content app notices. This
+        revalidates the entries not checked for `revalidate_after` seconds, so the space is freed
+        even if the files are not requested again. It should be called periodically.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for path, open_file in list(self._files.items()):
+                if now - open_file.checked <= self.revalidate_after:
+                    continue
+                stat_result = os.fstat(open_file.fd)
+                if stat_result.st_nlink and now - open_file.used <= self.idle_after:
+                    open_file.stat = stat_result
+                    open_file.checked = now
+                    continue
+                del self._files[path]
+                open_file.evicted = True
+                open_file.close_if_unused()
+
+    def clear(self):
+        """
+        Drop all open files from the cache.
+        """
+        with self._lock:
+            while self._files:
+                _, open_file = self._files.popitem()
+                open_file.evicted = True
+                open_file.close_if_unused()
+
+    def _connect_signals(self):
+        # Only processes serving files listen for deleted Artifacts, the receiver would keep the
+        # other processes from deleting Artifacts in bulk.
+        if not self._connected:
+            post_delete.connect(self._artifact_deleted, sender=Artifact, weak=False)
+            self._connected = True
+
+    def _artifact_deleted(self, sender, instance, **kwargs):
+        try:
+            path = instance.file.path
+        except (NotImplementedError, ValueError):
+            return
+        self.invalidate(path)
+
+
+open_file_cache = OpenFileCache(settings.CONTENT_APP_FILE_CACHE_SIZE)
+
+
+class _OpenFileReader:
+    """
+    A binary file object reading an open file descriptor at its own position.
+    """
+
+    mode = "rb"
+
+    def __init__(self, fd):
+        self._fd = fd
+        self._position = 0
+
+    def fileno(self):
+        return self._fd
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += os.fstat(self._fd).st_size
+        self._position = offset
+        return offset
+
+    def tell(self):
+        return self._position
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = max(os.fstat(self._fd).st_size - self._position, 0)
+        data = os.pread(self._fd, size, self._position)
+        self._position += len(data)
+        return data
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self):
+        pass
+
+
+class CachedFileResponse(FileResponse):
+    """
+    A FileResponse serving the file from the `open_file_cache`.
+
+    The files are sent with sendfile() for full and range responses, like FileResponse does, but
+    a cached file is neither opened nor stat'ed again.
+    """
+
+    def __init__(self, path, *args, cache=None, **kwargs):
+        super().__init__(path, *args, **kwargs)
+        self._cache = cache or open_file_cache
+
+    async def prepare(self, request):
+        open_file = self._cache.acquire(self._path)
+        if open_file is None:
+            loop = asyncio.get_running_loop()
+            try:
+                open_file = await loop.run_in_executor(None, self._cache.open, self._path)
+            except PermissionError:
+                self.set_status(HTTPForbidden.status_code)
+                return await StreamResponse.prepare(self, request)
+            except OSError:
+                self.set_status(HTTPNotFound.status_code)
+                return await StreamResponse.prepare(self, request)
+
+        try:
+            return await self._prepare_cached_file(request, open_file)
+        finally:
+            self._cache.release(open_file)
+
+    async def _prepare_cached_file(self, request, open_file):
+        st = open_file.stat
+        etag_value = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+        # https://www.rfc-editor.org/rfc/rfc9110#section-13.1.1-2
+        if (ifmatch := request.if_match) is not None and not self._etag_match(
+            etag_value, ifmatch, weak=False
+        ):
+            return await self._precondition_failed(request)
+        if (
+            (unmodsince := request.if_unmodified_since) is not None
+            and ifmatch is None
+            and st.st_mtime > unmodsince.timestamp()
+        ):
+            return await self._precondition_failed(request)
+
+        # https://www.rfc-editor.org/rfc/rfc9110#section-13.1.2-2
+        if (ifnonematch := request.if_none_match) is not None and self._etag_match(
+            etag_value, ifnonematch, weak=True
+        ):
+            return await self._not_modified(request, etag_value, st.st_mtime)
+        if (
+            (modsince := request.if_modified_since) is not None
+            and ifnonematch is None
+            and st.st_mtime <= modsince.timestamp()
+        ):
+            return await self._not_modified(request, etag_value, st.st_mtime)
+
+        if hdrs.CONTENT_TYPE not in self.headers:
+            self.content_type = "application/octet-stream"
+        self.etag = etag_value
+        self.last_modified = st.st_mtime
+
+        ifrange = request.if_range
+        use_range = ifrange is None or st.st_mtime <= ifrange.timestamp()
+        byte_range = _set_range(self, request, st.st_size, use_range=use_range)
+        if byte_range is None:
+            return await StreamResponse.prepare(self, request)
+        offset, count = byte_range
+
+        # If we are sending 0 bytes calling sendfile() will throw a ValueError
+        if count == 0 or request.method == hdrs.METH_HEAD or self.status in [204, 304]:
+            return await StreamResponse.prepare(self, request)
+
+        return await self._sendfile(request, _OpenFileReader(open_file.fd), offset, count)
@@ -304,6 +304,7 @@ def dispatch_scheduled_tasks():
                     task_schedule.task_name,
                     args=task_schedule.task_args,
                     kwargs=task_schedule.task_kwargs,
+                    exclusive_resources=task_schedule.exclusive_resources,
                 )
                 task_schedule.save(update_fields=["next_dispatch", "last_task"])
 
@@ -5,6 +5,8 @@ import click
 import django
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pulpcore.app.settings")
+# The API components of the plugins are only imported if a task or content guard needs them.
+os.environ.setdefault("PULP_LAZY_PLUGIN_IMPORTS", "true")
 
 django.setup()
 
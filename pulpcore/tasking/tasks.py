@@ -13,7 +13,7 @@ from gettext import gettext as _
 import aiohttp
 from asgiref.sync import async_to_sync, sync_to_async
 from django.conf import settings
-from django.db import connection
+from django.db import connection, transaction
 from django.db.models import Model
 from django_guid import get_guid
 from rest_framework.exceptions import APIException
@@ -408,6 +408,68 @@ async def adispatch(
     return task
 
 
+def dispatch_many(calls, task_group=None):
+    """
+    Enqueue many deferred tasks to Pulp workers at once.
+
+    All tasks are inserted in bulk within a single transaction and the workers are woken up only
+    once. This is meant for callers that would otherwise call `dispatch()` in a loop, e.g. to
+    dispatch one task per repository. The tasks are never executed immediately.
+
+    Args:
+        calls (list): One dict per task to create, in the order they should be queued. Each dict
+            accepts the keys `func` (required), `args`, `kwargs`, `exclusive_resources`,
+            `shared_resources` and `versions`, which have the same meaning as the arguments of
+            `dispatch()`.
+        task_group (pulpcore.app.models.TaskGroup): A TaskGroup to add all created Tasks to.
+
+    Returns (list[pulpcore.app.models.Task]): The Pulp Tasks that were created.
+
+    Raises:
+        ValueError: When a resource is of an unsupported type.
+    """
+    tasks = []
+    for call, resources in zip(calls, get_batch_resources(calls)):
+        function_name = get_function_name(call["func"])
+        versions = get_version(call.get("versions"), function_name)
+        task_payload = get_task_payload(
+            function_name,
+            task_group,
+            call.get("args"),
+            call.get("kwargs"),
+            resources,
+            versions,
+            False,
+            True,
+            None,
+        )
+        tasks.append(Task(**task_payload))
+    if not tasks:
+        return tasks
+
+    with transaction.atomic():
+        tasks = Task.objects.bulk_create(tasks)
+        # The database assigns the timestamps, which are needed to order the tasks.
+        timestamps = dict(
+            Task.objects.filter(pk__in=[task.pk for task in tasks]).values_list(
+                "pk", "pulp_created"
+            )
+        )
+        for task in tasks:
+            task.pulp_created = timestamps[task.pk]
+            # bulk_create() bypasses the AFTER_CREATE hooks, assign the roles they would.
+            task.add_role_dispatcher()
+            task.add_perms()
+    if settings.WORKER_TYPE != "redis":
+        wakeup_worker(TASK_WAKEUP_UNBLOCK)
+    return tasks
+
+
+async def adispatch_many(calls, task_group=None):
+    """Async version of dispatch_many."""
+    return await sync_to_async(dispatch_many)(calls, task_group=task_group)
+
+
 def get_task_payload(
     function_name, task_group, args, kwargs, resources, versions, immediate, deferred, app_lock
 ):
@@ -509,6 +571,49 @@ def get_resources(exclusive_resources, shared_resources, immediate):
     return colliding_resources, resources
 
 
+def get_batch_resources(calls):
+    """
+    Validate the resources of many calls to `dispatch_many()` at once.
+
+    The domain is looked up once and every distinct model instance is resolved to its PRN only
+    once for the whole batch, as resolving a master model needs to cast it. All calls are
+    validated before any task is created.
+
+    Returns (list[list[str]]): The reserved resources of each call, as `get_resources()` computes
+        them for a deferred task.
+
+    Raises:
+        ValueError: When a resource is of an unsupported type.
+    """
+    domain_prn = get_prn(get_domain())
+    prns = {}
+
+    def validate(resources):
+        resource_set = set()
+        for r in resources or []:
+            if isinstance(r, Model):
+                if r not in prns:
+                    prns[r] = get_prn(r)
+                resource_set.add(prns[r])
+            elif isinstance(r, str):
+                resource_set.add(r)
+            elif r is not None:
+                raise ValueError(_("Must be (str|Model)"))
+        return resource_set
+
+    batch_resources = []
+    for call in calls:
+        exclusive_resources = validate(call.get("exclusive_resources"))
+        shared_resources = validate(call.get("shared_resources"))
+        # A task that is exclusive on a domain will block all tasks within that domain
+        if domain_prn not in exclusive_resources:
+            shared_resources.add(domain_prn)
+        batch_resources.append(
+            list(exclusive_resources) + [f"shared:{resource}" for resource in shared_resources]
+        )
+    return batch_resources
+
+
 def cancel_task(task_id):
     """
     Cancel the task that is represented by the given task_id.
@@ -0,0 +1,38 @@
+import os
+import time
+import tracemalloc
+
+from pulp_file.manifest import Manifest
+
+LINES = int(os.environ.get("MANIFEST_BENCHMARK_LINES", 1000000))
+
+
+def test_manifest_read_write(tmp_path):
+    """
+    Report the time it takes to write and parse a synthetic manifest and the peak memory of the
+    parsing.
+    """
+    manifest = Manifest(tmp_path / "PULP_MANIFEST")
+    rows = ((f"dir/{i % 1000}/file-{i}.txt", f"{i:064x}", i) for i in range(LINES))
+
+    before = time.perf_counter()
+    manifest.write_rows(rows)
+    written = time.perf_counter()
+
+    parsed = sum(len(batch) for batch in manifest.read_batches())
+    read = time.perf_counter()
+
+    # Measure the memory separately, tracing the allocations slows the parsing down.
+    tracemalloc.start()
+    for batch in manifest.read_batches():
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert parsed == LINES
+    print(
+        "\n-> Wrote {lines} manifest lines in {write:.2f}s, parsed them in {read:.2f}s "
+        "with a peak memory of {peak:.1f} MiB".format(
+            lines=LINES, write=written - before, read=read - written, peak=peak / 2**20
+        )
+    )
@@ -0,0 +1,46 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import pytest
+
+RUNS = 5
+
+# Runs in a fresh interpreter, so the measured time includes importing all plugins.
+STARTUP_SCRIPT = """
+import json
+import sys
+import time
+
+before = time.perf_counter()
+import django
+
+django.setup()
+after = time.perf_counter()
+print(json.dumps({"seconds": after - before, "modules": list(sys.modules)}))
+"""
+
+
+def measure_startup(lazy):
+    """Start a fresh interpreter with Django set up and return the time it took and the modules."""
+    env = dict(os.environ, PULP_LAZY_PLUGIN_IMPORTS=str(lazy).lower())
+    env.setdefault("DJANGO_SETTINGS_MODULE", "pulpcore.app.settings")
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT], env=env, capture_output=True, check=True
+    )
+    return json.loads(result.stdout.decode().splitlines()[-1])
+
+
+@pytest.mark.parametrize("lazy", [False, True], ids=["eager", "lazy"])
+def test_startup_time(lazy):
+    """Report the time it takes to set up Django with all installed plugins."""
+    results = [measure_startup(lazy) for _ in range(RUNS)]
+    durations = [result["seconds"] for result in results]
+    print(
+        "\n-> Startup with lazy plugin imports {} => median (s): {:.3f} | min (s): {:.3f}".format(
+            "enabled" if lazy else "disabled", statistics.median(durations), min(durations)
+        )
+    )
+    assert ("pulpcore.app.viewsets" in results[0]["modules"]) is not lazy
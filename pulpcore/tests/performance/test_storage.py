@@ -0,0 +1,166 @@
+import os
+import socket
+import tempfile
+import time
+from unittest.mock import patch
+
+import pytest
+
+from pulpcore.app import pulp_hashlib
+from pulpcore.app.files import HashingFileUploadHandler, TemporaryDownloadedFile
+from pulpcore.app.models import storage
+
+FILES = int(os.environ.get("STORAGE_BENCHMARK_FILES", 100))
+FILE_SIZE = int(os.environ.get("STORAGE_BENCHMARK_FILE_SIZE", 4 * 2**20))
+CHUNK_SIZE = 2**20
+
+
+def artifact_path(sha256):
+    return os.path.join("artifact", sha256[:2], sha256[2:])
+
+
+def s3_stand_in(tmp_path):
+    """
+    A local stand-in for an S3 bucket, served by moto.
+    """
+    pytest.importorskip("boto3")
+    moto_server = pytest.importorskip("moto.server")
+    from storages.backends.s3 import S3Storage
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=port)
+    server.start()
+    backend = S3Storage(
+        access_key="access",
+        secret_key="secret",
+        bucket_name="pulp",
+        endpoint_url=f"http://127.0.0.1:{port}",
+        region_name="us-east-1",
+    )
+    backend.connection.meta.client.create_bucket(Bucket="pulp")
+    return backend, server.stop
+
+
+@pytest.fixture(params=["filesystem", "s3"])
+def backend(request, tmp_path, settings):
+    settings.WORKING_DIRECTORY = str(tmp_path / "working")
+    settings.FILE_UPLOAD_TEMP_DIR = settings.WORKING_DIRECTORY
+    os.makedirs(settings.WORKING_DIRECTORY)
+    if request.param == "filesystem":
+        yield storage.FileSystem(location=str(tmp_path / "media"))
+    else:
+        backend, stop = s3_stand_in(tmp_path)
+        yield backend
+        stop()
+
+
+def downloaded(data, directory):
+    """
+    Write the data like a downloader, hashing it on the way, and return the artifact file.
+    """
+    hasher = pulp_hashlib.new("sha256")
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as writer:
+        for start in range(0, len(data), CHUNK_SIZE):
+            chunk = data[start : start + CHUNK_SIZE]
+            hasher.update(chunk)
+            writer.write(chunk)
+    return hasher.hexdigest(), TemporaryDownloadedFile(open(writer.name, "rb"))
+
+
+def uploaded(data, directory):
+    """
+    Receive the data like an upload to the API, and return the artifact file.
+    """
+    handler = HashingFileUploadHandler()
+    handler.new_file("file", "upload", "application/octet-stream", len(data))
+    for start in range(0, len(data), CHUNK_SIZE):
+        handler.receive_data_chunk(data[start : start + CHUNK_SIZE], start)
+    file = handler.file_complete(len(data))
+    return file.hashers["sha256"].hexdigest(), file
+
+
+def imported(data, directory):
+    """
+    Hash a file extracted outside of the working directory like an import, and return the file.
+    """
+    path = os.path.join(os.path.dirname(directory), "import", os.urandom(8).hex())
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as fp:
+        fp.write(data)
+    hasher = pulp_hashlib.new("sha256")
+    with open(path, "rb") as fp:
+        while chunk := fp.read(CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest(), TemporaryDownloadedFile(open(path, "rb"))
+
+
+def ingest(backend, path, settings):
+    """
+    Put FILES files into the storage through one of the artifact ingest paths.
+
+    Returns:
+        tuple: The seconds the whole ingest took, the seconds spent saving the files to the
+            storage and the names of the files in the storage.
+    """
+    data = [os.urandom(FILE_SIZE) for _ in range(FILES)]
+    names = []
+    saving = 0
+    before = time.perf_counter()
+    for file_data in data:
+        sha256, file = path(file_data, settings.WORKING_DIRECTORY)
+        with file:
+            save_started = time.perf_counter()
+            names.append(backend.save(artifact_path(sha256), file))
+            saving += time.perf_counter() - save_started
+    return time.perf_counter() - before, saving, names
+
+
+def report(path, backend_name, seconds, saving):
+    print(
+        "\n-> Ingested {files} files of {size:.1f} MiB via {path} into {backend} in {seconds:.2f}s "
+        "({throughput:.0f} MiB/s), {saving:.2f}s of it saving to the storage".format(
+            files=FILES,
+            size=FILE_SIZE / 2**20,
+            path=path,
+            backend=backend_name,
+            seconds=seconds,
+            throughput=FILES * FILE_SIZE / 2**20 / seconds,
+            saving=saving,
+        )
+    )
+
+
+@pytest.mark.parametrize("path", [downloaded, uploaded, imported])
+def test_artifact_ingest(backend, path, settings):
+    """
+    Report the time it takes to put files into a storage backend from where Pulp receives them.
+    """
+    seconds, saving, names = ingest(backend, path, settings)
+
+    report(path.__name__, type(backend).__name__, seconds, saving)
+    assert all(backend.size(name) == FILE_SIZE for name in names)
+
+
+def test_filesystem_copy_fast_paths(tmp_path, settings):
+    """
+    Compare the kernel assisted copies of FileSystem storage against reading and writing chunks.
+    """
+    settings.WORKING_DIRECTORY = str(tmp_path / "working")
+    os.makedirs(settings.WORKING_DIRECTORY)
+
+    _, copying, _ = ingest(
+        storage.FileSystem(location=str(tmp_path / "copied")), imported, settings
+    )
+    with patch.object(storage, "_get_fileno", return_value=None):
+        _, chunking, _ = ingest(
+            storage.FileSystem(location=str(tmp_path / "chunked")), imported, settings
+        )
+
+    print(
+        "\n-> Saved {files} files of {size:.1f} MiB with kernel copies in {copying:.2f}s, "
+        "reading and writing chunks in {chunking:.2f}s".format(
+            files=FILES, size=FILE_SIZE / 2**20, copying=copying, chunking=chunking
+        )
+    )
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import time
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from pulpcore.app.models import ProgressReport
+from pulpcore.app.tasks.vulnerability_report import VulnerabilityReportScanner
+
+PACKAGES = int(os.environ.get("VULN_REPORT_BENCHMARK_PACKAGES", 100000))
+# Every n-th package is reported as vulnerable by the stand-in.
+VULNERABLE_EVERY = 100
+
+
+def osv_stand_in():
+    """
+    A local stand-in for the osv.dev `query` and `querybatch` endpoints.
+    """
+    requests = {"query": 0, "querybatch": 0}
+
+    def vulns_for(query):
+        if int(query["version"]) % VULNERABLE_EVERY:
+            return []
+        return [{"id": f"PYSEC-{query['package']['name']}", "modified": "2024-01-01T00:00:00Z"}]
+
+    async def query(request):
+        requests["query"] += 1
+        return web.json_response({"vulns": vulns_for(await request.json())})
+
+    async def querybatch(request):
+        requests["querybatch"] += 1
+        queries = (await request.json())["queries"]
+        return web.json_response({"results": [{"vulns": vulns_for(q)} for q in queries]})
+
+    app = web.Application()
+    app.router.add_post("/v1/query", query)
+    app.router.add_post("/v1/querybatch", querybatch)
+    return app, requests
+
+
+async def noop(*args, **kwargs):
+    pass
+
+
+async def packages():
+    for i in range(PACKAGES):
+        yield {
+            "package": {"name": f"package-{i}", "ecosystem": "PyPI"},
+            "version": str(i),
+            "content": SimpleNamespace(pk=i),
+            "repo_version": None,
+        }
+
+
+@pytest.mark.asyncio
+async def test_vulnerability_report_scan():
+    """
+    Report the time and peak memory it takes to scan many packages against a local osv.dev.
+
+    Writing the reports is left out, so only the fan-out and the osv.dev queries are measured.
+    """
+    app, requests = osv_stand_in()
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    scanner = VulnerabilityReportScanner(
+        asyncio.Semaphore(10),
+        packages(),
+        aiohttp.ClientSession(),
+        query_url=f"http://127.0.0.1:{port}/v1/query",
+        querybatch_url=f"http://127.0.0.1:{port}/v1/querybatch",
+    )
+    try:
+        with (
+            patch.object(scanner, "_get_existing_reports", new=lambda contents: {}),
+            patch.object(scanner, "_save_vulnerability_reports", new=lambda *args: (0, 0)),
+            patch.object(ProgressReport, "asave", new=noop),
+        ):
+            tracemalloc.start()
+            before = time.perf_counter()
+            await scanner.scan_packages()
+            after = time.perf_counter()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    finally:
+        await runner.cleanup()
+
+    assert scanner.total_scanned.done == PACKAGES
+    assert requests["query"] == PACKAGES // VULNERABLE_EVERY
+    print(
+        "\n-> Scanned {packages} packages in {seconds:.2f}s with {requests} requests, "
+        "peak memory {peak:.1f} MiB".format(
+            packages=PACKAGES,
+            seconds=after - before,
+            requests=requests["query"] + requests["querybatch"],
+            peak=peak / 2**20,
+        )
+    )
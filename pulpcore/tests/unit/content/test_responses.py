@@ -0,0 +1,130 @@
+import os
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from pulpcore.responses import CachedFileResponse, OpenFileCache
+
+
+def _is_open(fd):
+    try:
+        os.fstat(fd)
+    except OSError:
+        return False
+    return True
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / name
+        path.write_bytes(name.encode() * 100)
+        paths.append(path)
+    return paths
+
+
+def test_cache_hits_and_misses(files):
+    cache = OpenFileCache(2)
+
+    assert cache.acquire(files[0]) is None
+    open_file = cache.open(files[0])
+    cache.release(open_file)
+    assert cache.acquire(files[0]) is open_file
+    cache.release(open_file)
+
+    assert open_file.stat.st_size == 100
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_evicts_least_recently_used(files):
+    cache = OpenFileCache(2)
+    in_use = cache.open(files[0])
+    cache.release(cache.open(files[1]))
+    evicted = cache.open(files[2])
+
+    assert cache.acquire(files[0]) is None
+    # The evicted file is only closed once it is released.
+    assert _is_open(in_use.fd)
+    cache.release(in_use)
+    assert not _is_open(in_use.fd)
+    cache.release(evicted)
+    cache.clear()
+    assert not _is_open(evicted.fd)
+
+
+def test_cache_revalidates_deleted_files(files, monkeypatch):
+    cache = OpenFileCache(2)
+    open_file = cache.open(files[0])
+    cache.release(open_file)
+    files[0].unlink()
+    files[0].write_bytes(b"new")
+
+    monkeypatch.setattr(cache, "revalidate_after", -1)
+    assert cache.acquire(files[0]) is None
+    reopened = cache.open(files[0])
+
+    assert reopened is not open_file
+    assert reopened.stat.st_size == 3
+    assert open_file.evicted and not open_file.users
+    cache.release(reopened)
+    cache.clear()
+
+
+def test_cache_sweep(files, monkeypatch):
+    cache = OpenFileCache(3)
+    deleted, idle, used = (cache.open(path) for path in files)
+    for open_file in (deleted, idle, used):
+        cache.release(open_file)
+    files[0].unlink()
+
+    cache.sweep()
+    assert cache.acquire(files[0]) is deleted
+    cache.release(deleted)
+
+    monkeypatch.setattr(cache, "revalidate_after", -1)
+    monkeypatch.setattr(cache, "idle_after", 60)
+    idle.used -= 120
+    cache.sweep()
+
+    assert not _is_open(deleted.fd)
+    assert not _is_open(idle.fd)
+    assert _is_open(used.fd)
+    monkeypatch.undo()
+    assert cache.acquire(files[2]) is used
+    assert cache.acquire(files[0]) is None
+    cache.release(used)
+    cache.clear()
+
+
+@pytest_asyncio.fixture
+async def client(aiohttp_client, files):
+    cache = OpenFileCache(2)
+
+    async def serve(request):
+        return CachedFileResponse(files[0], cache=cache)
+
+    app = web.Application()
+    app.router.add_get("/", serve)
+    yield await aiohttp_client(app)
+    cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_cached_file_response(client):
+    response = await client.get("/")
+    assert response.status == 200
+    assert await response.read() == b"a" * 100
+    etag = response.headers["ETag"]
+
+    response = await client.get("/", headers={"Range": "bytes=10-19"})
+    assert response.status == 206
+    assert response.headers["Content-Range"] == "bytes 10-19/100"
+    assert await response.read() == b"a" * 10
+
+    response = await client.get("/", headers={"Range": "bytes=100-"})
+    assert response.status == 416
+
+    response = await client.get("/", headers={"If-None-Match": etag})
+    assert response.status == 304
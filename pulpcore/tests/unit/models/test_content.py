@@ -1,8 +1,10 @@
 from collections import namedtuple
+from uuid import uuid4
 
 import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
 
+from pulpcore.app.models import OrphanCandidate
 from pulpcore.plugin.exceptions import (
     MissingDigestValidationError,
     UnsupportedDigestValidationError,
@@ -14,6 +16,7 @@ from pulpcore.plugin.models import (
     PulpTemporaryFile,
     Remote,
     RemoteArtifact,
+    Repository,
 )
 
 
@@ -178,3 +181,62 @@ def test_remoteartifact_with_forbidden_checksums(remote_artifact_setup):
             remote=remote_artifact_setup.remote,
         )
         ra.validate_checksums()
+
+
+@pytest.fixture
+def artifact(db, tmp_path):
+    artifact_path = tmp_path / "artifact-tmp"
+    artifact_path.write_text(str(uuid4()))
+    artifact = Artifact.init_and_validate(str(artifact_path))
+    artifact.save()
+    return artifact
+
+
+@pytest.fixture
+def repository(db):
+    repository = Repository.objects.create(name=str(uuid4()))
+    repository.CONTENT_TYPES = [Content]
+    return repository
+
+
+def test_orphan_candidate_add(artifact, repository):
+    orphan, used = Content.objects.create(), Content.objects.create()
+    ContentArtifact.objects.create(artifact=artifact, content=used, relative_path="used")
+    used_artifact_pk = artifact.pk
+    with repository.new_version() as version:
+        version.add_content(Content.objects.filter(pk=used.pk))
+
+    for _ in range(2):
+        OrphanCandidate.add_content([orphan.pk, used.pk])
+        OrphanCandidate.add_artifacts([used_artifact_pk])
+
+    candidates = OrphanCandidate.objects.filter(content_id__in=[orphan.pk, used.pk])
+    assert list(candidates.values_list("content_id", flat=True)) == [orphan.pk]
+    assert not OrphanCandidate.objects.filter(artifact_id=used_artifact_pk).exists()
+
+    ContentArtifact.objects.filter(content=used).delete()
+    OrphanCandidate.add_artifacts([used_artifact_pk])
+    OrphanCandidate.add_artifacts([used_artifact_pk])
+    assert OrphanCandidate.objects.filter(artifact_id=used_artifact_pk).count() == 1
+
+
+def test_orphan_candidate_prune(artifact, repository):
+    orphan, reused, deleted = (
+        Content.objects.create(),
+        Content.objects.create(),
+        Content.objects.create(),
+    )
+    OrphanCandidate.add_content([orphan.pk, reused.pk, deleted.pk])
+    OrphanCandidate.add_artifacts([artifact.pk])
+    with repository.new_version() as version:
+        version.add_content(Content.objects.filter(pk=reused.pk))
+    ContentArtifact.objects.create(artifact=artifact, content=reused, relative_path="reused")
+    Content.objects.filter(pk=deleted.pk).delete()
+
+    OrphanCandidate.prune()
+
+    candidates = OrphanCandidate.objects.filter(
+        content_id__in=[orphan.pk, reused.pk, deleted.pk]
+    ).values_list("content_id", flat=True)
+    assert list(candidates) == [orphan.pk]
+    assert not OrphanCandidate.objects.filter(artifact_id=artifact.pk).exists()
@@ -0,0 +1,84 @@
+import hashlib
+import uuid
+
+import pytest
+
+from pulpcore.app.models import Content, ContentArtifact, PublishedArtifact, PublishedMetadata
+
+from pulp_file.app.models import FileContent, FilePublication, FileRepository
+
+
+def create_version(repo, add=(), remove=()):
+    with repo.new_version() as repo_version:
+        for path in add:
+            digest = hashlib.sha256(path.encode()).hexdigest()
+            content = FileContent.objects.create(relative_path=path, digest=digest)
+            ContentArtifact.objects.create(content=content, relative_path=path)
+            repo_version.add_content(Content.objects.filter(pk=content.pk))
+        for path in remove:
+            ca = ContentArtifact.objects.get(relative_path=path)
+            repo_version.remove_content(Content.objects.filter(pk=ca.content_id))
+    return repo_version
+
+
+def publish(repo_version, manifest="PULP_MANIFEST"):
+    publication = FilePublication.objects.create(
+        repository_version=repo_version, complete=True, manifest=manifest
+    )
+    for ca in ContentArtifact.objects.filter(content__in=repo_version.content):
+        PublishedArtifact.objects.create(
+            publication=publication, content_artifact=ca, relative_path=ca.relative_path
+        )
+    metadata = PublishedMetadata.objects.create(relative_path=manifest, publication=publication)
+    ca = ContentArtifact.objects.create(content=metadata, relative_path=manifest)
+    PublishedArtifact.objects.create(
+        publication=publication, content_artifact=ca, relative_path=manifest
+    )
+    return publication
+
+
+def published_paths(publication):
+    return set(publication.published_artifact.values_list("relative_path", flat=True))
+
+
+@pytest.mark.django_db
+class TestCopyFrom:
+    def test_copy_changed_version(self):
+        repo = FileRepository.objects.create(name=f"repo-{uuid.uuid4().hex[:8]}")
+        base = publish(create_version(repo, add=["a.txt", "b.txt"]))
+        repo_version = create_version(repo, add=["c.txt"], remove=["a.txt"])
+        publication = FilePublication.objects.create(repository_version=repo_version)
+
+        assert publication.get_base_publication() == base
+        added, removed = publication.copy_from(base)
+
+        assert [c.cast().relative_path for c in added] == ["c.txt"]
+        assert [c.cast().relative_path for c in removed] == ["a.txt"]
+        # The manifest is stale, so only the kept content is copied.
+        assert published_paths(publication) == {"b.txt"}
+        assert not publication.published_metadata.exists()
+        assert published_paths(base) == {"a.txt", "b.txt", "PULP_MANIFEST"}
+
+    def test_copy_same_version(self):
+        repo = FileRepository.objects.create(name=f"repo-{uuid.uuid4().hex[:8]}")
+        repo_version = create_version(repo, add=["a.txt"])
+        base = publish(repo_version)
+        publication = FilePublication.objects.create(repository_version=repo_version)
+
+        added, removed = publication.copy_from(publication.get_base_publication())
+
+        assert not added.exists() and not removed.exists()
+        assert published_paths(publication) == {"a.txt", "PULP_MANIFEST"}
+        metadata = publication.published_metadata.get()
+        assert metadata.pk != base.published_metadata.get().pk
+        assert metadata.contentartifact_set.get().artifact_id is None
+
+    def test_no_base_publication_of_other_mode(self):
+        repo = FileRepository.objects.create(name=f"repo-{uuid.uuid4().hex[:8]}")
+        repo_version = create_version(repo, add=["a.txt"])
+        publish(repo_version)
+        publication = FilePublication.objects.create(
+            repository_version=repo_version, pass_through=True
+        )
+
+        assert publication.get_base_publication() is None
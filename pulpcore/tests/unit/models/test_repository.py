@@ -3,7 +3,7 @@ from uuid import uuid4
 
 import pytest
 
-from pulpcore.app.models import RepositoryVersionContentDetails
+from pulpcore.app.models import RepositoryVersion, RepositoryVersionContentDetails
 from pulpcore.plugin.models import Artifact, Content, ContentArtifact, Repository
 from pulpcore.plugin.repo_version_utils import validate_version_paths
 
@@ -788,3 +788,37 @@ def test_batch_operations_preserve_correctness(repository, db):
     assert rvcd_qs.get(count_type=RepositoryVersionContentDetails.PRESENT).count == 40
     assert rvcd_qs.filter(count_type=RepositoryVersionContentDetails.ADDED).first() is None
     assert rvcd_qs.get(count_type=RepositoryVersionContentDetails.REMOVED).count == 60
+
+
+def test_cleanup_old_versions_squashes_range(
+    repository, add_content, remove_content, verify_content_sets
+):
+    """Verify that retention squashes all expired versions into the oldest kept one."""
+    with repository.new_version() as version1:
+        add_content(version1, [1, 1, 1, 0, 0])
+    with repository.new_version() as version2:
+        add_content(version2, [0, 0, 0, 1, 0])
+        remove_content(version2, [0, 1, 0, 0, 0])
+    with repository.new_version() as version3:
+        add_content(version3, [0, 1, 0, 0, 0])
+        remove_content(version3, [0, 0, 1, 0, 0])
+    with repository.new_version() as version4:
+        remove_content(version4, [0, 0, 0, 1, 0])
+
+    repository.retain_repo_versions = 2
+    repository.cleanup_old_versions()
+
+    assert list(repository.versions.values_list("number", flat=True).order_by("number")) == [3, 4]
+    verify_content_sets(version3, [1, 1, 0, 1, 0], [1, 1, 0, 1, 0], [0, 0, 0, 0, 0])
+    verify_content_sets(version4, [1, 1, 0, 0, 0], [0, 0, 0, 0, 0], [0, 0, 0, 1, 0])
+
+
+def test_added_and_removed_of_large_versions():
+    """Large versions are compared through a subquery rather than a parameter per content."""
+    version = RepositoryVersion(pk=uuid4(), content_ids=[uuid4() for _ in range(65535)])
+    base_version = RepositoryVersion(pk=uuid4(), content_ids=[uuid4()])
+
+    for queryset in (version.added(base_version), version.removed(base_version)):
+        sql, params = queryset.query.sql_with_params()
+        assert "unnest" in sql
+        assert len(params) < 10
@@ -0,0 +1,80 @@
+import sys
+
+import pytest
+
+from pulpcore.app.models import SigningService
+
+SCRIPT = """#!{python}
+import json
+import sys
+
+with open({runs!r}, "a") as runs:
+    runs.write(" ".join(sys.argv[1:2]) + "\\n")
+
+def sign(filename):
+    if filename.endswith("bad"):
+        return {{"error": "Failed to sign " + filename}}
+    return {{"file": filename, "signature": filename + ".asc"}}
+
+if sys.argv[1] != "--batch":
+    print(json.dumps(sign(sys.argv[1])))
+elif {batch}:
+    for line in sys.stdin:
+        print(json.dumps(sign(line.rstrip("\\n"))), flush=True)
+else:
+    sys.exit("batch mode is not supported")
+"""
+
+
+@pytest.fixture
+def signing_service(tmp_path, settings):
+    settings.SIGNING_SERVICE_CONCURRENCY = 2
+
+    def _signing_service(batch=True, script_batch=True):
+        script = tmp_path / "sign.py"
+        script.write_text(
+            SCRIPT.format(python=sys.executable, runs=str(tmp_path / "runs"), batch=script_batch)
+        )
+        script.chmod(0o755)
+        return SigningService(name="sign", script=str(script), batch=batch)
+
+    return _signing_service
+
+
+def runs(tmp_path):
+    return (tmp_path / "runs").read_text().splitlines()
+
+
+def test_sign_many_batch(signing_service, tmp_path):
+    filenames = [f"file-{i}" for i in range(10)]
+
+    return_values = signing_service().sign_many(filenames)
+
+    assert return_values == [{"file": name, "signature": f"{name}.asc"} for name in filenames]
+    assert runs(tmp_path) == ["--batch", "--batch"]
+
+
+def test_sign_many_one_shot(signing_service, tmp_path):
+    filenames = [f"file-{i}" for i in range(3)]
+
+    return_values = signing_service(batch=False).sign_many(filenames)
+
+    assert [return_value["file"] for return_value in return_values] == filenames
+    assert sorted(runs(tmp_path)) == filenames
+
+
+def test_sign_many_falls_back_to_one_shot(signing_service, tmp_path):
+    filenames = [f"file-{i}" for i in range(3)]
+    service = signing_service(script_batch=False)
+
+    return_values = service.sign_many(filenames)
+
+    assert [return_value["file"] for return_value in return_values] == filenames
+    assert runs(tmp_path).count("--batch") == 2
+    with pytest.raises(RuntimeError, match="batch mode is not supported"):
+        service.sign_many(filenames, fallback=False)
+
+
+def test_sign_many_error(signing_service):
+    with pytest.raises(RuntimeError, match="Failed to sign file-bad"):
+        signing_service().sign_many(["file-1", "file-bad"])
@@ -0,0 +1,164 @@
+import errno
+import gzip
+import os
+import tempfile
+from unittest import mock
+
+import pytest
+from django.core.files import File
+
+from pulpcore.app.files import TemporaryDownloadedFile
+from pulpcore.app.models import storage
+
+
+def _domain(storage_class, backend):
+    domain = mock.Mock(storage_class=storage_class)
+    domain.get_storage.return_value = backend
+    return domain
+
+
+def test_delete_files_threaded(tmp_path):
+    backend = storage.FileSystem(location=str(tmp_path))
+    for name in ("artifact/aa/1", "artifact/bb/2"):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"content")
+    domain = _domain("pulpcore.app.models.storage.FileSystem", backend)
+
+    failed = storage.delete_files(domain, ["artifact/aa/1", "artifact/bb/2", "artifact/cc/3"])
+
+    assert failed == []
+    assert not (tmp_path / "artifact/aa/1").exists()
+    assert not (tmp_path / "artifact/bb/2").exists()
+
+
+def test_delete_files_threaded_reports_failures():
+    def _delete(name):
+        if name == "a":
+            raise OSError("permission denied")
+
+    backend = mock.Mock()
+    backend.delete.side_effect = _delete
+    domain = _domain("storages.backends.gcloud.GoogleCloudStorage", backend)
+
+    assert storage.delete_files(domain, ["a", "b"]) == ["a"]
+    assert backend.delete.call_count == 2
+
+
+def test_delete_files_s3_batches(monkeypatch):
+    pytest.importorskip("storages")
+    monkeypatch.setitem(
+        storage.BULK_DELETE_METHODS,
+        "storages.backends.s3.S3Storage",
+        (storage._delete_s3_objects, 2),
+    )
+    backend = mock.Mock()
+    backend._normalize_name.side_effect = lambda name: "prefix/" + name
+    backend.bucket.delete_objects.side_effect = [
+        {},
+        {"Errors": [{"Key": "prefix/c", "Code": "AccessDenied"}]},
+    ]
+    domain = _domain("storages.backends.s3.S3Storage", backend)
+
+    failed = storage.delete_files(domain, ["a", "b", "c"])
+
+    assert failed == ["c"]
+    calls = backend.bucket.delete_objects.call_args_list
+    assert len(calls) == 2
+    assert calls[0].kwargs["Delete"]["Objects"] == [{"Key": "prefix/a"}, {"Key": "prefix/b"}]
+    assert calls[1].kwargs["Delete"]["Objects"] == [{"Key": "prefix/c"}]
+    backend.delete.assert_not_called()
+
+
+def test_delete_files_azure_batch():
+    response = mock.Mock
+    backend = mock.Mock()
+    backend._get_valid_path.side_effect = lambda name: name
+    backend.client.delete_blobs.return_value = iter(
+        [response(status_code=202), response(status_code=404), response(status_code=403)]
+    )
+    domain = _domain("storages.backends.azure_storage.AzureStorage", backend)
+
+    assert storage.delete_files(domain, ["a", "b", "c"]) == ["c"]
+    backend.client.delete_blobs.assert_called_once_with("a", "b", "c", raise_on_any_failure=False)
+
+
+def test_delete_files_nothing_to_do():
+    domain = mock.Mock()
+    assert storage.delete_files(domain, []) == []
+    domain.get_storage.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "unsupported,method",
+    [
+        ((), None),
+        (("ioctl",), None),
+        (("ioctl", "copy_file_range"), "sendfile"),
+        (("ioctl", "copy_file_range", "sendfile"), "read"),
+    ],
+)
+def test_copy_file_fallbacks(tmp_path, monkeypatch, unsupported, method):
+    def _unsupported(*args):
+        raise OSError(errno.EXDEV, "unsupported")
+
+    for name in unsupported:
+        module = storage.fcntl if name == "ioctl" else storage.os
+        monkeypatch.setattr(module, name, _unsupported)
+    data = os.urandom(3 * storage.COPY_CHUNK_SIZE + 1)
+    (tmp_path / "source").write_bytes(data)
+
+    with open(tmp_path / "source", "rb") as source, open(tmp_path / "copy", "wb") as destination:
+        used = storage.copy_file(source.fileno(), destination.fileno())
+
+    assert (tmp_path / "copy").read_bytes() == data
+    if method:
+        assert used == method
+
+
+def test_save_copies_files_outside_working_directory(tmp_path, settings):
+    settings.WORKING_DIRECTORY = str(tmp_path / "working")
+    backend = storage.FileSystem(location=str(tmp_path / "media"))
+    (tmp_path / "source").write_bytes(b"content")
+
+    with open(tmp_path / "source", "rb") as source:
+        name = backend.save("artifact/aa/bb", File(source))
+
+    assert (tmp_path / "media" / name).read_bytes() == b"content"
+    assert (tmp_path / "source").exists()
+
+
+def test_save_moves_files_in_working_directory(tmp_path, settings):
+    settings.WORKING_DIRECTORY = str(tmp_path)
+    backend = storage.FileSystem(location=str(tmp_path / "media"))
+    (tmp_path / "source").write_bytes(b"content")
+
+    name = backend.save("artifact/aa/bb", TemporaryDownloadedFile(open(tmp_path / "source", "rb")))
+
+    assert (tmp_path / "media" / name).read_bytes() == b"content"
+    assert not (tmp_path / "source").exists()
+
+
+def test_get_fileno(tmp_path):
+    (tmp_path / "source").write_bytes(b"content")
+
+    with open(tmp_path / "source", "rb") as source:
+        assert storage._get_fileno(File(source)) == source.fileno()
+        assert storage._get_fileno(TemporaryDownloadedFile(source)) == source.fileno()
+    with tempfile.NamedTemporaryFile(dir=tmp_path) as temp_file:
+        assert storage._get_fileno(File(temp_file)) == temp_file.fileno()
+    with open(tmp_path / "source") as source:
+        assert storage._get_fileno(File(source)) is None
+
+
+def test_save_compressed_file(tmp_path, settings):
+    settings.WORKING_DIRECTORY = str(tmp_path / "working")
+    backend = storage.FileSystem(location=str(tmp_path / "media"))
+    with gzip.open(tmp_path / "source.gz", "wb") as compressed:
+        compressed.write(b"content" * 1000)
+
+    with gzip.open(tmp_path / "source.gz", "rb") as source:
+        assert storage._get_fileno(File(source)) is None
+        name = backend.save("artifact/aa/bb", File(source))
+
+    assert (tmp_path / "media" / name).read_bytes() == b"content" * 1000
@@ -1,6 +1,9 @@
 import sys
+import uuid
+from unittest import mock
 
 import pytest
+from django.utils import timezone
 
 from pulpcore.app.models import AppStatus, ProgressReport, Task
 from pulpcore.constants import TASK_STATES
@@ -46,3 +49,48 @@ def test_report_state_changes(monkeypatch, to_state, use_canceled):
             assert to_state == report.state
         else:
             assert state == report.state
+
+
+def test_progress_updates_are_batched_per_task(monkeypatch):
+    bulk_update = mock.Mock()
+    monkeypatch.setattr(ProgressReport.objects, "bulk_update", bulk_update)
+    monkeypatch.setattr(ProgressReport, "BATCH_INTERVAL", 60000)
+    task_id = uuid.uuid4()
+    reports = []
+    for code in ("download", "save"):
+        report = ProgressReport(message=code, code=code, task_id=task_id, pulp_id=uuid.uuid4())
+        report._using_context_manager = True
+        report._last_save_time = timezone.now()
+        reports.append(report)
+
+    for _ in range(3):
+        for report in reports:
+            report.increment()
+    bulk_update.assert_not_called()
+
+    ProgressReport.flush_pending(task_id)
+    bulk_update.assert_called_once()
+    assert bulk_update.call_args.args[0] == reports
+    assert [report.done for report in bulk_update.call_args.args[0]] == [3, 3]
+
+    # Nothing left to write once the task finished.
+    ProgressReport.flush_pending(task_id)
+    bulk_update.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_progress_updates_written_when_task_finishes(monkeypatch):
+    monkeypatch.setattr(AppStatus.objects, "_current_app_status", None)
+    app_status = AppStatus.objects.create(app_type="worker", name="test_runner")
+    task = Task.objects.create(name="test", state=TASK_STATES.RUNNING, app_lock=app_status)
+    report = ProgressReport(message="test", code="test", task=task)
+    report.save()
+
+    report.__enter__()
+    report.increase_by(5)
+    assert ProgressReport.objects.get(pk=report.pk).done == 0
+
+    task.set_completed()
+    report = ProgressReport.objects.get(pk=report.pk)
+    assert report.done == 5
+    assert report.state == TASK_STATES.COMPLETED
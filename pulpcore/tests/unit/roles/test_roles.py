@@ -159,3 +159,19 @@ def test_get_users_with_perms_attached_roles(user, group, repository, role1):
     remove_role("role1", group, repository)
     result = get_users_with_perms_attached_roles(repository)
     assert user not in result
+
+
+def test_get_objects_for_user_after_role_changes(user, group, repository, repository2, role1):
+    def visible_repositories():
+        qs = get_objects_for_user(user, "core.view_repository", Repository.objects.all())
+        return set(qs.values_list("pk", flat=True))
+
+    assert visible_repositories() == set()
+    assign_role("role1", user, repository)
+    assert visible_repositories() == {repository.pk}
+    assign_role("role1", group)
+    assert visible_repositories() == {repository.pk, repository2.pk}
+    remove_role("role1", group)
+    assert visible_repositories() == {repository.pk}
+    remove_role("role1", user, repository)
+    assert visible_repositories() == set()
@@ -15,3 +15,13 @@ def test_orphan_protection_time(value):
 
     with pytest.raises(serializers.ValidationError):
         serializer.is_valid(raise_exception=True)
+
+
+def test_incremental_defaults_to_false():
+    serializer = OrphansCleanupSerializer(data={})
+    serializer.is_valid(raise_exception=True)
+    assert serializer.validated_data["incremental"] is False
+
+    serializer = OrphansCleanupSerializer(data={"incremental": True})
+    serializer.is_valid(raise_exception=True)
+    assert serializer.validated_data["incremental"] is True
@@ -0,0 +1,98 @@
+from unittest import mock
+from uuid import uuid4
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from pulpcore.app.contexts import with_user
+from pulpcore.app.models import Task, TaskGroup
+from pulpcore.app.models.role import UserRole
+from pulpcore.constants import TASK_STATES
+from pulpcore.tasking import tasks
+
+
+@pytest.fixture
+def wakeup_worker(monkeypatch):
+    wakeup_worker = mock.Mock()
+    monkeypatch.setattr(tasks, "wakeup_worker", wakeup_worker)
+    return wakeup_worker
+
+
+@pytest.fixture
+def user(db):
+    user = get_user_model().objects.create(username=str(uuid4()))
+    with with_user(user):
+        yield user
+
+
+@pytest.mark.django_db
+def test_dispatch_many(user, wakeup_worker):
+    resource = str(uuid4())
+    task_group = TaskGroup.objects.create(description="dispatch_many")
+    calls = [
+        {
+            "func": "pulpcore.app.tasks.base.general_delete",
+            "args": (i,),
+            "exclusive_resources": [f"{resource}-{i}"],
+            "shared_resources": [resource],
+        }
+        for i in range(3)
+    ]
+
+    dispatched = tasks.dispatch_many(calls, task_group=task_group)
+
+    queued = list(Task.objects.filter(task_group=task_group).order_by("pulp_created"))
+    assert [task.pk for task in queued] == [task.pk for task in dispatched]
+    assert [task.pulp_created for task in queued] == [task.pulp_created for task in dispatched]
+    for i, task in enumerate(queued):
+        assert task.state == TASK_STATES.WAITING
+        assert task.enc_args == [i]
+        assert f"{resource}-{i}" in task.reserved_resources_record
+        assert f"shared:{resource}" in task.reserved_resources_record
+    wakeup_worker.assert_called_once_with(tasks.TASK_WAKEUP_UNBLOCK)
+    roles = UserRole.objects.filter(user=user, role__name="core.task_user_dispatcher")
+    assert set(roles.values_list("object_id", flat=True)) == {str(task.pk) for task in queued}
+
+
+@pytest.mark.django_db
+def test_dispatch_many_nothing(wakeup_worker):
+    assert tasks.dispatch_many([]) == []
+    wakeup_worker.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_dispatch_many_resources_resolved_once(wakeup_worker, monkeypatch):
+    get_prn = mock.Mock(wraps=tasks.get_prn)
+    monkeypatch.setattr(tasks, "get_prn", get_prn)
+    task_group = TaskGroup.objects.create(description="dispatch_many")
+    calls = [
+        {
+            "func": "pulpcore.app.tasks.base.general_delete",
+            "exclusive_resources": [str(i)],
+            "shared_resources": [task_group, None],
+        }
+        for i in range(3)
+    ]
+
+    dispatched = tasks.dispatch_many(calls)
+
+    # Once for the domain and once for the task group.
+    assert get_prn.call_count == 2
+    for i, task in enumerate(dispatched):
+        assert str(i) in task.reserved_resources_record
+        assert f"shared:{tasks.get_prn(task_group)}" in task.reserved_resources_record
+
+
+@pytest.mark.django_db
+def test_dispatch_many_invalid_resource(wakeup_worker):
+    resource = str(uuid4())
+    calls = [
+        {"func": "pulpcore.app.tasks.base.general_delete", "exclusive_resources": [resource]},
+        {"func": "pulpcore.app.tasks.base.general_delete", "exclusive_resources": [1]},
+    ]
+
+    with pytest.raises(ValueError):
+        tasks.dispatch_many(calls)
+
+    assert not Task.objects.filter(reserved_resources_record__contains=[resource]).exists()
+    wakeup_worker.assert_not_called()
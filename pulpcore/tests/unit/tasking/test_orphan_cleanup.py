@@ -0,0 +1,54 @@
+from datetime import timedelta
+from unittest import mock
+from uuid import uuid4
+
+import pytest
+from django.utils import timezone
+
+from pulpcore.app.contexts import with_task_context
+from pulpcore.app.models import Content, OrphanCandidate, Task, TaskSchedule
+from pulpcore.app.tasks.orphan import orphan_cleanup
+from pulpcore.app.util import configure_cleanup, get_domain
+from pulpcore.constants import TASK_STATES
+from pulpcore.tasking import _util, tasks
+
+
+@pytest.fixture
+def task(db):
+    task = Task.objects.create(name=str(uuid4()), state=TASK_STATES.RUNNING)
+    with with_task_context(task):
+        yield task
+
+
+def test_incremental_orphan_cleanup(task):
+    candidate, orphan = Content.objects.create(), Content.objects.create()
+    OrphanCandidate.add_content([candidate.pk])
+
+    orphan_cleanup(orphan_protection_time=0, incremental=True)
+
+    assert not Content.objects.filter(pk=candidate.pk).exists()
+    assert Content.objects.filter(pk=orphan.pk).exists()
+    assert not OrphanCandidate.objects.filter(content_id=candidate.pk).exists()
+
+    orphan_cleanup(orphan_protection_time=0)
+
+    assert not Content.objects.filter(pk=orphan.pk).exists()
+
+
+@pytest.mark.django_db
+def test_scheduled_orphan_cleanups_are_exclusive(monkeypatch, settings):
+    monkeypatch.setattr(tasks, "wakeup_worker", mock.Mock())
+    settings.ORPHAN_PROTECTION_TIME = 1440
+    settings.ORPHAN_FULL_SWEEP_INTERVAL = 10080
+    configure_cleanup()
+    schedules = TaskSchedule.objects.filter(task_name="pulpcore.app.tasks.orphan.orphan_cleanup")
+    assert sorted((schedule.task_kwargs for schedule in schedules), key=len) == [
+        {},
+        {"incremental": True},
+    ]
+    schedules.update(next_dispatch=timezone.now() - timedelta(minutes=1))
+
+    _util.dispatch_scheduled_tasks()
+
+    for schedule in schedules:
+        assert schedule.last_task.reserved_resources_record == [f"pdrn:{get_domain().pk}:orphans"]
@@ -0,0 +1,48 @@
+import sys
+from uuid import uuid4
+
+import pytest
+from django.utils import timezone
+
+from pulpcore.app.contexts import with_task_context
+from pulpcore.app.models import CreatedResource, ProgressReport, Task, TaskGroup
+from pulpcore.app.tasks.purge import purge
+from pulpcore.constants import TASK_STATES
+
+
+@pytest.fixture
+def purge_task(db):
+    task = Task.objects.create(name=str(uuid4()), state=TASK_STATES.RUNNING)
+    with with_task_context(task):
+        yield task
+
+
+def create_task(state, finished_at=None):
+    task = Task.objects.create(name=str(uuid4()), state=state, finished_at=finished_at)
+    for i in range(2):
+        ProgressReport.objects.create(message=str(i), code=str(i), task=task)
+    CreatedResource.objects.create(
+        task=task, content_object=TaskGroup.objects.create(description=str(uuid4()))
+    )
+    return task
+
+
+def test_purge_related_objects(purge_task, monkeypatch):
+    # The purge function shadows its module in pulpcore.app.tasks.
+    monkeypatch.setattr(sys.modules[purge.__module__], "DELETE_LIMIT", 2)
+    finished = [create_task(TASK_STATES.COMPLETED, timezone.now()) for _ in range(3)]
+    running = create_task(TASK_STATES.RUNNING)
+    finished_pks = [task.pk for task in finished]
+
+    purge(finished_before=timezone.now(), user_pk=None)
+
+    assert not Task.objects.filter(pk__in=finished_pks).exists()
+    assert not ProgressReport.objects.filter(task_id__in=finished_pks).exists()
+    assert not CreatedResource.objects.filter(task_id__in=finished_pks).exists()
+    assert ProgressReport.objects.filter(task=running).count() == 2
+    assert CreatedResource.objects.filter(task=running).count() == 1
+    reports = purge_task.progress_reports.filter(code__startswith="purge.tasks.key.")
+    done = dict(reports.values_list("code", "done"))
+    assert done["purge.tasks.key.core.Task"] == 3
+    assert done["purge.tasks.key.core.ProgressReport"] == 6
+    assert done["purge.tasks.key.core.CreatedResource"] == 3
@@ -0,0 +1,80 @@
+from uuid import uuid4
+
+import pytest
+
+from pulpcore.app.contexts import with_task_context
+from pulpcore.app.models import Task
+from pulpcore.app.models.content import ArtifactQuerySet
+from pulpcore.app.tasks.reclaim_space import reclaim_space
+from pulpcore.constants import TASK_STATES
+from pulpcore.plugin.models import (
+    Artifact,
+    Content,
+    ContentArtifact,
+    Remote,
+    RemoteArtifact,
+    Repository,
+)
+
+
+@pytest.fixture
+def task(db):
+    task = Task.objects.create(name=str(uuid4()), state=TASK_STATES.RUNNING)
+    with with_task_context(task):
+        yield task
+
+
+@pytest.fixture
+def repository(task):
+    repository = Repository.objects.create(name=str(uuid4()))
+    repository.CONTENT_TYPES = [Content]
+    return repository
+
+
+def create_artifact(tmp_path):
+    artifact_path = tmp_path / str(uuid4())
+    artifact_path.write_text(str(uuid4()))
+    artifact = Artifact.init_and_validate(str(artifact_path))
+    artifact.save()
+    return artifact
+
+
+def test_reclaim_space_artifact_used_again(task, repository, tmp_path, monkeypatch):
+    remote = Remote.objects.create(name=str(uuid4()), url="http://example.com/")
+    artifacts = [create_artifact(tmp_path) for _ in range(2)]
+    content_pks = []
+    for artifact in artifacts:
+        content = Content.objects.create()
+        content_artifact = ContentArtifact.objects.create(
+            artifact=artifact, content=content, relative_path=str(artifact.pk)
+        )
+        RemoteArtifact.objects.create(
+            url=f"http://example.com/{artifact.pk}",
+            sha256=artifact.sha256,
+            content_artifact=content_artifact,
+            remote=remote,
+        )
+        content_pks.append(content.pk)
+    with repository.new_version() as version:
+        version.add_content(Content.objects.filter(pk__in=content_pks))
+
+    delete_with_files = ArtifactQuerySet.delete_with_files
+
+    def use_artifact_again(self, domain):
+        # Another task starts using the second artifact while the batch is reclaimed.
+        monkeypatch.setattr(ArtifactQuerySet, "delete_with_files", delete_with_files)
+        ContentArtifact.objects.create(
+            artifact=artifacts[1], content=Content.objects.create(), relative_path="again"
+        )
+        return delete_with_files(self, domain)
+
+    monkeypatch.setattr(ArtifactQuerySet, "delete_with_files", use_artifact_again)
+
+    reclaim_space([repository.pk])
+
+    assert not Artifact.objects.filter(pk=artifacts[0].pk).exists()
+    assert Artifact.objects.filter(pk=artifacts[1].pk).exists()
+    assert not ContentArtifact.objects.filter(
+        content__in=content_pks, artifact__isnull=False
+    ).exists()
+    assert task.progress_reports.get(code="reclaim-space.artifact").done == 1
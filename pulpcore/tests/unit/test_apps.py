@@ -0,0 +1,51 @@
+import threading
+import time
+
+import pytest
+from django.apps import apps
+
+
+@pytest.fixture
+def plugin_config(monkeypatch):
+    plugin_config = apps.get_app_config("file")
+    monkeypatch.setattr(plugin_config, "_components_imported", False)
+    return plugin_config
+
+
+def test_import_components_concurrently(plugin_config, monkeypatch):
+    importing, reading = threading.Event(), threading.Event()
+    import_viewsets = plugin_config.import_viewsets
+
+    def slow_import_viewsets():
+        import_viewsets()
+        # The importing thread can read what it has populated so far.
+        assert plugin_config.named_viewsets
+        importing.set()
+        reading.wait(5)
+        time.sleep(0.1)
+
+    monkeypatch.setattr(plugin_config, "import_viewsets", slow_import_viewsets)
+    importer = threading.Thread(target=plugin_config.import_components)
+    importer.start()
+    importing.wait(5)
+    reading.set()
+    named_serializers = plugin_config.named_serializers
+    importer.join()
+
+    assert named_serializers
+    assert named_serializers is plugin_config.named_serializers
+
+
+def test_import_components_failed(plugin_config, monkeypatch):
+    def import_replicators():
+        raise ImportError()
+
+    monkeypatch.setattr(plugin_config, "import_replicators", import_replicators)
+    with pytest.raises(ImportError):
+        plugin_config.import_components()
+    assert not plugin_config._components_imported
+
+    monkeypatch.undo()
+    monkeypatch.setattr(plugin_config, "_components_imported", False)
+    plugin_config.import_components()
+    assert plugin_config._components_imported
@@ -1,9 +1,13 @@
+from datetime import timedelta
 from time import sleep
+from types import SimpleNamespace
+from unittest.mock import Mock
 
 import pytest
 
 import pulpcore.app.redis_connection
 from pulpcore.cache import Cache
+from pulpcore.cache.signed_url import SignedURLCache
 
 
 @pytest.fixture
@@ -107,3 +111,55 @@ def test_clear(pulp_redisdb):
     cache.redis.flushdb()
     for key, _, base_key in tuples:
         assert not cache.exists(key, base_key=base_key)
+
+
+def _signed_url_key(artifact_pk="artifact", domain_pk="domain"):
+    domain = SimpleNamespace(pk=domain_pk, pulp_last_updated=None)
+    return SignedURLCache.key(SimpleNamespace(pk=artifact_pk), domain, {"a": "b"})
+
+
+def test_signed_url_key():
+    """Tests that signed URLs are cached per artifact, domain and parameters"""
+    domain = SimpleNamespace(pk="domain", pulp_last_updated=None)
+    artifact = SimpleNamespace(pk="artifact")
+    key = SignedURLCache.key(artifact, domain, {"a": "b"}, http_method="GET")
+    assert key == SignedURLCache.key(artifact, domain, {"a": "b"}, http_method="GET")
+    assert key != SignedURLCache.key(artifact, domain, {"a": "c"}, http_method="GET")
+    assert key != SignedURLCache.key(artifact, domain, {"a": "b"}, http_method="HEAD")
+    assert key != _signed_url_key(domain_pk="other")
+
+
+def test_signed_url_ttl(settings):
+    """Tests that signed URLs are reused until the margin before they expire"""
+    settings.SIGNED_URL_CACHE_MARGIN = 600
+    assert SignedURLCache.ttl(SimpleNamespace(querystring_expire=3600)) == 3000
+    assert SignedURLCache.ttl(SimpleNamespace(expiration=timedelta(days=1))) == 85800
+    assert SignedURLCache.ttl(SimpleNamespace(expiration_secs=None)) is None
+    assert SignedURLCache.ttl(SimpleNamespace(querystring_expire=600)) is None
+    settings.SIGNED_URL_CACHE_MARGIN = None
+    assert SignedURLCache.ttl(SimpleNamespace(querystring_expire=3600)) is None
+
+
+def test_signed_url_reused_in_process(settings, monkeypatch):
+    """Tests that signed URLs are reused in memory without Redis"""
+    monkeypatch.setattr(pulpcore.app.redis_connection, "_conn", None)
+    settings.CACHE_ENABLED = False
+    cache = SignedURLCache(size=1)
+    sign = Mock(side_effect=["url-1", "url-2", "url-3"])
+
+    assert cache.get_or_sign("a", sign, 60) == "url-1"
+    assert cache.get_or_sign("a", sign, 60) == "url-1"
+    assert cache.get_or_sign("b", sign, 60) == "url-2"
+    # Only the most recently used URL is kept.
+    assert cache.get_or_sign("a", sign, 60) == "url-3"
+    assert cache.get_or_sign("c", Mock(return_value="url-4"), None) == "url-4"
+    assert cache.get_or_sign("c", Mock(return_value="url-5"), None) == "url-5"
+
+
+def test_signed_url_shared(pulp_redisdb):
+    """Tests that signed URLs are shared between processes through Redis"""
+    sign = Mock(side_effect=["url-1", "url-2"])
+    SignedURLCache().get_or_sign("a", sign, 60)
+
+    assert SignedURLCache().get_or_sign("a", sign, 60) == "url-1"
+    assert sign.call_count == 1
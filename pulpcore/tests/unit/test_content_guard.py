@@ -4,8 +4,16 @@ from base64 import b64encode
 from unittest.mock import Mock
 
 import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
 
-from pulpcore.app.models import ContentRedirectContentGuard, HeaderContentGuard
+from pulpcore.app.models import ContentRedirectContentGuard, HeaderContentGuard, RBACContentGuard
+from pulpcore.app.models.role import Role, UserRole
+from pulpcore.app.role_util import assign_role
+from pulpcore.app.util import get_domain
+from pulpcore.cache.content_guard import ContentGuardCache
 
 
 def test_preauthenticate_urls():
@@ -142,3 +150,108 @@ def test_header_content_guard(db):
     encoded_value = b64encode(b"somevalue")
     request.headers = {"x-header-name": encoded_value}
     assert not content_guard_without_jq_filter.permit(request)
+
+
+@pytest.fixture
+def content_guard_cache(settings):
+    settings.CACHE_ENABLED = False
+    settings.CONTENT_GUARD_CACHE_TTL = 5
+    return ContentGuardCache()
+
+
+def test_content_guard_cache(db, content_guard_cache, settings, monkeypatch):
+    """Test that the decisions of a content guard are cached per header value."""
+    content_guard = HeaderContentGuard(
+        name="header_guard", header_name="x-header-name", header_value="somevalue"
+    )
+    allowed = Mock(headers={"x-header-name": b64encode(b"somevalue")})
+    denied = Mock(headers={"x-header-name": b64encode(b"othervalue")})
+    permit = Mock(wraps=content_guard.permit)
+    monkeypatch.setattr(content_guard, "permit", permit)
+
+    for _ in range(3):
+        content_guard_cache.permit(content_guard, allowed)
+        with pytest.raises(PermissionError, match="Access denied."):
+            content_guard_cache.permit(content_guard, denied)
+    assert permit.call_count == 2
+
+    content_guard_cache.invalidate()
+    content_guard_cache.permit(content_guard, allowed)
+    assert permit.call_count == 3
+
+    settings.CONTENT_GUARD_CACHE_TTL = 0
+    content_guard_cache.permit(content_guard, allowed)
+    assert permit.call_count == 4
+
+
+def test_content_guard_cache_expiring_urls(db, settings):
+    """Test that only signed URLs outliving the cached decision can be cached."""
+    settings.CONTENT_GUARD_CACHE_TTL = 5
+    content_guard = ContentRedirectContentGuard(name="test")
+    signed_url = content_guard.preauthenticate_url("http://localhost:8080/pulp/content/dist/")
+    expires = int(re.search(r"expires=(\d+)", signed_url).group(1))
+    request = Mock(url=signed_url, query={"expires": str(expires)})
+
+    assert content_guard.permit_cache_key(request) == signed_url
+    request.query = {"expires": str(expires - content_guard.EXPIRETIME.seconds + 3)}
+    assert content_guard.permit_cache_key(request) is None
+    request.query = {}
+    assert content_guard.permit_cache_key(request) is None
+
+
+def test_content_guard_cache_role_removed(
+    db, content_guard_cache, monkeypatch, django_capture_on_commit_callbacks
+):
+    """Test that removing a role invalidates the cached decisions of RBAC content guards."""
+    monkeypatch.setattr("pulpcore.cache.content_guard.content_guard_cache", content_guard_cache)
+    user = get_user_model().objects.create(username="rbac-guard-downloader")
+    content_guard = RBACContentGuard.objects.create(name="rbac-guard-cache")
+    role = Role.objects.create(name="rbac-guard-cache-downloader")
+    role.permissions.add(
+        Permission.objects.get(content_type__app_label="core", codename="download_rbaccontentguard")
+    )
+    assign_role(role.name, user, content_guard)
+    drf_request = Request(APIRequestFactory().get("/"))
+    drf_request.user = user
+    drf_request.pulp_domain = get_domain()
+    request = {"drf_request": drf_request}
+
+    content_guard_cache.permit(content_guard, request)
+    with django_capture_on_commit_callbacks(execute=True):
+        UserRole.objects.filter(user=user, role=role).delete()
+
+    with pytest.raises(PermissionError):
+        content_guard_cache.permit(content_guard, request)
+
+
+def test_content_guard_cache_invalidated_on_commit(
+    db, monkeypatch, django_capture_on_commit_callbacks
+):
+    """Test that only roles granting downloads invalidate the cache, once they are committed."""
+    invalidate = Mock()
+    monkeypatch.setattr("pulpcore.cache.content_guard.content_guard_cache.invalidate", invalidate)
+    user = get_user_model().objects.create(username="rbac-guard-invalidation")
+    viewer = Role.objects.create(name="rbac-guard-cache-task-viewer")
+    viewer.permissions.add(
+        Permission.objects.get(content_type__app_label="core", codename="view_task")
+    )
+    downloader = Role.objects.create(name="rbac-guard-cache-all-downloader")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        UserRole.objects.create(user=user, role=viewer)
+    invalidate.assert_not_called()
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        downloader.permissions.add(
+            Permission.objects.get(
+                content_type__app_label="core", codename="download_rbaccontentguard"
+            )
+        )
+    invalidate.assert_not_called()
+    for callback in callbacks:
+        callback()
+    invalidate.assert_called_once_with()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        UserRole.objects.create(user=user, role=downloader)
+    assert invalidate.call_count == 2
@@ -1,6 +1,10 @@
+import hashlib
+from types import SimpleNamespace
+
 import pytest
+from django.core.files import File
 
-from pulpcore.app.files import validate_file_paths
+from pulpcore.app.files import PulpTemporaryUploadedFile, validate_file_paths
 
 
 def test_valid_paths():
@@ -46,3 +50,23 @@ def test_overlaps():
     paths = ["a/b", "a/b/c/d"]
     with pytest.raises(ValueError):
         validate_file_paths(paths)
+
+
+def test_from_chunks(tmp_path):
+    """
+    Test that chunks are concatenated and hashed in one pass.
+    """
+    chunks = []
+    for i, data in enumerate([b"first chunk ", b"", b"second chunk"]):
+        path = tmp_path / str(i)
+        path.write_bytes(data)
+        chunks.append(SimpleNamespace(file=File(open(path, "rb"))))
+
+    with PulpTemporaryUploadedFile.from_chunks(chunks) as file:
+        assert file.size == 24
+        assert file.read() == b"first chunk second chunk"
+        assert (
+            file.hashers["sha256"].hexdigest()
+            == hashlib.sha256(b"first chunk second chunk").hexdigest()
+        )
+    assert all(chunk.file.closed for chunk in chunks)
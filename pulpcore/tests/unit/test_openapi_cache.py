@@ -0,0 +1,131 @@
+import json
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIRequestFactory
+
+from pulpcore.openapi import PulpSchemaGenerator, cache
+from pulpcore.openapi.views import CachedSchemaJSONView
+
+
+@pytest.fixture
+def schema_cache(settings, tmp_path):
+    settings.WORKING_DIRECTORY = str(tmp_path)
+    cache.clear_schema_cache()
+    yield tmp_path / "openapi"
+    cache.clear_schema_cache()
+
+
+@pytest.fixture
+def generator_class():
+    generator_class = mock.Mock()
+    generator_class.return_value.get_schema.side_effect = lambda request, public: {
+        "openapi": "3.1.1",
+        "servers": [{"url": "http://localhost:24817/"}],
+        "paths": {"bindings": "bindings" in request.query_params},
+    }
+    return generator_class
+
+
+def _view(generator_class):
+    return CachedSchemaJSONView.as_view(
+        authentication_classes=[], permission_classes=[], generator_class=generator_class
+    )
+
+
+def test_cache_key_depends_on_variant():
+    assert cache.schema_cache_key({}) == cache.schema_cache_key({"lang": "de"})
+    assert cache.schema_cache_key({}) != cache.schema_cache_key({"bindings": "1"})
+    assert cache.schema_cache_key({}) != cache.schema_cache_key({}, api_version="v4")
+
+
+def test_schema_cached_on_disk(schema_cache):
+    cache.set_cached_schema("key", {"openapi": "3.1.1"})
+    assert (schema_cache / "key.json").exists()
+
+    cache._memory_cache.clear()
+    assert cache.get_cached_schema("key") == {"openapi": "3.1.1"}
+    assert cache.get_cached_schema("missing") is None
+
+
+def test_view_serves_cached_schema(schema_cache, generator_class):
+    factory = APIRequestFactory()
+    view = _view(generator_class)
+
+    response = view(factory.get("/docs/api.json", HTTP_HOST="pulp.example.com"))
+    assert response.status_code == 200
+    assert response.data["servers"] == [{"url": "http://pulp.example.com/"}]
+    etag = response["ETag"]
+
+    response = view(factory.get("/docs/api.json", HTTP_HOST="pulp.example.com"))
+    assert response.status_code == 200
+    assert response["ETag"] == etag
+    assert generator_class.return_value.get_schema.call_count == 1
+
+    response = view(factory.get("/docs/api.json", {"bindings": 1}, HTTP_HOST="pulp.example.com"))
+    assert response.data["paths"] == {"bindings": True}
+    assert response["ETag"] != etag
+    assert generator_class.return_value.get_schema.call_count == 2
+
+
+def test_view_rejects_plugin_of_cached_schema(schema_cache, generator_class):
+    factory = APIRequestFactory()
+    assert _view(generator_class)(factory.get("/docs/api.json")).status_code == 200
+
+    response = _view(PulpSchemaGenerator)(factory.get("/docs/api.json", {"plugin": "core"}))
+    assert response.status_code == 400
+    assert not cache.get_cached_schema(cache.schema_cache_key({"plugin": "core"}))
+
+
+def test_view_conditional_get(schema_cache, generator_class):
+    factory = APIRequestFactory()
+    view = _view(generator_class)
+    etag = view(factory.get("/docs/api.json"))["ETag"]
+
+    response = view(factory.get("/docs/api.json", HTTP_IF_NONE_MATCH=etag))
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+    response = view(factory.get("/docs/api.json", HTTP_IF_NONE_MATCH=etag, HTTP_HOST="other"))
+    assert response.status_code == 200
+
+
+def test_warm_schema_cache(schema_cache, monkeypatch, generator_class):
+    monkeypatch.setattr("pulpcore.openapi.PulpSchemaGenerator", generator_class)
+    cache.warm_schema_cache()
+    assert generator_class.return_value.get_schema.call_count == len(cache.WARM_VARIANTS)
+    assert len(list(schema_cache.glob("*.json"))) == len(cache.WARM_VARIANTS)
+    assert not list(schema_cache.glob("*.lock"))
+
+    cache.warm_schema_cache()
+    assert generator_class.return_value.get_schema.call_count == len(cache.WARM_VARIANTS)
+
+    # The schema served to clients is the one generated in the background.
+    response = _view(generator_class)(APIRequestFactory().get("/docs/api.json"))
+    assert response.status_code == 200
+    assert generator_class.return_value.get_schema.call_count == len(cache.WARM_VARIANTS)
+
+
+def test_warm_schema_cache_clears_stale_schemas(schema_cache, monkeypatch, generator_class):
+    monkeypatch.setattr("pulpcore.openapi.PulpSchemaGenerator", generator_class)
+    cache.set_cached_schema("stale", {"openapi": "3.1.1"})
+    (schema_cache / "other.lock").touch()
+
+    cache.warm_schema_cache()
+
+    assert not (schema_cache / "stale.json").exists()
+    assert (schema_cache / "other.lock").exists()
+    assert len(list(schema_cache.glob("*.json"))) == len(cache.WARM_VARIANTS)
+
+
+def test_openapi_command_uses_cache(schema_cache, monkeypatch, generator_class):
+    monkeypatch.setattr(
+        "pulpcore.app.management.commands.openapi.PulpSchemaGenerator", generator_class
+    )
+    for _ in range(2):
+        out = StringIO()
+        call_command("openapi", "--bindings", stdout=out)
+        assert json.loads(out.getvalue())["paths"] == {"bindings": True}
+    assert generator_class.return_value.get_schema.call_count == 1
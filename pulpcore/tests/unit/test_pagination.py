@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from django.db.models import Q
+from django.http import QueryDict
+from rest_framework.exceptions import NotFound
+
+from pulpcore.app.models import Task
+from pulpcore.app.pagination import PulpPagination
+from pulpcore.app.viewsets.task import TaskFilter
+from pulpcore.constants import TASK_STATES
+
+
+def test_cursor_round_trip():
+    paginator = PulpPagination()
+    key_fields = paginator.get_key_fields(Task)
+    position = [datetime(2025, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc), uuid4()]
+
+    token = paginator.encode_cursor(position)
+
+    assert key_fields == ["pulp_created", "pk"]
+    assert paginator.decode_cursor(token, Task, key_fields) == position
+
+
+@pytest.mark.parametrize("token", ["garbage", PulpPagination().encode_cursor(["x"])])
+def test_invalid_cursor(token):
+    paginator = PulpPagination()
+    with pytest.raises(NotFound):
+        paginator.decode_cursor(token, Task, paginator.get_key_fields(Task))
+
+
+def test_after_filter():
+    created, pk = datetime(2025, 1, 1, tzinfo=timezone.utc), uuid4()
+    q = PulpPagination._after(["pulp_created", "pk"], [created, pk])
+    assert q == Q(pulp_created__gt=created) | Q(pulp_created=created, pk__gt=pk)
+
+
+def test_cursor_is_not_a_filter():
+    assert TaskFilter(data=QueryDict("cursor=abc&state=completed")).is_valid()
+
+
+def test_follow_next_link(admin_client, settings):
+    names = [f"paginated-{i}" for i in range(3)]
+    for name in names:
+        Task.objects.create(name=name, state=TASK_STATES.COMPLETED)
+    url = f"{settings.V3_API_ROOT}tasks/?name__startswith=paginated-&limit=2&cursor="
+
+    seen = []
+    while url:
+        response = admin_client.get(url)
+        assert response.status_code == 200, response.content
+        seen.extend(task["name"] for task in response.json()["results"])
+        url = response.json()["next"]
+
+    assert seen == names
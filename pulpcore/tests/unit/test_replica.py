@@ -0,0 +1,124 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from pulpcore.app import replica
+from pulpcore.app.models import UpstreamPulp
+
+
+class DoesNotExist(Exception):
+    pass
+
+
+def _model(objects):
+    model = mock.Mock(DoesNotExist=DoesNotExist)
+    model.objects.filter.return_value = objects
+    return model
+
+
+@pytest.fixture
+def replicator(monkeypatch):
+    monkeypatch.setattr(replica, "get_domain", lambda: SimpleNamespace(pulp_id="domain"))
+    monkeypatch.setattr(replica, "get_url", lambda obj: obj.href)
+
+    class TestReplicator(replica.Replicator):
+        app_label = "test"
+        remote_serializer_name = "RemoteSerializer"
+        remote_model_cls = _model(
+            [SimpleNamespace(pk=1, name="same", url="http://up/same/", pulp_labels={})]
+        )
+        repository_model_cls = _model([])
+        distribution_model_cls = _model(
+            [SimpleNamespace(pk=2, name="old", base_path="renamed", pulp_labels={})]
+        )
+
+        def remote_extra_fields(self, upstream_distribution):
+            return {"pulp_labels": {}}
+
+    server = mock.Mock(policy=UpstreamPulp.ALL, pk="server")
+    return TestReplicator(mock.Mock(), mock.Mock(), {}, server)
+
+
+def test_plan_looks_up_local_objects_in_bulk(replicator):
+    upstream = [
+        {"name": "same", "base_path": "same", "base_url": "http://up/same/", "repository": "r"},
+        {"name": "new", "base_path": "renamed", "base_url": "http://up/new/", "repository": "r"},
+    ]
+    replicator.plan(upstream)
+
+    assert replicator.remote_model_cls.objects.filter.call_count == 1
+    assert replicator.distribution_model_cls.objects.filter.call_count == 1
+    remote = replicator.create_or_update_remote(upstream[0])
+    assert remote.pk == 1
+    replicator.remote_model_cls.objects.get.assert_not_called()
+    assert replicator._pending_tasks == []
+
+    with pytest.raises(DoesNotExist):
+        replicator._get_local(replicator.repository_model_cls, name="same")
+    distro = replicator._get_local(replicator.distribution_model_cls, base_path="renamed")
+    assert distro.pk == 2
+
+
+def test_tasks_dispatched_in_bulk(replicator, monkeypatch):
+    dispatch_many = mock.Mock()
+    monkeypatch.setattr(replica, "dispatch_many", dispatch_many)
+    replicator.plan(
+        [{"name": "same", "base_path": "same", "base_url": "http://up/moved/", "repository": "r"}]
+    )
+
+    replicator.create_or_update_remote(
+        {"name": "same", "base_path": "same", "base_url": "http://up/moved/", "repository": "r"}
+    )
+    replicator.queue_dispatch("sync", exclusive_resources=["repository"])
+    dispatch_many.assert_not_called()
+
+    replicator.dispatch_pending()
+    calls = dispatch_many.call_args.args[0]
+    assert [call["func"] for call in calls] == [replica.ageneral_update, "sync"]
+    assert calls[0]["kwargs"]["data"]["url"] == "http://up/moved/"
+    assert dispatch_many.call_args.kwargs["task_group"] is replicator.task_group
+    assert replicator._pending_tasks == []
+
+
+def test_dispatch_after_queued_tasks(replicator, monkeypatch):
+    calls = mock.Mock()
+    monkeypatch.setattr(replica, "dispatch_many", calls.dispatch_many)
+    monkeypatch.setattr(replica, "dispatch", calls.dispatch)
+
+    replicator.queue_dispatch("update_remote")
+    task = replicator.dispatch("sync", exclusive_resources=["repository"])
+
+    assert task is calls.dispatch.return_value
+    assert calls.mock_calls == [
+        mock.call.dispatch_many([{"func": "update_remote"}], task_group=replicator.task_group),
+        mock.call.dispatch(
+            "sync", task_group=replicator.task_group, exclusive_resources=["repository"]
+        ),
+    ]
+    assert replicator._pending_tasks == []
+
+
+def test_overridden_methods_dispatch_in_order(replicator, monkeypatch):
+    from pulpcore.app.tasks.replica import _call_replicator
+
+    dispatched = []
+    monkeypatch.setattr(replica, "dispatch_many", lambda calls, **kwargs: dispatched.extend(calls))
+
+    monkeypatch.setattr(
+        replica, "dispatch", lambda func, **kwargs: dispatched.append({"func": func})
+    )
+
+    class PluginReplicator(type(replicator)):
+        def sync(self, repository, remote):
+            self.queue_dispatch("sync")
+            # Plugins may still dispatch their tasks directly.
+            dispatched.append({"func": "plugin_sync"})
+
+    plugin_replicator = PluginReplicator(mock.Mock(), mock.Mock(), {}, replicator.server)
+    plugin_replicator.queue_dispatch("update_remote")
+    _call_replicator(plugin_replicator, "sync", "repository", "remote")
+
+    assert [call["func"] for call in dispatched] == ["update_remote", "sync", "plugin_sync"]
+    assert plugin_replicator._pending_tasks == []
+    assert plugin_replicator.queue_tasks
@@ -2,6 +2,7 @@ from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+from pulpcore.app.models import Content, ProgressReport, Repository, VulnerabilityReport
 from pulpcore.app.tasks.vulnerability_report import VulnerabilityReportScanner
 from pulpcore.constants import OSV_QUERY_URL
 
@@ -10,35 +11,73 @@ class TestVulnerabilityReportScanner:
     """Test cases for VulnerabilityReportScanner class methods."""
 
     @pytest.mark.asyncio
-    async def test_process_reports(self):
-        """Test _process_reports method with basic input data."""
+    async def test_query_vulns(self):
+        """Test _query_vulns method follows the pagination of the OSV API."""
         mock_semaphore = AsyncMock()
         mock_generator = AsyncMock()
         mock_session = Mock()
         scanner = VulnerabilityReportScanner(mock_semaphore, mock_generator, mock_session)
 
-        mock_content = Mock()
-        mock_repo_version = Mock()
+        osv_data = {"package": {"name": "requests", "ecosystem": "PyPI"}, "version": "2.28.0"}
+        first_page = [{"id": "GHSA-test-1234", "summary": "Test vulnerability"}]
+        second_page = [{"id": "GHSA-test-5678", "summary": "Another vulnerability"}]
+        responses = [
+            {"vulns": list(first_page), "next_page_token": "token"},
+            {"vulns": list(second_page)},
+        ]
 
-        repo_content_osv_data = {
-            "package": {"name": "requests", "ecosystem": "PyPI"},
-            "version": "2.28.0",
-            "content": mock_content,
-            "repo_version": mock_repo_version,
-        }
-        expected_vulns = [{"id": "GHSA-test-1234", "summary": "Test vulnerability"}]
-        vulnerability_response = {"vulns": expected_vulns}
+        with patch.object(scanner, "_query_osv_api", side_effect=responses) as mock_query:
+            vulns = await scanner._query_vulns(osv_data)
+            assert vulns == first_page + second_page
+            assert mock_query.call_args_list[1].args[0] == {**osv_data, "page_token": "token"}
+            assert "page_token" not in osv_data
+
+    @pytest.mark.asyncio
+    async def test_scan_packages_batches(self):
+        """Test scan_packages queries the packages in batches and each package only once."""
+        mock_semaphore = AsyncMock()
+        mock_session = AsyncMock()
+        repo_version = Mock()
+        contents = [Mock(pk=i) for i in range(5)]
+
+        async def generator():
+            for i, content in enumerate(contents):
+                yield {
+                    "package": {"name": f"pkg{i % 3}", "ecosystem": "PyPI"},
+                    "content": content,
+                    "repo_version": repo_version,
+                }
 
-        with patch.object(scanner, "_query_osv_api", return_value=vulnerability_response):
-            # Mock the semaphore context manager
-            mock_semaphore.__aenter__ = AsyncMock()
-            mock_semaphore.__aexit__ = AsyncMock()
+        scanner = VulnerabilityReportScanner(mock_semaphore, generator(), mock_session, workers=1)
+        scanner.batch_size = 2
+        vulns = [{"id": "GHSA-test-1234"}]
 
-            with patch.object(scanner.total_scanned, "aincrement", new_callable=AsyncMock):
-                vulns, content, repo_version = await scanner._process_reports(repo_content_osv_data)
-                assert vulns == expected_vulns
-                assert content == mock_content
-                assert repo_version == mock_repo_version
+        async def query_batch(osv_queries):
+            return [query["package"]["name"] == "pkg0" for query in osv_queries]
+
+        with (
+            patch.object(scanner, "_query_osv_batch", side_effect=query_batch) as mock_batch,
+            patch.object(scanner, "_query_vulns", return_value=vulns) as mock_vulns,
+            patch.object(scanner, "_get_existing_reports", return_value={3: {"fresh": True}}),
+            patch.object(scanner, "_save_vulnerability_reports", return_value=(1, 0)) as mock_save,
+            patch.object(ProgressReport, "asave", new_callable=AsyncMock),
+        ):
+            await scanner.scan_packages()
+
+        assert mock_batch.call_count == 2
+        queried = [q["package"]["name"] for c in mock_batch.call_args_list for q in c.args[0]]
+        assert sorted(queried) == ["pkg0", "pkg1", "pkg2"]
+        mock_vulns.assert_called_once()
+        results = {}
+        for call in mock_save.call_args_list:
+            batch_contents, _, batch_results, _ = call.args
+            results.update(
+                (content.pk, result) for content, result in zip(batch_contents, batch_results)
+            )
+        assert results == {0: vulns, 1: [], 2: [], 3: None, 4: []}
+        assert scanner.total_scanned.done == 5
+        assert scanner.created.done == 3
+        mock_session.close.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_query_osv_api_success(self):
@@ -72,3 +111,27 @@ class TestVulnerabilityReportScanner:
             assert result == expected_response
             mock_post.assert_called_once_with(url=OSV_QUERY_URL, json=osv_data)
             mock_response.json.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_save_vulnerability_reports_rescan():
+    """Test rescanning content with a stale report updates it and links the repo version."""
+    repository = Repository.objects.create(name="vuln-report-rescan")
+    repo_version = repository.latest_version()
+    contents = [Content.objects.create() for _ in range(2)]
+    stale = VulnerabilityReport.objects.create(content=contents[0], vulns=[])
+    scanner = VulnerabilityReportScanner(AsyncMock(), AsyncMock(), Mock())
+    existing = scanner._get_existing_reports(contents)
+    vulns = [{"id": "GHSA-test-1234"}]
+
+    created, updated = scanner._save_vulnerability_reports(
+        contents, [repo_version, repo_version], [vulns, vulns], existing
+    )
+
+    assert (created, updated) == (1, 1)
+    stale.refresh_from_db()
+    assert stale.vulns == vulns
+    assert VulnerabilityReport.objects.filter(content__in=contents).count() == 2
+    for content in contents:
+        report = VulnerabilityReport.objects.get(content=content)
+        assert list(report.repo_versions.all()) == [repo_version]
@@ -0,0 +1,64 @@
+import json
+import uuid
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from pulpcore.app.access_policy import DefaultAccessPolicy
+from pulpcore.app.models import Content, ContentArtifact
+from pulpcore.app.viewsets import repository
+
+from pulp_file.app.models import FileContent, FileRepository
+
+
+@pytest.mark.django_db
+def test_stream_version_content(monkeypatch):
+    monkeypatch.setattr(repository, "CONTENT_STREAM_BATCH_SIZE", 2)
+    repo = FileRepository.objects.create(name=f"repo-{uuid.uuid4().hex[:8]}")
+    paths = ["a.txt", "b.txt", "c.txt"]
+    with repo.new_version() as version:
+        for path in paths:
+            content = FileContent.objects.create(relative_path=path, digest=path * 3)
+            ContentArtifact.objects.create(content=content, relative_path=path)
+            version.add_content(Content.objects.filter(pk=content.pk))
+
+    chunks = list(repository.stream_version_content(version))
+    records = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+
+    assert len(chunks) == 2
+    assert sorted(record["natural_key"]["relative_path"] for record in records) == paths
+    for record in records:
+        content = FileContent.objects.get(relative_path=record["natural_key"]["relative_path"])
+        assert record["pulp_type"] == "file.file"
+        assert record["pulp_href"].endswith(f"/content/file/files/{content.pk}/")
+        assert record["artifacts"] == {content.relative_path: None}
+
+
+class PluginRepositoryVersionViewSet(repository.RepositoryVersionViewSet):
+    """A repository version viewset of a plugin that does not know about the content action."""
+
+    DEFAULT_ACCESS_POLICY = {
+        "statements": [
+            {"action": ["list", "retrieve"], "principal": "authenticated", "effect": "allow"},
+            {"action": "retrieve", "principal": "anonymous", "effect": "deny"},
+        ],
+    }
+
+
+@pytest.mark.parametrize(
+    "action,authenticated,allowed",
+    [("content", True, True), ("content", False, False), ("destroy", True, False)],
+)
+def test_stream_version_content_access_policy(db, action, authenticated, allowed):
+    """The content action follows the retrieve statements of policies that don't name it."""
+    request = Request(APIRequestFactory().get("/"))
+    if authenticated:
+        request.user = get_user_model().objects.create(username=str(uuid.uuid4()))
+    else:
+        request.user = AnonymousUser()
+    view = PluginRepositoryVersionViewSet(action=action)
+
+    assert DefaultAccessPolicy().has_permission(request, view) is allowed